@@ -0,0 +1,67 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser
+
+USER_CACHE_TTL = 30
+USER_CACHE_SIZE = 10000
+
+
+class UserCache:
+    """Кэш пользователей в памяти процесса с коротким временем жизни."""
+
+    def __init__(self, size=USER_CACHE_SIZE):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                return None
+            expires, user = item
+            if expires < time.monotonic():
+                del self.items[key]
+                return None
+            self.items.move_to_end(key)
+            return user
+
+    def set(self, key, user, ttl):
+        with self.lock:
+            self.items[key] = (time.monotonic() + ttl, user)
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+user_cache = UserCache()
+
+
+def get_user(request):
+    """Как auth.get_user, но повторно не читает пользователя из базы,
+    пока не изменился хэш авторизации в сессии."""
+    session = request.session
+    key = (
+        session.get(auth.SESSION_KEY),
+        session.get(auth.BACKEND_SESSION_KEY),
+        session.get(auth.HASH_SESSION_KEY),
+    )
+    if key[0] is None:
+        return AnonymousUser()
+    user = user_cache.get(key)
+    if user is None:
+        user = auth.get_user(request)
+        if not user.is_authenticated:
+            return user
+        ttl = getattr(settings, 'USER_CACHE_TTL', USER_CACHE_TTL)
+        user_cache.set(key, user, ttl)
+    return copy.copy(user)
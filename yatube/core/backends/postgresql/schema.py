@@ -0,0 +1,35 @@
+from django.db.backends.postgresql import schema
+
+
+class DatabaseSchemaEditor(schema.DatabaseSchemaEditor):
+    """Не создаёт внешние ключи на секционированные таблицы.
+
+    Первичный ключ секционированной таблицы включает ключ секционирования,
+    поэтому ссылаться только на id нельзя. Каскадное удаление Django
+    выполняет сам, без ограничений в базе.
+    """
+
+    sql_partitioned_tables = (
+        'SELECT c.relname FROM pg_partitioned_table p '
+        'JOIN pg_class c ON c.oid = p.partrelid'
+    )
+
+    def partitioned_tables(self):
+        if not hasattr(self, '_partitioned_tables'):
+            with self.connection.cursor() as cursor:
+                cursor.execute(self.sql_partitioned_tables)
+                self._partitioned_tables = {
+                    row[0] for row in cursor.fetchall()
+                }
+        return self._partitioned_tables
+
+    def _create_fk_sql(self, model, field, suffix):
+        to_table = field.target_field.model._meta.db_table
+        if to_table in self.partitioned_tables():
+            return None
+        return super()._create_fk_sql(model, field, suffix)
+
+    def execute(self, sql, params=()):
+        if sql is None:
+            return
+        super().execute(sql, params)
@@ -0,0 +1,105 @@
+import logging
+import time
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('yatube.compression')
+
+DEFAULT_LEVELS = {'br': 5, 'gzip': 6}
+COMPRESSIBLE_TYPES = (
+    'text/html', 'text/plain', 'text/css', 'text/xml', 'text/javascript',
+    'application/json', 'application/javascript', 'application/xml',
+    'application/atom+xml', 'application/rss+xml', 'image/svg+xml',
+)
+
+
+class GzipCoder:
+    encoding = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compressor(self):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress, compressor.flush
+
+
+class BrotliCoder:
+    encoding = 'br'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compressor(self):
+        compressor = brotli.Compressor(quality=self.level)
+        return compressor.process, compressor.finish
+
+
+def coders():
+    """Доступные кодеры в порядке предпочтения."""
+    levels = {**DEFAULT_LEVELS, **getattr(settings, 'COMPRESSION_LEVELS', {})}
+    if brotli is not None:
+        yield BrotliCoder(levels['br'])
+    yield GzipCoder(levels['gzip'])
+
+
+def is_compressible(content_type):
+    return content_type.split(';')[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+class Measurement:
+    """Размер до и после сжатия и затраченное процессорное время."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.raw_size = 0
+        self.compressed_size = 0
+        self.cpu_time = 0.0
+
+    def run(self, function, *chunks):
+        started = time.thread_time()
+        result = function(*chunks)
+        self.cpu_time += time.thread_time() - started
+        self.raw_size += sum(len(chunk) for chunk in chunks)
+        self.compressed_size += len(result)
+        return result
+
+    @property
+    def ratio(self):
+        if not self.compressed_size:
+            return 0
+        return self.raw_size / self.compressed_size
+
+    def server_timing(self):
+        return (
+            f'compress;dur={self.cpu_time * 1000:.2f};'
+            f'desc="{self.encoding} {self.ratio:.1f}x"'
+        )
+
+    def log(self, path):
+        logger.info(
+            '%s %s: %d -> %d bytes (%.1fx) in %.2f ms CPU',
+            self.encoding, path, self.raw_size, self.compressed_size,
+            self.ratio, self.cpu_time * 1000,
+        )
+
+
+def compress(coder, content, measurement):
+    process, finish = coder.compressor()
+    return measurement.run(process, content) + measurement.run(finish)
+
+
+def compress_stream(coder, chunks, measurement, path):
+    process, finish = coder.compressor()
+    for chunk in chunks:
+        data = measurement.run(process, chunk)
+        if data:
+            yield data
+    yield measurement.run(finish)
+    measurement.log(path)
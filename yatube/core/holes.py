@@ -0,0 +1,129 @@
+import re
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+PAGE_TIMEOUT = 60 * 5
+HOLE_RE = re.compile(r'<!--hole:(\w+)((?::[\w.@+-]*)*)-->')
+NAV_TEMPLATE = 'includes/header_user.html'
+
+renderers = {}
+batch_renderers = {}
+
+
+def register(name):
+    """Регистрирует дырку: функцию от запроса и аргументов из шаблона,
+    которая возвращает HTML для конкретного пользователя."""
+    def decorator(render):
+        renderers[name] = render
+        return render
+    return decorator
+
+
+def register_batch(name):
+    """Регистрирует дырку, которая заполняется сразу для всех своих
+    меток на странице: функция получает запрос и список кортежей
+    аргументов и возвращает словарь HTML по кортежу. Такие дырки
+    всегда остаются метками, даже в незакэшированных фрагментах."""
+    def decorator(render):
+        batch_renderers[name] = render
+        return render
+    return decorator
+
+
+def is_deferred(context, name):
+    return bool(context.get('holes_deferred')) or name in batch_renderers
+
+
+def marker(name, *args):
+    parts = ':'.join([name] + [str(arg) for arg in args])
+    return mark_safe(f'<!--hole:{parts}-->')
+
+
+def render(request, name, *args):
+    return mark_safe(renderers[name](request, *args))
+
+
+def parse(match):
+    return match.group(1), tuple(match.group(2).split(':')[1:])
+
+
+def fill(request, body):
+    """Подставляет в общую страницу фрагменты текущего пользователя."""
+    found = {}
+    for match in HOLE_RE.finditer(body):
+        name, args = parse(match)
+        if name in batch_renderers:
+            found.setdefault(name, set()).add(args)
+    batches = {
+        name: batch_renderers[name](request, sorted(args))
+        for name, args in found.items()
+    }
+
+    def replace(match):
+        name, args = parse(match)
+        if name in batches:
+            return batches[name][args]
+        return render(request, name, *args)
+
+    return HOLE_RE.sub(replace, body)
+
+
+def render_page(request, template, context, using=None):
+    return HttpResponse(fill(
+        request, render_to_string(template, context, request, using=using)
+    ))
+
+
+def version_key(scope):
+    return f'page_version:{scope}'
+
+
+def page_key(name, scopes):
+    """Ключ страницы из версий всех объектов, от которых она зависит:
+    сбросить версию значит сбросить все страницы с этим объектом."""
+    keys = [version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex[:8] for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return ':'.join(['page', name] + [versions[key] for key in keys])
+
+
+def cached_value(name, scopes, compute, timeout=PAGE_TIMEOUT):
+    """Значение, которое сбрасывается вместе со страницами scopes."""
+    return cache.get_or_set(page_key(name, scopes), compute, timeout)
+
+
+def cached_page(request, name, scopes, render_body, timeout=PAGE_TIMEOUT):
+    """Страница, общая для всех посетителей, с дырками под каждого.
+
+    render_body рендерит шаблон с holes_deferred=True: вместо
+    пользовательских фрагментов в нём остаются метки, которые fill
+    заполняет на каждом запросе.
+    """
+    key = page_key(name, scopes)
+    body = cache.get(key)
+    if body is None:
+        body = render_body()
+        cache.set(key, body, timeout)
+    return HttpResponse(fill(request, body))
+
+
+def invalidate(*scopes):
+    """Сбрасывает версии сразу и ещё раз после коммита: страница,
+    собранная другим запросом до коммита, иначе осталась бы в кэше
+    со старыми данными."""
+    keys = [version_key(scope) for scope in scopes]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@register('nav')
+def nav(request):
+    return render_to_string(NAV_TEMPLATE, request=request)
@@ -0,0 +1,78 @@
+from django.core.cache import cache as django_cache
+from django.core.cache.utils import make_template_fragment_key
+from django.template.defaultfilters import date, truncatechars
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.timezone import template_localtime
+from jinja2 import Environment, pass_context
+from markupsafe import Markup
+from sorl.thumbnail import get_thumbnail
+
+from posts.cards import CARD_TEMPLATE, cached_cards, post_ids
+
+from . import holes
+from .paginator import next_cursor
+from .templatetags.user_filters import addclass
+
+
+def url(view_name, *args, **kwargs):
+    return reverse(view_name, args=args or None, kwargs=kwargs or None)
+
+
+def thumbnail(image, geometry, **options):
+    """Аналог тега thumbnail из sorl: None, если картинки нет."""
+    if not image:
+        return None
+    try:
+        return get_thumbnail(image, geometry, **options)
+    except Exception:
+        return None
+
+
+def cache(timeout, fragment_name, *vary_on, caller):
+    """Аналог тега cache, использует те же ключи, что и шаблоны Django."""
+    key = make_template_fragment_key(fragment_name, vary_on)
+    value = django_cache.get(key)
+    if value is None:
+        value = str(caller())
+        django_cache.set(key, value, timeout)
+    return Markup(value)
+
+
+@pass_context
+def hole(context, name, *args):
+    """Аналог тега hole."""
+    if holes.is_deferred(context, name):
+        return holes.marker(name, *args)
+    return Markup(holes.render(context.get('request'), name, *args))
+
+
+def localdate(value, arg=None):
+    return date(template_localtime(value), arg)
+
+
+def environment(**options):
+    env = Environment(**options)
+
+    def post_cards(posts, show_author=True, show_group=True):
+        return cached_cards(
+            list(posts), show_author, show_group,
+            env.get_template(CARD_TEMPLATE).render, 'jinja2',
+        )
+
+    env.globals.update({
+        'static': static,
+        'url': url,
+        'thumbnail': thumbnail,
+        'cache': cache,
+        'post_cards': post_cards,
+        'hole': hole,
+    })
+    env.filters.update({
+        'addclass': addclass,
+        'date': localdate,
+        'next_cursor': next_cursor,
+        'post_ids': post_ids,
+        'truncatechars': truncatechars,
+    })
+    return env
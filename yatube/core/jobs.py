@@ -0,0 +1,147 @@
+import json
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, Max
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger('yatube.jobs')
+
+registry = {}
+
+BACKOFF_BASE = 10
+BACKOFF_MAX = 60 * 60
+STALE_AFTER = timedelta(minutes=10)
+KEEP_DONE = timedelta(days=7)
+PURGE_BATCH = 1000
+
+
+def register(name, max_attempts=5, every=None):
+    """Регистрирует функцию как фоновую задачу под именем name.
+
+    Задача с every (timedelta) повторяется: после каждого запуска
+    обработчик ставит следующий через every.
+    """
+    def decorator(function):
+        function.job_name = name
+        function.max_attempts = max_attempts
+        function.every = every
+        registry[name] = function
+        return function
+    return decorator
+
+
+def enqueue(name, delay=0, **kwargs):
+    """Ставит задачу в очередь; в режиме JOBS_EAGER сразу выполняет её."""
+    function = registry[name]
+    if getattr(settings, 'JOBS_EAGER', False):
+        try:
+            function(**kwargs)
+        except Exception:
+            logger.exception('%s failed in eager mode', name)
+        return None
+    return Job.objects.create(
+        name=name,
+        payload=json.dumps(kwargs),
+        max_attempts=function.max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1),
+                                 BACKOFF_MAX))
+
+
+def claim(worker):
+    """Забирает одну готовую задачу. Статус меняется условным UPDATE,
+    поэтому одну задачу не возьмут два обработчика сразу."""
+    now = timezone.now()
+    ready = Job.objects.filter(status=Job.QUEUED, run_at__lte=now)
+    for job_id in ready.order_by('run_at').values_list('pk', flat=True)[:10]:
+        claimed = Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+            status=Job.RUNNING, started=now, worker=worker
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def run(job):
+    function = registry.get(job.name)
+    job.attempts += 1
+    started = time.perf_counter()
+    try:
+        if function is None:
+            raise LookupError(f'Неизвестная задача {job.name}')
+        function(**json.loads(job.payload))
+    except Exception:
+        job.duration = time.perf_counter() - started
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts and function is not None:
+            job.status = Job.QUEUED
+            job.run_at = timezone.now() + backoff(job.attempts)
+        else:
+            job.status = Job.FAILED
+            job.finished = timezone.now()
+        logger.warning(
+            '%s #%d attempt %d failed in %.3f s',
+            job.name, job.pk, job.attempts, job.duration,
+        )
+    else:
+        job.duration = time.perf_counter() - started
+        job.status = Job.DONE
+        job.finished = timezone.now()
+        logger.info('%s #%d done in %.3f s', job.name, job.pk, job.duration)
+    job.save()
+    if function is not None and function.every and job.status != Job.QUEUED:
+        enqueue(job.name, delay=function.every.total_seconds())
+    return job
+
+
+def schedule_periodic():
+    """Ставит в очередь повторяющиеся задачи, которых там ещё нет."""
+    pending = set(
+        Job.objects.filter(status__in=(Job.QUEUED, Job.RUNNING))
+        .values_list('name', flat=True).distinct()
+    )
+    return [
+        enqueue(name) for name, function in sorted(registry.items())
+        if function.every and name not in pending
+    ]
+
+
+def purge(before):
+    """Удаляет выполненные задачи, завершённые до before, пачками."""
+    finished = Job.objects.filter(
+        status=Job.DONE, finished__lt=before
+    ).order_by()
+    deleted = 0
+    while True:
+        ids = list(finished.values_list('pk', flat=True)[:PURGE_BATCH])
+        if not ids:
+            return deleted
+        deleted += Job.objects.filter(pk__in=ids).delete()[0]
+
+
+def requeue_stale(stale_after=STALE_AFTER):
+    """Возвращает в очередь задачи упавших обработчиков."""
+    return Job.objects.filter(
+        status=Job.RUNNING, started__lt=timezone.now() - stale_after
+    ).update(status=Job.QUEUED)
+
+
+def stats():
+    """Число задач, среднее и наибольшее время по имени и статусу."""
+    return (
+        Job.objects.values('name', 'status')
+        .annotate(
+            count=Count('pk'), avg=Avg('duration'), max=Max('duration')
+        )
+        .order_by('name', 'status')
+    )
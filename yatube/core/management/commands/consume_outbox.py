@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ... import outbox
+
+
+class Command(BaseCommand):
+    help = 'Передаёт накопившиеся события outbox потребителям'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'consumers', nargs='*',
+            help='Имена потребителей, по умолчанию все',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=outbox.BATCH_SIZE,
+            help='Сколько событий обрабатывать в одной транзакции',
+        )
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Начать с первого события, чтобы пересобрать данные',
+        )
+        parser.add_argument(
+            '--prune-days', type=int,
+            help='Удалить прочитанные всеми события старше этого числа дней',
+        )
+
+    def handle(self, *args, **options):
+        names = options['consumers'] or sorted(outbox.consumers)
+        unknown = set(names) - set(outbox.consumers)
+        if unknown:
+            raise CommandError(f'Неизвестные потребители: {unknown}')
+        for name in names:
+            if options['reset']:
+                outbox.seek(name, 0)
+            count = outbox.consume(name, options['batch_size'])
+            self.stdout.write(
+                f'{name}: обработано событий {count}, '
+                f'позиция {outbox.position(name)}'
+            )
+        if options['prune_days'] is not None:
+            before = timezone.now() - timedelta(days=options['prune_days'])
+            self.stdout.write(f'Удалено событий: {outbox.prune(before)}')
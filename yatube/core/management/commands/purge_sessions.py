@@ -0,0 +1,44 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...models import RevokedSession
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет истёкшие сессии и записи об отозванных сессиях '
+        'небольшими порциями'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Сколько сессий удалять за один запрос',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = self.purge(
+            Session.objects.filter(expire_date__lt=now),
+            options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Удалено сессий: {deleted}'))
+        revoked = self.purge(
+            RevokedSession.objects.filter(expires__lt=now),
+            options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено отозванных сессий: {revoked}'
+        ))
+
+    def purge(self, expired, batch_size):
+        expired = expired.order_by()
+        deleted = 0
+        while True:
+            keys = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not keys:
+                return deleted
+            deleted += expired.model.objects.filter(pk__in=keys).delete()[0]
@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+
+from ... import jobs
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads', type=int, default=4,
+            help='Сколько потоков-обработчиков запускать в каждом процессе',
+        )
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Сколько процессов запускать',
+        )
+        parser.add_argument(
+            '--poll', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и завершиться',
+        )
+        parser.add_argument(
+            '--stats', action='store_true',
+            help='Показать статистику по задачам и завершиться',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.print_stats()
+            return
+        requeued = jobs.requeue_stale()
+        if requeued:
+            self.stdout.write(f'Возвращено в очередь задач: {requeued}')
+        jobs.schedule_periodic()
+        work = (options['threads'], options['poll'], options['once'])
+        if options['processes'] > 1:
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            processes = [
+                context.Process(target=self.work, args=work)
+                for _ in range(options['processes'])
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+        else:
+            self.work(*work)
+        if options['once']:
+            self.print_stats()
+
+    def work(self, threads, poll, once):
+        self.stopping = threading.Event()
+        prefix = f'{socket.gethostname()}:{os.getpid()}'
+        if threads == 1:
+            processed = self.loop(f'{prefix}:0', poll, once)
+            self.stdout.write(f'{prefix}: выполнено задач {processed}')
+            return
+        with ThreadPoolExecutor(threads) as pool:
+            futures = [
+                pool.submit(self.loop, f'{prefix}:{number}', poll, once)
+                for number in range(threads)
+            ]
+            try:
+                while wait(futures, timeout=1).not_done:
+                    pass
+            except KeyboardInterrupt:
+                self.stopping.set()
+        processed = sum(future.result() for future in futures)
+        self.stdout.write(f'{prefix}: выполнено задач {processed}')
+
+    def loop(self, worker, poll, once):
+        processed = 0
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                job = jobs.claim(worker)
+                if job is None:
+                    if once:
+                        break
+                    time.sleep(poll)
+                    continue
+                jobs.run(job)
+                processed += 1
+        finally:
+            connection.close()
+        return processed
+
+    def print_stats(self):
+        for row in jobs.stats():
+            self.stdout.write(
+                f'{row["name"]:<30} {row["status"]:<8} {row["count"]:>7} '
+                f'avg {(row["avg"] or 0) * 1000:8.1f} мс '
+                f'max {(row["max"] or 0) * 1000:8.1f} мс'
+            )
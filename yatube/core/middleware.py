@@ -0,0 +1,144 @@
+import mimetypes
+import os
+import posixpath
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import http_date
+
+from . import auth, compression
+from .staticfiles import accepted_encodings, variant_paths
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, max-age=60'
+MIN_COMPRESS_SIZE = 512
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную статику из STATIC_ROOT без фронтенд-прокси.
+
+    Выбирает brotli- или gzip-вариант файла по Accept-Encoding, а файлам
+    с хэшем в имени ставит вечный кэш.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.root = settings.STATIC_ROOT
+        self.prefix = settings.STATIC_URL
+        self.variants = {}
+
+    def __call__(self, request):
+        if (
+            self.root
+            and request.method in ('GET', 'HEAD')
+            and request.path.startswith(self.prefix)
+        ):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def find_variants(self, name):
+        if name in self.variants:
+            return self.variants[name]
+        variants = variant_paths(self.root, name)
+        if variants:
+            self.variants[name] = variants
+        return variants
+
+    def is_immutable(self, name):
+        hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+        return name in hashed_files.values()
+
+    def serve(self, request, name):
+        name = posixpath.normpath(unquote(name)).lstrip('/')
+        if name.startswith('..') or name == '.':
+            return None
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        for encoding, path in self.find_variants(name):
+            if encoding is None or encoding in accepted:
+                break
+        else:
+            return None
+        content_type, _ = mimetypes.guess_type(name)
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Vary'] = 'Accept-Encoding'
+        response['Last-Modified'] = http_date(os.path.getmtime(path))
+        response['Cache-Control'] = (
+            IMMUTABLE_CACHE_CONTROL if self.is_immutable(name)
+            else REVALIDATE_CACHE_CONTROL
+        )
+        return response
+
+
+class CompressionMiddleware:
+    """Сжимает текстовые ответы brotli или gzip, в том числе потоковые.
+
+    Пропускает короткие и уже сжатые ответы. Степень сжатия и процессорное
+    время пишутся в лог yatube.compression и в заголовок Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(
+            settings, 'COMPRESSION_MIN_SIZE', MIN_COMPRESS_SIZE
+        )
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header('Content-Encoding'):
+            return response
+        if not compression.is_compressible(response.get('Content-Type', '')):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        for coder in compression.coders():
+            if coder.encoding in accepted:
+                break
+        else:
+            return response
+        measurement = compression.Measurement(coder.encoding)
+        if response.streaming:
+            response.streaming_content = compression.compress_stream(
+                coder, response.streaming_content, measurement, request.path
+            )
+            del response['Content-Length']
+        else:
+            content = compression.compress(
+                coder, response.content, measurement
+            )
+            measurement.log(request.path)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+            response['Server-Timing'] = measurement.server_timing()
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = coder.encoding
+        return response
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware с кэшем пользователей в памяти процесса."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: auth.get_user(request))
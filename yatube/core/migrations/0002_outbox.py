@@ -0,0 +1,40 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False, verbose_name='Номер события')),
+                ('topic', models.CharField(help_text='Например, post.created', max_length=50, verbose_name='Тип события')),
+                ('object_id', models.PositiveIntegerField(help_text='Первичный ключ изменённой записи', verbose_name='Объект')),
+                ('payload', models.TextField(default='{}', help_text='Данные события в JSON', verbose_name='Данные')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата события')),
+            ],
+            options={
+                'verbose_name': 'Событие',
+                'verbose_name_plural': 'События',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.CreateModel(
+            name='OutboxOffset',
+            fields=[
+                ('consumer', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Потребитель')),
+                ('position', models.BigIntegerField(default=0, verbose_name='Последнее обработанное событие')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Позиция потребителя',
+                'verbose_name_plural': 'Позиции потребителей',
+            },
+        ),
+    ]
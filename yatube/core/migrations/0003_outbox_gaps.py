@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxoffset',
+            name='gaps',
+            field=models.TextField(default='{}', help_text='Номера до позиции, которые ещё не были видны, в JSON', verbose_name='Пропуски'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_outbox_gaps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedSession',
+            fields=[
+                ('session_id', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='Идентификатор сессии')),
+                ('expires', models.DateTimeField(db_index=True, help_text='После этой даты cookie сессии истекает сама', verbose_name='Хранить до')),
+            ],
+            options={
+                'verbose_name': 'Отозванная сессия',
+                'verbose_name_plural': 'Отозванные сессии',
+            },
+        ),
+    ]
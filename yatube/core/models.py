@@ -0,0 +1,168 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=100,
+        verbose_name='Задача',
+        help_text='Имя зарегистрированной задачи',
+    )
+    payload = models.TextField(
+        default='{}',
+        verbose_name='Аргументы',
+        help_text='Аргументы задачи в JSON',
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=QUEUED,
+        verbose_name='Статус',
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Попытки',
+        help_text='Сколько раз задачу уже запускали',
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=5,
+        verbose_name='Максимум попыток',
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Запустить не раньше',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата постановки в очередь',
+    )
+    started = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начало последней попытки',
+    )
+    finished = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Окончание',
+    )
+    duration = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Длительность, с',
+        help_text='Время последней попытки',
+    )
+    worker = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Обработчик',
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка',
+    )
+
+    class Meta:
+        ordering = ('run_at',)
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'), name='job_status_run_at'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}: {self.status}'
+
+
+class OutboxEvent(models.Model):
+    id = models.BigAutoField(
+        primary_key=True,
+        verbose_name='Номер события',
+    )
+    topic = models.CharField(
+        max_length=50,
+        verbose_name='Тип события',
+        help_text='Например, post.created',
+    )
+    object_id = models.PositiveIntegerField(
+        verbose_name='Объект',
+        help_text='Первичный ключ изменённой записи',
+    )
+    payload = models.TextField(
+        default='{}',
+        verbose_name='Данные',
+        help_text='Данные события в JSON',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата события',
+    )
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Событие'
+        verbose_name_plural = 'События'
+
+    def __str__(self):
+        return f'#{self.pk} {self.topic} {self.object_id}'
+
+
+class OutboxOffset(models.Model):
+    consumer = models.CharField(
+        max_length=100,
+        primary_key=True,
+        verbose_name='Потребитель',
+    )
+    position = models.BigIntegerField(
+        default=0,
+        verbose_name='Последнее обработанное событие',
+    )
+    gaps = models.TextField(
+        default='{}',
+        verbose_name='Пропуски',
+        help_text='Номера до позиции, которые ещё не были видны, в JSON',
+    )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата обновления',
+    )
+
+    class Meta:
+        verbose_name = 'Позиция потребителя'
+        verbose_name_plural = 'Позиции потребителей'
+
+    def __str__(self):
+        return f'{self.consumer}: {self.position}'
+
+
+class RevokedSession(models.Model):
+    session_id = models.CharField(
+        max_length=32,
+        primary_key=True,
+        verbose_name='Идентификатор сессии',
+    )
+    expires = models.DateTimeField(
+        db_index=True,
+        verbose_name='Хранить до',
+        help_text='После этой даты cookie сессии истекает сама',
+    )
+
+    class Meta:
+        verbose_name = 'Отозванная сессия'
+        verbose_name_plural = 'Отозванные сессии'
+
+    def __str__(self):
+        return self.session_id
@@ -0,0 +1,165 @@
+import json
+import time
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import router, transaction
+
+from .models import OutboxEvent, OutboxOffset
+
+BATCH_SIZE = 500
+GAP_TIMEOUT = 60 * 60
+MAX_GAPS = 1000
+NOTIFY_KEY = 'outbox:changed'
+
+consumers = {}
+
+
+class TransactionalSaveMixin:
+    """save() в транзакции, чтобы событие из post_save записалось
+    атомарно с самой строкой. delete() и так выполняется в транзакции."""
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(
+            type(self), instance=self
+        )
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+def event(topic, object_id, **payload):
+    return OutboxEvent(
+        topic=topic, object_id=object_id, payload=json.dumps(payload)
+    )
+
+
+def notify():
+    """После коммита меняет метку в кэше: читателям, которые ждут новых
+    событий, не нужно опрашивать базу, пока метка та же."""
+    transaction.on_commit(
+        lambda: cache.set(NOTIFY_KEY, uuid4().hex, None)
+    )
+
+
+def record(topic, object_id, **payload):
+    instance = event(topic, object_id, **payload)
+    instance.save()
+    notify()
+    return instance
+
+
+def record_many(events):
+    OutboxEvent.objects.bulk_create(events)
+    notify()
+
+
+def last_id():
+    return OutboxEvent.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    ).first() or 0
+
+
+def read(after=0, limit=BATCH_SIZE, topics=None):
+    """События с номером больше after по возрастанию номера."""
+    events = OutboxEvent.objects.filter(pk__gt=after)
+    if topics:
+        events = events.filter(topic__in=topics)
+    return list(events.order_by('pk')[:limit])
+
+
+def payload(event):
+    return json.loads(event.payload)
+
+
+def register(name):
+    """Регистрирует потребителя: функцию, принимающую пачку событий."""
+    def decorator(handler):
+        consumers[name] = handler
+        return handler
+    return decorator
+
+
+def position(name):
+    offset = OutboxOffset.objects.filter(consumer=name).first()
+    return offset.position if offset else 0
+
+
+def seek(name, new_position=0):
+    """Переставляет потребителя, например на 0 для полного повтора."""
+    OutboxOffset.objects.update_or_create(
+        consumer=name, defaults={'position': new_position, 'gaps': '{}'}
+    )
+
+
+def track_gaps(gaps, late, after, events, now):
+    """Пропуски после чтения: номера между after и последним из events,
+    которых среди них нет, плюс прежние, кроме появившихся late.
+
+    Номер выдаётся при вставке, а видна строка после коммита, поэтому
+    медленная транзакция может закоммитить меньший номер позже большего.
+    Номера откатившихся транзакций не появятся никогда: такие пропуски
+    забываются через GAP_TIMEOUT секунд. Незакоммиченные транзакции
+    держат свежие номера, поэтому хранятся только MAX_GAPS последних.
+    """
+    gaps = {
+        pk: seen for pk, seen in gaps.items() if now - seen < GAP_TIMEOUT
+    }
+    for event in late:
+        gaps.pop(event.pk, None)
+    if events:
+        present = {event.pk for event in events}
+        first = max(after + 1, events[-1].pk - MAX_GAPS)
+        for pk in range(first, events[-1].pk):
+            if pk not in present:
+                gaps[pk] = now
+    return dict(sorted(gaps.items())[-MAX_GAPS:])
+
+
+def consume(name, batch_size=BATCH_SIZE):
+    """Отдаёт потребителю все накопившиеся события пачками.
+
+    Перед новыми событиями перечитываются пропуски: событие медленной
+    транзакции придёт позже соседей, но не потеряется. Обработка пачки
+    и сдвиг позиции коммитятся вместе, так что после сбоя потребитель
+    продолжит с первой необработанной пачки.
+    """
+    handler = consumers[name]
+    processed = 0
+    while True:
+        with transaction.atomic():
+            offset, _ = OutboxOffset.objects.select_for_update().get_or_create(
+                consumer=name
+            )
+            gaps = {
+                int(pk): seen for pk, seen in json.loads(offset.gaps).items()
+            }
+            late = list(
+                OutboxEvent.objects.filter(pk__in=gaps).order_by('pk')
+            ) if gaps else []
+            events = read(offset.position, batch_size)
+            new_gaps = track_gaps(
+                gaps, late, offset.position, events, time.time()
+            )
+            if late or events:
+                handler(late + events)
+            if events:
+                offset.position = events[-1].pk
+            if late or events or new_gaps != gaps:
+                offset.gaps = json.dumps(new_gaps)
+                offset.save()
+        processed += len(late) + len(events)
+        if not events:
+            return processed
+
+
+def prune(before):
+    """Удаляет старые события, которые уже прочитали все потребители."""
+    events = OutboxEvent.objects.filter(created__lt=before)
+    if consumers:
+        positions = dict(
+            OutboxOffset.objects.filter(consumer__in=consumers)
+            .values_list('consumer', 'position')
+        )
+        oldest = min(positions.get(name, 0) for name in consumers)
+        events = events.filter(pk__lte=oldest)
+    return events.delete()[0]
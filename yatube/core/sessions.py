@@ -0,0 +1,55 @@
+"""Сессии в подписанных cookie со списком отозванных сессий.
+
+Каждой сессии присваивается случайный идентификатор. При выходе и смене
+ключа он попадает в таблицу отозванных до истечения cookie. Таблица
+общая для всех процессов и не вытесняется, как кэш в памяти процесса.
+Проверяются только сессии вошедших пользователей, одним запросом
+по первичному ключу.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends import signed_cookies
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from .models import RevokedSession
+
+SESSION_ID_KEY = '_session_id'
+
+
+def revoke(session_id):
+    if session_id:
+        RevokedSession.objects.bulk_create([RevokedSession(
+            session_id=session_id,
+            expires=timezone.now() + timedelta(
+                seconds=settings.SESSION_COOKIE_AGE
+            ),
+        )], ignore_conflicts=True)
+
+
+def is_revoked(session_id):
+    return RevokedSession.objects.filter(session_id=session_id).exists()
+
+
+class SessionStore(signed_cookies.SessionStore):
+    def load(self):
+        data = super().load()
+        if SESSION_KEY in data and is_revoked(data.get(SESSION_ID_KEY)):
+            self.create()
+            return {}
+        return data
+
+    def _get_session_key(self):
+        self._session.setdefault(SESSION_ID_KEY, get_random_string(32))
+        return super()._get_session_key()
+
+    def flush(self):
+        revoke(self._session.get(SESSION_ID_KEY))
+        super().flush()
+
+    def cycle_key(self):
+        revoke(self._session.get(SESSION_ID_KEY))
+        self._session[SESSION_ID_KEY] = get_random_string(32)
+        super().cycle_key()
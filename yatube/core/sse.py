@@ -0,0 +1,115 @@
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import StreamingHttpResponse
+
+from . import outbox
+
+RETRY = 3000
+RETRY_BUSY = 10000
+POLL_INTERVAL = 1.0
+KEEPALIVE = 15
+DURATION = 55
+MAX_STREAMS = 2
+
+
+class StreamSlots:
+    """Число открытых потоков в процессе."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.open = 0
+
+    def acquire(self, limit):
+        with self.lock:
+            if self.open >= limit:
+                return False
+            self.open += 1
+            return True
+
+    def release(self):
+        with self.lock:
+            self.open -= 1
+
+
+slots = StreamSlots()
+
+
+def format_event(event_id, name, data):
+    data = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f'id: {event_id}\nevent: {name}\ndata: {data}\n\n'
+
+
+def last_event_id(request):
+    """Номер события, с которого продолжить, или None для нового
+    подключения."""
+    value = request.META.get('HTTP_LAST_EVENT_ID')
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def event_stream(position, topics, select):
+    """Пересылает события outbox после position, которые select
+    превращает в пары (имя, данные).
+
+    Открытый поток занимает поток обработчика WSGI на
+    SSE_STREAM_DURATION секунд, поэтому в процессе одновременно держится
+    не больше SSE_MAX_STREAMS потоков. Остальные подключения получают
+    уже накопившиеся события и сразу закрываются, а браузер повторяет
+    запрос через RETRY_BUSY миллисекунд с Last-Event-ID: получается
+    обычный опрос.
+
+    База читается только когда изменилась метка outbox.NOTIFY_KEY в кэше
+    и раз в KEEPALIVE секунд, а соединение с ней между чтениями
+    закрывается.
+    """
+    poll = getattr(settings, 'SSE_POLL_INTERVAL', POLL_INTERVAL)
+    held = slots.acquire(getattr(settings, 'SSE_MAX_STREAMS', MAX_STREAMS))
+    duration = getattr(settings, 'SSE_STREAM_DURATION', DURATION)
+    if not held:
+        duration = 0
+    started = time.monotonic()
+    checked = None
+    marker = None
+    try:
+        yield f'retry: {RETRY if held else RETRY_BUSY}\n\n'
+        while True:
+            now = time.monotonic()
+            current = cache.get(outbox.NOTIFY_KEY)
+            keepalive = checked is not None and now - checked >= KEEPALIVE
+            if checked is None or current != marker or keepalive:
+                if keepalive:
+                    yield ': ping\n\n'
+                marker, checked = current, now
+                for event in outbox.read(position, topics=topics):
+                    position = event.pk
+                    message = select(event)
+                    if message is not None:
+                        yield format_event(event.pk, *message)
+                if not connection.in_atomic_block:
+                    connection.close()
+            if now - started >= duration:
+                return
+            time.sleep(poll)
+    finally:
+        if held:
+            slots.release()
+
+
+def stream_response(request, topics, select):
+    position = last_event_id(request)
+    if position is None:
+        position = outbox.last_id()
+    response = StreamingHttpResponse(
+        event_stream(position, topics, select),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
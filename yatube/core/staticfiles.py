@@ -0,0 +1,80 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.html', '.txt', '.json', '.xml', '.ico', '.map',
+)
+MIN_COMPRESS_SIZE = 256
+
+
+def compressors():
+    yield 'gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield 'br', lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэширует имена файлов и заранее сжимает их в .gz и .br."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            for compressed_name in self.compress(name):
+                yield name, compressed_name, True
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            data = source.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for extension, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) >= len(data):
+                continue
+            with open(f'{path}.{extension}', 'wb') as target:
+                target.write(compressed)
+            yield f'{name}.{extension}'
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, которые клиент не запретил (q=0)."""
+    encodings = set()
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0
+        coding = coding.strip().lower()
+        if coding and quality > 0:
+            encodings.add(coding)
+    return encodings
+
+
+def variant_paths(root, name):
+    """Сжатые варианты файла от самого компактного и сам файл."""
+    path = os.path.join(root, name)
+    variants = [
+        (encoding, f'{path}.{extension}')
+        for extension, encoding in (('br', 'br'), ('gz', 'gzip'))
+        if os.path.isfile(f'{path}.{extension}')
+    ]
+    if os.path.isfile(path):
+        variants.append((None, path))
+    return variants
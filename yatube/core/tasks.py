@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMultiAlternatives
+from django.utils import timezone
+
+from .jobs import KEEP_DONE, purge, register
+
+
+@register('core.send_mail')
+def send_mail(subject, body, from_email, to, html_body=None):
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html_body is not None:
+        message.attach_alternative(html_body, 'text/html')
+    message.send()
+
+
+@register('core.purge_jobs', every=timedelta(days=1))
+def purge_jobs():
+    purge(timezone.now() - KEEP_DONE)
@@ -0,0 +1,10 @@
+from django import template
+
+from .. import paginator
+
+register = template.Library()
+
+
+@register.filter
+def next_cursor(page):
+    return paginator.next_cursor(page)
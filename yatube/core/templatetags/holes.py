@@ -0,0 +1,12 @@
+from django import template
+
+from .. import holes
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, *args):
+    if holes.is_deferred(context, name):
+        return holes.marker(name, *args)
+    return holes.render(context.get('request'), name, *args)
@@ -0,0 +1,67 @@
+import gzip
+from unittest import skipIf
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .. import compression
+from ..middleware import CompressionMiddleware
+
+PAGE = ('<article><p>Текст поста</p></article>' * 200).encode()
+
+
+@override_settings(COMPRESSION_MIN_SIZE=512)
+class CompressionMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept='gzip'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_html_is_gzipped_with_timing(self):
+        """HTML сжимается gzip, в Server-Timing есть степень сжатия."""
+        response = self.process(HttpResponse(PAGE))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), PAGE)
+        self.assertEqual(
+            response['Content-Length'], str(len(response.content))
+        )
+        self.assertIn('compress;dur=', response['Server-Timing'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @skipIf(compression.brotli is None, 'brotli не установлен')
+    def test_brotli_is_preferred(self):
+        """brotli выбирается, если клиент его поддерживает."""
+        response = self.process(HttpResponse(PAGE), accept='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(
+            compression.brotli.decompress(response.content), PAGE
+        )
+
+    def test_small_response_is_not_compressed(self):
+        """Короткие ответы не сжимаются."""
+        response = self.process(HttpResponse(b'<p>ok</p>'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_binary_and_encoded_responses_are_skipped(self):
+        """Картинки и уже сжатые ответы не сжимаются повторно."""
+        image = self.process(HttpResponse(PAGE, content_type='image/png'))
+        self.assertFalse(image.has_header('Content-Encoding'))
+        encoded = HttpResponse(PAGE)
+        encoded['Content-Encoding'] = 'br'
+        self.assertEqual(self.process(encoded)['Content-Encoding'], 'br')
+
+    def test_no_accept_encoding(self):
+        """Без Accept-Encoding ответ отдаётся как есть."""
+        response = self.process(HttpResponse(PAGE), accept='')
+        self.assertEqual(response.content, PAGE)
+
+    def test_streaming_response_is_compressed(self):
+        """Потоковый ответ сжимается по частям."""
+        chunks = [PAGE[:1000], PAGE[1000:]]
+        with self.assertLogs('yatube.compression', 'INFO'):
+            response = self.process(StreamingHttpResponse(iter(chunks)))
+            body = b''.join(response.streaming_content)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(body), PAGE)
@@ -0,0 +1,154 @@
+import re
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Post, TrendingScore, User
+
+from .. import jobs
+from ..models import Job
+
+calls = []
+
+
+@jobs.register('tests.flaky', max_attempts=2)
+def flaky(fail):
+    calls.append(fail)
+    if fail:
+        raise ValueError('Сбой задачи')
+
+
+@override_settings(JOBS_EAGER=False)
+class JobQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        """Задача сохраняется в базе и выполняется обработчиком."""
+        job = jobs.enqueue('tests.flaky', fail=False)
+        self.assertEqual(job.status, Job.QUEUED)
+        claimed = jobs.claim('test')
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertIsNone(jobs.claim('test'))
+        jobs.run(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertIsNotNone(job.duration)
+        self.assertEqual(calls, [False])
+
+    def test_retry_with_backoff_then_fail(self):
+        """Упавшая задача откладывается, а после последней попытки
+        помечается ошибкой."""
+        job = jobs.enqueue('tests.flaky', fail=True)
+        jobs.run(jobs.claim('test'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('Сбой задачи', job.last_error)
+        self.assertIsNone(jobs.claim('test'))
+        Job.objects.update(run_at=timezone.now())
+        jobs.run(jobs.claim('test'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_views_defer_side_effects(self):
+        """Создание поста и сброс пароля только ставят задачи в очередь."""
+        user = User.objects.create_user(
+            username='test_user', email='user@example.com',
+            password='password',
+        )
+        client = Client()
+        client.force_login(user)
+        client.post(reverse('posts:post_create'), {'text': 'Пост'})
+        post = Post.objects.get()
+        self.assertFalse(TrendingScore.objects.filter(post=post).exists())
+        client.post(
+            reverse('users:password_reset_form'),
+            {'email': 'user@example.com'},
+        )
+        self.assertEqual(len(mail.outbox), 0)
+        while True:
+            job = jobs.claim('test')
+            if job is None:
+                break
+            jobs.run(job)
+        self.assertTrue(TrendingScore.objects.filter(post=post).exists())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['user@example.com'])
+
+    def test_password_reset_token_not_stored(self):
+        """В аргументах задачи нет ссылки сброса: письмо с рабочей
+        ссылкой собирается при выполнении."""
+        User.objects.create_user(
+            username='test_user', email='user@example.com',
+            password='password',
+        )
+        Client().post(
+            reverse('users:password_reset_form'),
+            {'email': 'user@example.com'},
+        )
+        job = Job.objects.get(name='users.send_password_reset')
+        self.assertNotIn('token', job.payload)
+        self.assertNotIn('/reset/', job.payload)
+        jobs.run(jobs.claim('test'))
+        link = re.search(r'https?://\S+/reset/\S+/', mail.outbox[0].body)
+        response = Client().get(link.group(0), follow=True)
+        self.assertTrue(response.context['validlink'])
+
+    def test_purge_done_jobs(self):
+        """Старые выполненные задачи удаляются, остальные остаются."""
+        old = jobs.enqueue('tests.flaky', fail=False)
+        fresh = jobs.enqueue('tests.flaky', fail=False)
+        queued = jobs.enqueue('tests.flaky', fail=False)
+        Job.objects.filter(pk__in=(old.pk, fresh.pk)).update(
+            status=Job.DONE, finished=timezone.now()
+        )
+        Job.objects.filter(pk=old.pk).update(
+            finished=timezone.now() - jobs.KEEP_DONE * 2
+        )
+        self.assertEqual(jobs.purge(timezone.now() - jobs.KEEP_DONE), 1)
+        self.assertEqual(
+            set(Job.objects.values_list('pk', flat=True)),
+            {fresh.pk, queued.pk},
+        )
+
+    def test_periodic_job_schedules_next_run(self):
+        """Повторяющаяся задача ставится один раз, а после выполнения
+        ставит следующий запуск."""
+        jobs.schedule_periodic()
+        jobs.schedule_periodic()
+        self.assertEqual(
+            Job.objects.filter(name='core.purge_jobs').count(), 1
+        )
+        while True:
+            job = jobs.claim('test')
+            if job is None:
+                break
+            jobs.run(job)
+        self.assertEqual(
+            Job.objects.filter(
+                name='core.purge_jobs', status=Job.QUEUED,
+                run_at__gt=timezone.now(),
+            ).count(),
+            1,
+        )
+
+
+@override_settings(JOBS_EAGER=False)
+class RunWorkersTest(TransactionTestCase):
+    def test_run_workers_once(self):
+        """Обработчики выполняют всю очередь и выводят статистику."""
+        for _ in range(5):
+            jobs.enqueue('tests.flaky', fail=False)
+        out = StringIO()
+        call_command('run_workers', '--threads', '1', '--once', stdout=out)
+        self.assertEqual(
+            Job.objects.filter(name='tests.flaky', status=Job.DONE).count(), 5
+        )
+        self.assertIn('tests.flaky', out.getvalue())
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from posts.models import Comment, Follow, Group, GroupStats, Post, User
+
+from .. import outbox
+from ..models import OutboxEvent
+
+seen = []
+
+
+@outbox.register('tests.collector')
+def collect(events):
+    seen.extend(event.topic for event in events)
+
+
+class OutboxTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.author = User.objects.create_user(username='test_author')
+        cls.group = Group.objects.create(title='Погода', slug='weather')
+
+    def setUp(self):
+        seen.clear()
+
+    def topics(self, after=0):
+        return [event.topic for event in outbox.read(after)]
+
+    def test_writes_produce_events(self):
+        """Изменения постов, комментариев и подписок пишутся в outbox."""
+        post = Post.objects.create(author=self.author, text='Пост')
+        post.group = self.group
+        post.save()
+        comment = Comment.objects.create(
+            post=post, author=self.user, text='Комментарий'
+        )
+        Follow.objects.create(user=self.user, author=self.author)
+        comment.delete()
+        post.delete()
+        self.assertEqual(self.topics(), [
+            'post.created', 'post.updated', 'comment.created',
+            'follow.created', 'comment.deleted', 'post.deleted',
+        ])
+        updated = outbox.read(topics=['post.updated'])[0]
+        self.assertEqual(outbox.payload(updated)['groups'], [self.group.pk])
+
+    def test_event_rolls_back_with_write(self):
+        """Событие не остаётся, если транзакция с записью откатилась."""
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                Post.objects.create(author=self.author, text='Пост')
+                raise ValueError
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_consumer_reads_in_batches_and_resumes(self):
+        """Потребитель читает пачками и продолжает с сохранённой
+        позиции."""
+        for _ in range(3):
+            Post.objects.create(author=self.author, text='Пост')
+        self.assertEqual(
+            outbox.consume('tests.collector', batch_size=2), 3
+        )
+        Post.objects.create(author=self.author, text='Пост')
+        self.assertEqual(outbox.consume('tests.collector'), 1)
+        self.assertEqual(seen, ['post.created'] * 4)
+        self.assertEqual(
+            outbox.position('tests.collector'),
+            OutboxEvent.objects.latest('pk').pk,
+        )
+
+    def test_late_commit_is_not_lost(self):
+        """Событие, ставшее видным после более позднего, доходит до
+        потребителя, когда тот уже прошёл его номер."""
+        for _ in range(3):
+            Post.objects.create(author=self.author, text='Пост')
+        first, late, last = OutboxEvent.objects.order_by('pk')
+        OutboxEvent.objects.filter(pk=first.pk).update(topic='post.first')
+        OutboxEvent.objects.filter(pk=late.pk).delete()
+        self.assertEqual(outbox.consume('tests.collector'), 2)
+        self.assertEqual(outbox.position('tests.collector'), last.pk)
+        late.topic = 'post.late'
+        late.save(force_insert=True)
+        self.assertEqual(outbox.consume('tests.collector'), 1)
+        self.assertEqual(seen, ['post.first', 'post.created', 'post.late'])
+        self.assertEqual(outbox.consume('tests.collector'), 0)
+
+    def test_gaps_expire(self):
+        """Номера откатившихся транзакций забываются через GAP_TIMEOUT."""
+        events = [OutboxEvent(pk=pk) for pk in (11, 14)]
+        gaps = outbox.track_gaps({}, [], 10, events, now=0)
+        self.assertEqual(gaps, {12: 0, 13: 0})
+        gaps = outbox.track_gaps(gaps, [], 14, [], now=1)
+        self.assertEqual(len(gaps), 2)
+        self.assertEqual(
+            outbox.track_gaps(gaps, [], 14, [], now=outbox.GAP_TIMEOUT), {}
+        )
+
+    def test_replay_rebuilds_group_stats(self):
+        """Повтор событий с начала пересчитывает статистику групп."""
+        Post.objects.create(author=self.author, text='Пост', group=self.group)
+        GroupStats.objects.update(post_count=0)
+        OutboxEvent.objects.update(created=timezone.now() - timedelta(1))
+        out = StringIO()
+        call_command('consume_outbox', 'group_stats', '--reset', stdout=out)
+        self.assertIn('group_stats: обработано событий 1', out.getvalue())
+        self.assertEqual(GroupStats.objects.get().post_count, 1)
@@ -0,0 +1,40 @@
+from django.db import connection
+from django.test import TestCase
+
+from posts.models import Post, User
+
+from ..paginator import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='test_author')
+
+    def create_posts(self, count):
+        Post.objects.bulk_create(
+            Post(author=self.author, text=f'Пост {number}')
+            for number in range(count)
+        )
+
+    def paginator(self, queryset, exact_count_limit):
+        paginator = EstimatedCountPaginator(queryset, 10)
+        paginator.exact_count_limit = exact_count_limit
+        return paginator
+
+    def test_large_table_uses_statistics(self):
+        """На большой таблице число строк берётся из статистики."""
+        self.create_posts(3)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.create_posts(2)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.paginator(Post.objects.all(), 0).count, 3)
+        self.assertEqual(self.paginator(Post.objects.all(), 1000).count, 5)
+
+    def test_filtered_queryset_counted_exactly(self):
+        """Отфильтрованную выборку без оценки считают точно."""
+        self.create_posts(3)
+        posts = Post.objects.filter(text='Пост 1')
+        self.assertEqual(self.paginator(posts, 0).count, 1)
@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..auth import user_cache
+from ..models import RevokedSession
+
+User = get_user_model()
+
+
+class SessionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='test_user', password='Pa55word!'
+        )
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.client = Client()
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.cached_db'
+    )
+    def test_authenticated_request_without_auth_queries(self):
+        """Повторный запрос авторизованного пользователя не читает
+        сессию и пользователя из базы."""
+        self.client.force_login(self.user)
+        url = reverse('about:author')
+        response = self.client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, 'test_user')
+
+    @override_settings(SESSION_ENGINE='core.sessions')
+    def test_signed_cookie_session_is_revoked_on_logout(self):
+        """После выхода украденная cookie сессии не работает."""
+        self.client.login(username='test_user', password='Pa55word!')
+        stolen = Client()
+        cookie_name = settings.SESSION_COOKIE_NAME
+        stolen.cookies[cookie_name] = self.client.cookies[cookie_name].value
+        url = reverse('about:author')
+        self.assertTrue(
+            stolen.get(url).context['user'].is_authenticated
+        )
+        self.client.get(reverse('users:logout'))
+        cache.clear()
+        user_cache.clear()
+        self.assertFalse(
+            stolen.get(url).context['user'].is_authenticated
+        )
+        self.assertTrue(RevokedSession.objects.exists())
+
+    def test_purge_sessions_in_batches(self):
+        """Истёкшие сессии удаляются, действующие остаются."""
+        now = timezone.now()
+        Session.objects.bulk_create(
+            Session(
+                session_key=f'expired{i}',
+                session_data='',
+                expire_date=now - timedelta(days=1),
+            )
+            for i in range(5)
+        )
+        Session.objects.create(
+            session_key='alive',
+            session_data='',
+            expire_date=now + timedelta(days=1),
+        )
+        RevokedSession.objects.create(
+            session_id='expired', expires=now - timedelta(days=1)
+        )
+        RevokedSession.objects.create(
+            session_id='alive', expires=now + timedelta(days=1)
+        )
+        out = StringIO()
+        call_command('purge_sessions', batch_size=2, stdout=out)
+        self.assertIn('Удалено сессий: 5', out.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list('pk', flat=True)), ['alive']
+        )
+        self.assertIn('Удалено отозванных сессий: 1', out.getvalue())
+        self.assertEqual(
+            list(RevokedSession.objects.values_list('pk', flat=True)),
+            ['alive'],
+        )
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase
+
+
+class SQLitePragmasTest(SimpleTestCase):
+    databases = {'default'}
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        """PRAGMA из настроек выполняются при подключении."""
+        pragmas = settings.DATABASES['default']['OPTIONS']['pragmas']
+        self.assertEqual(self.pragma('busy_timeout'), pragmas['busy_timeout'])
+        self.assertEqual(self.pragma('cache_size'), pragmas['cache_size'])
+        self.assertEqual(self.pragma('synchronous'), 1)
+
+    def test_pragmas_not_passed_to_driver(self):
+        """Ключ pragmas не передаётся в sqlite3.connect."""
+        self.assertNotIn('pragmas', connection.get_connection_params())
@@ -0,0 +1,94 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import skipIf
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+
+from .. import staticfiles
+from ..staticfiles import accepted_encodings
+
+TEMP_STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(
+    STATIC_ROOT=TEMP_STATIC_ROOT,
+    STATICFILES_STORAGE=(
+        'core.staticfiles.CompressedManifestStaticFilesStorage'
+    ),
+)
+class CompressedStaticFilesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, stdout=StringIO())
+        with open(os.path.join(TEMP_STATIC_ROOT, 'staticfiles.json')) as f:
+            cls.manifest = json.load(f)['paths']
+        cls.css = cls.manifest['css/bootstrap.min.css']
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_collectstatic_precompresses_hashed_files(self):
+        """collectstatic хэширует имена и создаёт сжатые копии."""
+        self.assertNotEqual(self.css, 'css/bootstrap.min.css')
+        path = os.path.join(TEMP_STATIC_ROOT, self.css)
+        with open(path, 'rb') as original, gzip.open(f'{path}.gz') as packed:
+            self.assertEqual(original.read(), packed.read())
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(TEMP_STATIC_ROOT, self.manifest['img/logo.png'])
+                + '.gz'
+            )
+        )
+
+    def test_gzip_variant_is_served_with_immutable_cache(self):
+        """Хэшированный файл отдаётся сжатым и кэшируется навсегда."""
+        response = self.client.get(
+            settings.STATIC_URL + self.css, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', response['Cache-Control'])
+        body = b''.join(response.streaming_content)
+        with open(os.path.join(TEMP_STATIC_ROOT, self.css), 'rb') as css:
+            self.assertEqual(gzip.decompress(body), css.read())
+
+    @skipIf(staticfiles.brotli is None, 'brotli не установлен')
+    def test_brotli_is_preferred(self):
+        """При поддержке brotli клиенту отдаётся br-вариант."""
+        response = self.client.get(
+            settings.STATIC_URL + self.css,
+            HTTP_ACCEPT_ENCODING='gzip, deflate, br',
+        )
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    def test_identity_for_clients_without_compression(self):
+        """Без Accept-Encoding отдаётся исходный файл."""
+        response = self.client.get(settings.STATIC_URL + self.css)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_unhashed_name_is_revalidated(self):
+        """Файл без хэша в имени кэшируется ненадолго."""
+        response = self.client.get(
+            settings.STATIC_URL + 'css/bootstrap.min.css'
+        )
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_accepted_encodings_respects_zero_quality(self):
+        """Кодировки с q=0 считаются запрещёнными."""
+        self.assertEqual(
+            accepted_encodings('gzip;q=1.0, br;q=0, identity'),
+            {'gzip', 'identity'},
+        )
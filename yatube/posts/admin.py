@@ -1,17 +1,154 @@
-from django.contrib import admin
+from datetime import datetime
 
-from .models import Group, Post
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.cache import cache
+from django.db.models import Max, Min, QuerySet
+from django.utils import timezone
+
+from core.paginator import EstimatedCountPaginator
+
+from . import bulk
+from .models import GROUP_CHOICES_KEY, Group, Post
+
+GROUP_CHOICES_TIMEOUT = 60
+
+
+def group_choices():
+    """Варианты групп для выпадающих списков, общие для всех строк."""
+    return cache.get_or_set(
+        GROUP_CHOICES_KEY,
+        lambda: [('', '---------')] + list(
+            Group.objects.order_by('title').values_list('pk', 'title')
+        ),
+        GROUP_CHOICES_TIMEOUT,
+    )
+
+
+class PostAdminQuerySet(QuerySet):
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None):
+        """Годы для date_hierarchy по MIN/MAX из индекса pub_date
+        вместо DISTINCT по всей таблице."""
+        if kind != 'year':
+            return super().datetimes(field_name, kind, order, tzinfo)
+        bounds = self.order_by().aggregate(
+            first=Min(field_name), last=Max(field_name)
+        )
+        if bounds['first'] is None:
+            return []
+        if settings.USE_TZ:
+            tzinfo = tzinfo or timezone.get_current_timezone()
+            bounds = {
+                key: timezone.localtime(value, tzinfo)
+                for key, value in bounds.items()
+            }
+        years = [
+            datetime(year, 1, 1)
+            for year in range(bounds['first'].year, bounds['last'].year + 1)
+        ]
+        if settings.USE_TZ:
+            years = [timezone.make_aware(year, tzinfo) for year in years]
+        return years if order == 'ASC' else years[::-1]
+
+
+class GroupActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.order_by('title'),
+        required=False,
+        label='Группа',
+        help_text='Куда перенести посты',
+    )
+
+
+class BulkActionsMixin:
+    """Массовые действия над всей выборкой пачками UPDATE/DELETE."""
+
+    action_form = GroupActionForm
+    actions = ('move_to_group', 'delete_posts')
+
+    def target_group(self, request):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if form.is_valid() and form.cleaned_data['group']:
+            return form.cleaned_data['group']
+        self.message_user(
+            request, 'Выберите группу для переноса.', messages.ERROR
+        )
+        return None
+
+    def report(self, request, verb, result):
+        self.message_user(
+            request,
+            f'{verb} постов: {result.rows} за {result.seconds:.2f} с '
+            f'({result.rate:.0f} строк/с)',
+            messages.SUCCESS,
+        )
+
+    def move_to_group(self, request, queryset):
+        group = self.target_group(request)
+        if group is not None:
+            posts = self.posts_queryset(queryset)
+            self.report(request, 'Перенесено', bulk.move_posts(posts, group))
+    move_to_group.short_description = 'Перенести посты в группу'
+
+    def delete_posts(self, request, queryset):
+        posts = self.posts_queryset(queryset)
+        self.report(request, 'Удалено', bulk.delete_posts(posts))
+    delete_posts.short_description = 'Удалить посты'
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+class PostAdmin(BulkActionsMixin, admin.ModelAdmin):
+    list_display = (
+        'pk', 'text', 'pub_date', 'author', 'group', 'views', 'impressions'
+    )
     list_editable = ('group',)
+    list_select_related = ('author', 'group', 'stats')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def posts_queryset(self, queryset):
+        return queryset
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return PostAdminQuerySet(
+            self.model, query=queryset.query, using=queryset.db
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'group':
+            field.choices = group_choices()
+        return field
+
+    def views(self, post):
+        stats = getattr(post, 'stats', None)
+        return stats.views if stats else 0
+    views.short_description = 'Просмотры'
+    views.admin_order_field = 'stats__views'
+
+    def impressions(self, post):
+        stats = getattr(post, 'stats', None)
+        return stats.impressions if stats else 0
+    impressions.short_description = 'Показы'
+    impressions.admin_order_field = 'stats__impressions'
+
 
 @admin.register(Group)
-class GroupAdmin(admin.ModelAdmin):
+class GroupAdmin(BulkActionsMixin, admin.ModelAdmin):
     list_display = ('pk', 'title', 'slug', 'description')
+
+    def posts_queryset(self, queryset):
+        return Post.objects.filter(group__in=queryset.values('pk'))
@@ -0,0 +1,203 @@
+import json
+import zlib
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core import outbox, paginator
+
+from . import bulk, rendering
+from .models import ArchivedPost, Comment, Post, User
+
+ARCHIVE_AFTER = timedelta(days=365)
+BATCH_SIZE = 500
+COMPRESSION_LEVEL = 9
+
+
+def pack(post, comments):
+    payload = {
+        'text': post.text,
+        'image': post.image.name or '',
+        'comments': [
+            [comment.author_id, comment.text, comment.created.isoformat()]
+            for comment in comments
+        ],
+    }
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return zlib.compress(data.encode(), COMPRESSION_LEVEL)
+
+
+def unpack(archived):
+    return json.loads(zlib.decompress(bytes(archived.data)).decode())
+
+
+def restore(archived):
+    """Пост из архива в виде несохраняемого экземпляра Post."""
+    payload = unpack(archived)
+    post = Post(
+        id=archived.pk,
+        text=payload['text'],
+        pub_date=archived.pub_date,
+        author_id=archived.author_id,
+        group_id=archived.group_id,
+        image=payload['image'],
+    )
+    if ArchivedPost.author.is_cached(archived):
+        post.author = archived.author
+    if ArchivedPost.group.is_cached(archived):
+        post.group = archived.group
+    rendering.fill(post)
+    post.archived = True
+    post.archived_comments = payload['comments']
+    return post
+
+
+def restore_comments(post):
+    """Комментарии архивного поста с подгруженными авторами."""
+    authors = User.objects.filter(is_active=True).in_bulk(
+        {author_id for author_id, _, _ in post.archived_comments}
+    )
+    return [
+        Comment(
+            post=post,
+            author=authors[author_id],
+            text=text,
+            created=parse_datetime(created),
+        )
+        for author_id, text, created in post.archived_comments
+        if author_id in authors
+    ]
+
+
+def get_post(post_id):
+    """Пост из основной таблицы, а если его там нет — из архива."""
+    post = Post.objects.select_related('author', 'group').filter(
+        id=post_id
+    ).first()
+    if post is not None:
+        return post
+    archived = ArchivedPost.objects.select_related('author', 'group').filter(
+        id=post_id
+    ).first()
+    return archived and restore(archived)
+
+
+def get_author_id(post_id):
+    for model in (Post, ArchivedPost):
+        author_id = model.objects.filter(
+            id=post_id, author__is_active=True
+        ).values_list('author_id', flat=True).first()
+        if author_id is not None:
+            return author_id
+    return None
+
+
+def author_post_count(author):
+    return author.posts.count() + author.archived_posts.count()
+
+
+class FeedWithArchive:
+    """Лента из свежих постов, за которыми идут архивные.
+
+    В архив попадают только посты старше отсечки, поэтому склейка двух
+    отсортированных по дате выборок остаётся отсортированной.
+    """
+
+    def __init__(self, posts, archived):
+        self.posts = posts
+        self.archived = archived
+        self._hot_count = None
+        self._count = None
+
+    def hot_count(self):
+        if self._hot_count is None:
+            self._hot_count = self.posts.count()
+        return self._hot_count
+
+    def count(self):
+        if self._count is None:
+            self._count = self.hot_count() + self.archived.count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start, stop, _ = key.indices(self.count())
+        hot_count = self.hot_count()
+        result = []
+        if start < hot_count:
+            result += self.posts[start:min(stop, hot_count)]
+        if stop > hot_count:
+            archived = self.archived[max(start - hot_count, 0):
+                                     stop - hot_count]
+            result += [restore(item) for item in archived]
+        return result
+
+    def before(self, value, pk, limit):
+        """Посты раньше курсора, с переходом в архив, для KeysetPage."""
+        result = list(paginator.before(self.posts, value, pk)[:limit])
+        if len(result) < limit:
+            archived = paginator.before(self.archived, value, pk)
+            result += [
+                restore(item) for item in archived[:limit - len(result)]
+            ]
+        return result
+
+
+def archive_batch(before, batch_size=BATCH_SIZE):
+    """Переносит одну пачку старых постов с комментариями в архив.
+
+    Для остального сайта пост не удаляется: обработчики удаления
+    отключены, событие outbox — post.archived, а просмотры, правки
+    и лайки остаются под тем же номером поста. Статистика групп
+    считает и архивные посты, поэтому не меняется.
+    """
+    with transaction.atomic():
+        posts = list(
+            Post.objects.filter(pub_date__lt=before)
+            .order_by('pub_date')[:batch_size]
+        )
+        if not posts:
+            return 0
+        comments = {}
+        for comment in Comment.objects.filter(post__in=posts).order_by(
+            'created', 'pk'
+        ):
+            comments.setdefault(comment.post_id, []).append(comment)
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(
+                id=post.pk,
+                author_id=post.author_id,
+                group_id=post.group_id,
+                pub_date=post.pub_date,
+                data=pack(post, comments.get(post.pk, ())),
+            )
+            for post in posts
+        )
+        with bulk.suppressed():
+            Post.objects.filter(pk__in=[post.pk for post in posts]).delete()
+        outbox.record_many([
+            outbox.event(
+                'post.archived', post.pk,
+                author_id=post.author_id,
+                groups=sorted({post.group_id} - {None}),
+            )
+            for post in posts
+        ])
+    return len(posts)
+
+
+def archive_posts(before=None, batch_size=BATCH_SIZE):
+    if before is None:
+        before = timezone.now() - ARCHIVE_AFTER
+    total = 0
+    while True:
+        archived = archive_batch(before, batch_size)
+        if not archived:
+            return total
+        total += archived
@@ -0,0 +1,168 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from core import holes, outbox
+
+from . import feeds, group_stats
+from .models import Comment, Like, LikeCounter, Post, PostRevision, PostStats
+
+CHUNK_SIZE = 1000
+
+_state = threading.local()
+
+
+class BulkResult:
+    def __init__(self):
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def add(self, rows):
+        self.rows += rows
+        self.seconds = time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        if not self.seconds:
+            return 0
+        return self.rows / self.seconds
+
+
+@contextmanager
+def suppressed():
+    """Отключает построчные обработчики удаления постов и комментариев:
+    массовая операция сама пишет события и сбрасывает кэши на пачку."""
+    previous = active()
+    _state.active = True
+    try:
+        yield
+    finally:
+        _state.active = previous
+
+
+def active():
+    return getattr(_state, 'active', False)
+
+
+def delete_dependents(post_ids):
+    """Удаляет строки, которые ссылаются на посты без ограничения в базе.
+
+    Они не удаляются каскадом, чтобы пережить перенос поста в архив,
+    поэтому при настоящем удалении поста их удаляют отдельно.
+    """
+    for model in (PostStats, PostRevision, Like, LikeCounter):
+        model.objects.filter(post_id__in=post_ids).delete()
+
+
+def chunked_ids(queryset, chunk_size=CHUNK_SIZE):
+    """Ключи выборки пачками по возрастанию, без OFFSET.
+
+    Каждая пачка выбирается заново, поэтому строки, которые после
+    изменения перестали подходить под фильтр, не сдвигают следующие.
+    """
+    last_id = None
+    queryset = queryset.order_by('pk')
+    while True:
+        chunk = queryset if last_id is None else queryset.filter(
+            pk__gt=last_id
+        )
+        ids = list(chunk.values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def move_posts(queryset, group, chunk_size=CHUNK_SIZE):
+    """Переносит посты выборки в группу одним UPDATE на пачку."""
+    result = BulkResult()
+    model = queryset.model
+    target = group and group.pk
+    for ids in chunked_ids(queryset, chunk_size):
+        with transaction.atomic():
+            posts = model.objects.filter(pk__in=ids)
+            rows = list(posts.values_list(
+                'pk', 'author_id', 'group_id', 'pub_date'
+            ))
+            changed = {group_id for _, _, group_id, _ in rows}
+            posts.update(group=group)
+            outbox.record_many(
+                outbox.event(
+                    'post.updated', post_id,
+                    author_id=author_id,
+                    groups=sorted({group_id, target} - {None}),
+                )
+                for post_id, author_id, group_id, _ in rows
+            )
+            moved = [row for row in rows if row[2] != target]
+            group_stats.apply(
+                added=[(target, pub_date) for *_, pub_date in moved],
+                removed=[
+                    (group_id, pub_date) for _, _, group_id, pub_date in moved
+                ],
+            )
+            feeds.invalidate(changed | {target}, index=False)
+            holes.invalidate(*(
+                scope for post_id, author_id, *_ in rows
+                for scope in (f'author:{author_id}', f'post:{post_id}')
+            ))
+        result.add(len(rows))
+    return result
+
+
+def delete_chunk(ids):
+    """Удаляет пачку постов вместе с комментариями. События outbox
+    пишутся одним INSERT, кэши и статистика групп сбрасываются один раз.
+
+    Возвращает кортежи (pk, author_id, group_id, image, pub_date)
+    удалённых постов.
+    """
+    posts = Post.objects.filter(pk__in=ids)
+    rows = list(posts.values_list(
+        'pk', 'author_id', 'group_id', 'image', 'pub_date'
+    ))
+    comments = list(
+        Comment.objects.filter(post_id__in=ids)
+        .values_list('pk', 'post_id', 'author_id')
+    )
+    with suppressed():
+        posts.delete()
+    delete_dependents(ids)
+    outbox.record_many([
+        outbox.event(
+            'comment.deleted', comment_id,
+            post_id=post_id, author_id=author_id,
+        )
+        for comment_id, post_id, author_id in comments
+    ] + [
+        outbox.event(
+            'post.deleted', post_id,
+            author_id=author_id, groups=sorted({group_id} - {None}),
+        )
+        for post_id, author_id, group_id, *_ in rows
+    ])
+    group_stats.apply(removed=[
+        (group_id, pub_date) for _, _, group_id, _, pub_date in rows
+    ])
+    feeds.invalidate(
+        {group_id for _, _, group_id, *_ in rows},
+        {author_id for _, author_id, *_ in rows},
+    )
+    holes.invalidate(*(
+        scope for post_id, author_id, *_ in rows
+        for scope in (f'author:{author_id}', f'post:{post_id}')
+    ))
+    return rows
+
+
+def delete_posts(queryset, chunk_size=CHUNK_SIZE):
+    """Удаляет посты выборки пачками, по несколько запросов на пачку."""
+    result = BulkResult()
+    for ids in chunked_ids(queryset, chunk_size):
+        with transaction.atomic():
+            rows = delete_chunk(ids)
+        result.add(len(rows))
+    return result
@@ -0,0 +1,62 @@
+import hashlib
+
+from django.core.cache import cache
+from django.template import Context, Engine
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def post_ids(posts):
+    """Идентификаторы постов для метки показов: 1-2-3."""
+    return '-'.join(str(post.pk) for post in posts)
+
+
+def card_version(post):
+    """Отпечаток всех полей, которые выводятся в карточке поста."""
+    parts = [
+        post.excerpt,
+        post.pub_date.isoformat(),
+        post.image.name or '',
+        post.author.username,
+        post.author.get_full_name(),
+    ]
+    if post.group_id:
+        parts += [post.group.slug, post.group.title]
+    digest = hashlib.md5('\x1f'.join(parts).encode())
+    return digest.hexdigest()[:16]
+
+
+def card_key(post, show_author, show_group, backend='django'):
+    variant = f'{int(show_author)}{int(show_group)}'
+    return f'post_card:{backend}:{variant}:{post.pk}:{card_version(post)}'
+
+
+def cached_cards(posts, show_author, show_group, render, backend):
+    """Карточки постов: из кэша одним get_many, промахи рендерятся
+    и записываются одним set_many."""
+    keys = [
+        card_key(post, show_author, show_group, backend) for post in posts
+    ]
+    cards = cache.get_many(keys)
+    missing = {}
+    for key, post in zip(keys, posts):
+        if key not in cards:
+            missing[key] = render({
+                'post': post,
+                'show_author': show_author,
+                'show_group': show_group,
+            })
+    if missing:
+        cache.set_many(missing, CARD_CACHE_TIMEOUT)
+        cards.update(missing)
+    return [mark_safe(cards[key]) for key in keys]
+
+
+def render_cards(posts, show_author=True, show_group=True, engine=None):
+    template = (engine or Engine.get_default()).get_template(CARD_TEMPLATE)
+    return cached_cards(
+        posts, show_author, show_group,
+        lambda context: template.render(Context(context)), 'django',
+    )
@@ -0,0 +1,23 @@
+from core import outbox
+
+from . import group_stats, sitemaps
+
+
+@outbox.register('group_stats')
+def refresh_group_stats(events):
+    """Пересчитывает статистику групп, затронутых пачкой событий.
+
+    Нужен, чтобы догнать статистику после восстановления базы или
+    массовых правок в обход моделей: outbox.seek('group_stats', n).
+    """
+    group_ids = set()
+    for event in events:
+        if event.topic.startswith('post.'):
+            group_ids.update(outbox.payload(event)['groups'])
+    group_stats.refresh(group_ids)
+
+
+@outbox.register(sitemaps.CONSUMER)
+def refresh_sitemaps(events):
+    """Пересобирает разделы карты сайта, затронутые пачкой событий."""
+    sitemaps.changed(events)
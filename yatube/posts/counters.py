@@ -0,0 +1,189 @@
+"""Счётчики просмотров и показов постов.
+
+Каждый процесс копит прибавки в памяти и раз в FLUSH_INTERVAL секунд
+записывает их одним INSERT ... ON CONFLICT на пачку постов. Пишет
+фоновый поток, который запускает yatube/wsgi.py, а при штатной
+остановке процесса остаток записывается через atexit. При падении
+процесса теряется не больше, чем накоплено с последней записи.
+"""
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .models import ArchivedPost, Post, PostStats
+
+logger = logging.getLogger('yatube.counters')
+
+FLUSH_INTERVAL = 10
+MAX_PENDING = 1000
+UPSERT_BATCH = 300
+VIEWS_TIMEOUT = 60
+
+VIEWS = 0
+IMPRESSIONS = 1
+
+
+class CounterBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+
+    def add(self, kind, post_ids):
+        with self.lock:
+            for post_id in post_ids:
+                counts = self.pending.setdefault(post_id, [0, 0])
+                counts[kind] += 1
+            full = len(self.pending) >= MAX_PENDING
+        if full:
+            flusher.wake.set()
+
+    def pending_views(self, post_id):
+        with self.lock:
+            return self.pending.get(post_id, (0, 0))[VIEWS]
+
+    def take(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            return pending
+
+    def restore(self, pending):
+        with self.lock:
+            for post_id, (views, impressions) in pending.items():
+                counts = self.pending.setdefault(post_id, [0, 0])
+                counts[VIEWS] += views
+                counts[IMPRESSIONS] += impressions
+
+    def reset(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+
+
+class Flusher:
+    """Фоновый поток записи. Соединение с базой у потока своё и
+    закрывается после каждой записи, чтобы не висеть открытым."""
+
+    def __init__(self):
+        self.wake = threading.Event()
+        self.thread = None
+
+    def interval(self):
+        return getattr(settings, 'COUNTERS_FLUSH_INTERVAL', FLUSH_INTERVAL)
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(
+            target=self.run, name='counters-flush', daemon=True
+        )
+        self.thread.start()
+
+    def tick(self):
+        try:
+            return flush()
+        finally:
+            connection.close()
+
+    def run(self):
+        while True:
+            self.wake.wait(self.interval())
+            self.wake.clear()
+            self.tick()
+
+    def after_fork(self):
+        started, self.thread = self.thread is not None, None
+        self.wake = threading.Event()
+        if started:
+            self.start()
+
+
+buffer = CounterBuffer()
+flusher = Flusher()
+
+
+def count_views(post_id):
+    buffer.add(VIEWS, (post_id,))
+
+
+def count_impressions(posts):
+    buffer.add(IMPRESSIONS, [post.pk for post in posts])
+
+
+def upsert(rows):
+    table = connection.ops.quote_name(PostStats._meta.db_table)
+    values = ', '.join(['(%s, %s, %s)'] * len(rows))
+    sql = (
+        f'INSERT INTO {table} (post_id, views, impressions) '
+        f'VALUES {values} '
+        f'ON CONFLICT (post_id) DO UPDATE SET '
+        f'views = {table}.views + excluded.views, '
+        f'impressions = {table}.impressions + excluded.impressions'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [value for row in rows for value in row])
+
+
+def flush():
+    """Записывает накопленное. Посты, удалённые за это время,
+    пропускаются; при ошибке прибавки возвращаются в буфер."""
+    pending = buffer.take()
+    if not pending:
+        return 0
+    ids = sorted(pending)
+    written = []
+    try:
+        with transaction.atomic():
+            for start in range(0, len(ids), UPSERT_BATCH):
+                chunk = ids[start:start + UPSERT_BATCH]
+                existing = {
+                    pk for model in (Post, ArchivedPost)
+                    for pk in model.objects.filter(
+                        pk__in=chunk
+                    ).order_by().values_list('pk', flat=True)
+                }
+                rows = [
+                    (post_id, *pending[post_id])
+                    for post_id in chunk if post_id in existing
+                ]
+                if rows:
+                    upsert(rows)
+                    written += [post_id for post_id, *_ in rows]
+    except Exception:
+        logger.exception('counters flush failed')
+        buffer.restore(pending)
+        return 0
+    cache.delete_many([f'post_views:{post_id}' for post_id in written])
+    return len(written)
+
+
+def start_flusher():
+    """Запускает запись по таймеру и при выходе из процесса."""
+    if flusher.thread is None:
+        atexit.register(flush)
+    flusher.start()
+
+
+def views(post_id):
+    """Число просмотров: записанное в базе, из кэша, плюс ещё
+    не записанное этим процессом."""
+    stored = cache.get_or_set(
+        f'post_views:{post_id}',
+        lambda: PostStats.objects.filter(post_id=post_id).order_by(
+            'post_id'
+        ).values_list('views', flat=True).first() or 0,
+        VIEWS_TIMEOUT,
+    )
+    return stored + buffer.pending_views(post_id)
+
+
+def after_fork():
+    buffer.reset()
+    flusher.after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=after_fork)
@@ -0,0 +1,146 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.template.defaultfilters import truncatechars
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date, parse_etags
+
+from .models import Group, Post, User
+
+FEED_ITEMS = 20
+FEED_TIMEOUT = 60 * 60 * 24
+TITLE_LENGTH = 50
+GENERATORS = {'rss': Rss201rev2Feed, 'atom': Atom1Feed}
+
+
+def feed_key(kind, key=''):
+    return f'feed:{kind}:{key}'
+
+
+def index_source():
+    return {
+        'title': 'Yatube',
+        'link': reverse('posts:index'),
+        'description': 'Последние обновления на сайте',
+        'posts': Post.objects.filter(author__is_active=True),
+    }
+
+
+def group_source(slug):
+    group = Group.objects.filter(slug=slug).first()
+    if group is None:
+        return None
+    return {
+        'title': f'Yatube: {group.title}',
+        'link': reverse('posts:group_list', args=(slug,)),
+        'description': group.description,
+        'posts': group.posts.filter(author__is_active=True),
+    }
+
+
+def author_source(username):
+    author = User.objects.filter(username=username, is_active=True).first()
+    if author is None:
+        return None
+    return {
+        'title': f'Yatube: {author.get_full_name() or username}',
+        'link': reverse('posts:profile', args=(username,)),
+        'description': f'Все посты пользователя {username}',
+        'posts': author.posts.all(),
+    }
+
+
+SOURCES = {
+    'index': lambda key: index_source(),
+    'group': group_source,
+    'author': author_source,
+}
+
+
+def build(request, source, feed_format):
+    absolute = request.build_absolute_uri
+    feed = GENERATORS[feed_format](
+        title=source['title'],
+        link=absolute(source['link']),
+        description=source['description'],
+        feed_url=absolute(request.path),
+        language='ru',
+    )
+    posts = source['posts'].select_related('author').defer('text').order_by(
+        '-pub_date'
+    )
+    for post in posts[:FEED_ITEMS]:
+        link = absolute(reverse('posts:post_detail', args=(post.pk,)))
+        feed.add_item(
+            title=truncatechars(post.excerpt, TITLE_LENGTH),
+            link=link,
+            description=post.text_html,
+            author_name=post.author.get_full_name() or post.author.username,
+            pubdate=post.pub_date,
+            unique_id=link,
+        )
+    body = feed.writeString('utf-8').encode()
+    return {
+        'body': body,
+        'content_type': feed.content_type,
+        'etag': f'"{hashlib.md5(body).hexdigest()}"',
+        'last_modified': http_date(feed.latest_post_date().timestamp()),
+    }
+
+
+def serve(request, kind, feed_format, key=''):
+    """Отдаёт ленту из кэша; на совпавший If-None-Match отвечает 304,
+    не обращаясь к базе.
+
+    Ленты одного объекта хранятся под одним ключом, чтобы сбрасывать их
+    одним delete: внутри словарь по формату и адресу сайта.
+    """
+    if feed_format not in GENERATORS:
+        raise Http404('Неизвестный формат ленты')
+    cache_key = feed_key(kind, key)
+    variant = f'{feed_format}:{request.scheme}://{request.get_host()}'
+    variants = cache.get(cache_key) or {}
+    feed = variants.get(variant)
+    if feed is None:
+        source = SOURCES[kind](key)
+        if source is None:
+            raise Http404('Лента не найдена')
+        feed = build(request, source, feed_format)
+        variants[variant] = feed
+        cache.set(cache_key, variants, FEED_TIMEOUT)
+    etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    etags = [etag[2:] if etag.startswith('W/') else etag for etag in etags]
+    if feed['etag'] in etags or '*' in etags:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(
+            feed['body'], content_type=feed['content_type']
+        )
+    response['ETag'] = feed['etag']
+    response['Last-Modified'] = feed['last_modified']
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
+
+
+def invalidate(group_ids=(), author_ids=(), index=True):
+    """Сбрасывает ленты сразу и ещё раз после коммита, иначе лента,
+    собранная до коммита, провисела бы в кэше FEED_TIMEOUT."""
+    keys = [feed_key('index')] if index else []
+    group_ids = set(group_ids) - {None}
+    if group_ids:
+        keys += [
+            feed_key('group', slug) for slug in Group.objects.filter(
+                pk__in=group_ids
+            ).values_list('slug', flat=True)
+        ]
+    if author_ids:
+        keys += [
+            feed_key('author', username) for username in User.objects.filter(
+                pk__in=set(author_ids)
+            ).values_list('username', flat=True)
+        ]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
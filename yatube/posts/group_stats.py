@@ -0,0 +1,141 @@
+from django.db.models import (
+    Case, Count, DateTimeField, F, Max, Q, Value, When,
+)
+from django.db.models.functions import Greatest
+
+from core import jobs
+
+from .models import ArchivedPost, Group, GroupStats, Post
+
+TOP_AUTHORS_COUNT = 3
+REFRESH_BATCH = 100
+
+
+def refresh(group_ids):
+    """Полностью пересчитывает статистику затронутых групп. Нужен для
+    починки и самых активных авторов; обычные правки применяют apply."""
+    group_ids = set(group_ids) - {None}
+    for group_id in group_ids:
+        posts = Post.objects.filter(group_id=group_id).order_by()
+        totals = posts.aggregate(
+            post_count=Count('pk'), last_activity=Max('pub_date')
+        )
+        archived = ArchivedPost.objects.filter(group_id=group_id).order_by()
+        if totals['last_activity'] is None:
+            totals['last_activity'] = archived.aggregate(
+                last_activity=Max('pub_date')
+            )['last_activity']
+        GroupStats.objects.update_or_create(
+            group_id=group_id,
+            defaults={
+                'post_count': totals['post_count'] + archived.count(),
+                'last_activity': totals['last_activity'],
+                'top_authors': top_authors(group_id),
+            },
+        )
+
+
+def top_authors(group_id):
+    return ','.join(
+        Post.objects.filter(group_id=group_id)
+        .values('author__username')
+        .annotate(count=Count('pk'))
+        .order_by('-count', 'author__username')
+        .values_list('author__username', flat=True)[:TOP_AUTHORS_COUNT]
+    )
+
+
+def refresh_top_authors(group_ids):
+    """Пересчитывает только самых активных авторов: один GROUP BY по
+    постам группы, счётчики не трогает."""
+    for group_id in set(group_ids) - {None}:
+        GroupStats.objects.filter(group_id=group_id).update(
+            top_authors=top_authors(group_id)
+        )
+
+
+def refresh_all(batch_size=REFRESH_BATCH):
+    """Пересчитывает статистику всех групп пачками."""
+    last_id = 0
+    while True:
+        ids = list(
+            Group.objects.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        refresh(ids)
+        last_id = ids[-1]
+
+
+def last_activity(group_id):
+    dates = [
+        model.objects.filter(group_id=group_id).order_by().aggregate(
+            last=Max('pub_date')
+        )['last']
+        for model in (Post, ArchivedPost)
+    ]
+    return max((date for date in dates if date), default=None)
+
+
+def summarize(posts):
+    """Число постов и самая поздняя дата по группам из пар
+    (group_id, pub_date)."""
+    groups = {}
+    for group_id, pub_date in posts:
+        if group_id is None:
+            continue
+        count, latest = groups.get(group_id, (0, pub_date))
+        groups[group_id] = (count + 1, max(latest, pub_date))
+    return groups
+
+
+def apply(added=(), removed=()):
+    """Поправляет статистику на добавленные и убранные посты, пары
+    (group_id, pub_date), одним UPDATE с F() на группу.
+
+    Дата последней активности пересчитывается, только если убран пост
+    не старше неё. Самых активных авторов затронутых групп пересчитывает
+    задача posts.refresh_top_authors.
+    """
+    for group_id, (count, latest) in summarize(removed).items():
+        stats = GroupStats.objects.filter(group_id=group_id)
+        if not stats.update(
+            post_count=Greatest(F('post_count') - count, Value(0))
+        ):
+            refresh({group_id})
+        elif stats.filter(last_activity__lte=latest).exists():
+            stats.update(last_activity=last_activity(group_id))
+    for group_id, (count, latest) in summarize(added).items():
+        updated = GroupStats.objects.filter(group_id=group_id).update(
+            post_count=F('post_count') + count,
+            last_activity=Case(
+                When(
+                    Q(last_activity__isnull=True)
+                    | Q(last_activity__lt=latest),
+                    then=Value(latest, output_field=DateTimeField()),
+                ),
+                default=F('last_activity'),
+            ),
+        )
+        if not updated:
+            refresh({group_id})
+    changed = set(summarize(added)) | set(summarize(removed))
+    if changed:
+        jobs.enqueue('posts.refresh_top_authors', group_ids=sorted(changed))
+
+
+def post_changed_groups(post):
+    """Группы, чью статистику меняет сохранение поста."""
+    return {getattr(post, '_loaded_group_id', None), post.group_id}
+
+
+def post_saved(post, created):
+    old_group_id = None if created else getattr(
+        post, '_loaded_group_id', None
+    )
+    if created or old_group_id != post.group_id:
+        apply(
+            added=[(post.group_id, post.pub_date)],
+            removed=[(old_group_id, post.pub_date)],
+        )
@@ -0,0 +1,81 @@
+from django.template.loader import render_to_string
+
+from core import holes
+
+from . import counters, likes
+from .forms import CommentForm
+from .models import Follow
+
+RECOMMENDATIONS_COUNT = 5
+
+
+@holes.register('follow')
+def follow_button(request, username):
+    following = request.user.is_authenticated and Follow.objects.filter(
+        user=request.user, author__username=username
+    ).exists()
+    return render_to_string('posts/includes/follow_button.html', {
+        'username': username,
+        'following': following,
+    })
+
+
+@holes.register('recommendations')
+def recommendations(request):
+    if not request.user.is_authenticated:
+        return ''
+    return render_to_string('posts/includes/recommendations.html', {
+        'recommendations': request.user.recommendations.filter(
+            author__is_active=True
+        ).select_related('author')[:RECOMMENDATIONS_COUNT],
+    })
+
+
+@holes.register('comment_form')
+def comment_form(request, post_id):
+    if not request.user.is_authenticated:
+        return ''
+    return render_to_string('posts/includes/comment_form.html', {
+        'post_id': post_id,
+        'form': CommentForm(),
+    }, request=request)
+
+
+@holes.register('views')
+def post_views(request, post_id):
+    """Засчитывает просмотр и выводит число просмотров поста."""
+    post_id = int(post_id)
+    counters.count_views(post_id)
+    return str(counters.views(post_id))
+
+
+@holes.register_batch('impressions')
+def impressions(request, args):
+    """Засчитывает показы постов по меткам страницы. Метка остаётся
+    и в закэшированном фрагменте, поэтому постов из базы не читает."""
+    counters.buffer.add(counters.IMPRESSIONS, [
+        int(pk) for parts in args for post_ids in parts
+        for pk in post_ids.split('-') if pk
+    ])
+    return {parts: '' for parts in args}
+
+
+@holes.register_batch('likes')
+def like_buttons(request, args):
+    """Кнопки лайков всех карточек страницы: два запроса на страницу."""
+    post_ids = [int(post_id) for post_id, in args]
+    counts = likes.counts(post_ids)
+    liked = likes.liked_by(request.user, post_ids)
+    return {
+        (str(post_id),): render_to_string(
+            'posts/includes/like_button.html',
+            {
+                'post_id': post_id,
+                'count': counts.get(post_id, 0),
+                'liked': post_id in liked,
+                'user': request.user,
+            },
+            request=request,
+        )
+        for post_id in post_ids
+    }
@@ -0,0 +1,75 @@
+import random
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from .models import Like, LikeCounter
+
+SHARDS = 8
+
+
+def add_to_counter(post_id, delta):
+    """Прибавляет delta к случайной части счётчика поста: одновременные
+    лайки одного поста чаще всего обновляют разные строки."""
+    shard = random.randrange(SHARDS)
+    shards = LikeCounter.objects.filter(post_id=post_id, shard=shard)
+    if shards.update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            LikeCounter.objects.create(
+                post_id=post_id, shard=shard, count=delta
+            )
+    except IntegrityError:
+        shards.update(count=F('count') + delta)
+
+
+def like(user, post_id):
+    """Ставит лайк. Повторный лайк ничего не меняет; возвращает True,
+    если лайк новый."""
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                Like.objects.create(user=user, post_id=post_id)
+        except IntegrityError:
+            return False
+        add_to_counter(post_id, 1)
+    return True
+
+
+def unlike(user, post_id):
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(user=user, post_id=post_id).delete()
+        if deleted:
+            add_to_counter(post_id, -1)
+    return bool(deleted)
+
+
+def remove(likes):
+    """Удаляет лайки пачкой и вычитает их из счётчиков."""
+    likes = list(likes.values_list('pk', 'post_id'))
+    with transaction.atomic():
+        Like.objects.filter(pk__in=[pk for pk, _ in likes]).delete()
+        for post_id, count in Counter(post for _, post in likes).items():
+            add_to_counter(post_id, -count)
+    return len(likes)
+
+
+def counts(post_ids):
+    """Число лайков для нескольких постов одним запросом."""
+    return dict(
+        LikeCounter.objects.filter(post_id__in=post_ids)
+        .values('post_id').annotate(total=Sum('count'))
+        .order_by().values_list('post_id', 'total')
+    )
+
+
+def liked_by(user, post_ids):
+    """Какие из постов пользователь уже лайкнул, одним запросом."""
+    if not user.is_authenticated:
+        return set()
+    return set(
+        Like.objects.filter(user=user, post_id__in=post_ids)
+        .values_list('post_id', flat=True)
+    )
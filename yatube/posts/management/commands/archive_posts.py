@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...archive import ARCHIVE_AFTER, BATCH_SIZE, archive_posts
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты вместе с комментариями в архив'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=ARCHIVE_AFTER.days,
+            help='Архивировать посты старше этого числа дней',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Сколько постов переносить в одной транзакции',
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        count = archive_posts(before, options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Перенесено в архив постов: {count}')
+        )
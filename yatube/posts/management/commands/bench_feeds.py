@@ -0,0 +1,137 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.paginator import before
+
+from ... import partitions, rendering
+from ...models import Group, Post, User
+from ...views import POSTS_PER_PAGE
+
+DEEP_PAGES = (1, 10, 100, 1000)
+
+
+@contextmanager
+def explicit_pub_date():
+    field = Post._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def scanned_relations(node):
+    """Таблицы, которые план действительно читал (Actual Loops > 0)."""
+    names = set()
+    if node.get('Actual Loops') and 'Relation Name' in node:
+        names.add(node['Relation Name'])
+    for child in node.get('Plans', ()):
+        names |= scanned_relations(child)
+    return names
+
+
+class Command(BaseCommand):
+    help = ('Замеряет задержку глубоких страниц лент по номеру и по '
+            'курсору на текущей базе (SQLite или PostgreSQL)')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Добавить столько постов, распределённых по трём годам; '
+                 'после замера они откатываются',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'])
+            self.run(options['repeat'])
+            # Замер ничего не оставляет в базе, в том числе засеянные посты.
+            transaction.set_rollback(True)
+
+    def run(self, repeat):
+        post = Post.objects.filter(group__isnull=False).first()
+        if post is None:
+            raise CommandError('Нужен хотя бы один пост в группе')
+        feeds = {
+            'index': Post.objects.select_related('author', 'group'),
+            'group': post.group.posts.select_related('author'),
+            'profile': post.author.posts.select_related('group'),
+        }
+        self.stdout.write(f'{connection.vendor}')
+        for name, posts in feeds.items():
+            posts = posts.order_by('-pub_date', '-pk')
+            paginator = Paginator(posts, POSTS_PER_PAGE)
+            for number in DEEP_PAGES:
+                if number > paginator.num_pages:
+                    break
+                page = paginator.page(number).object_list
+                self.report(name, number, 'номер', page, repeat)
+                if number > 1:
+                    last = posts[(number - 1) * POSTS_PER_PAGE - 1]
+                    value, pk = last.pub_date, last.pk
+                    cursor = before(posts, value, pk)[:POSTS_PER_PAGE + 1]
+                    self.report(name, number, 'курсор', cursor, repeat)
+
+    def report(self, name, number, mode, queryset, repeat):
+        elapsed = self.measure(queryset, repeat)
+        self.stdout.write(
+            f'  {name:<8} страница {number:>5} ({mode:<6}): '
+            f'{elapsed * 1000:8.2f} мс{self.partitions(queryset)}'
+        )
+
+    def measure(self, queryset, repeat):
+        total = 0.0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            total += time.perf_counter() - started
+        return total / repeat
+
+    def partitions(self, queryset):
+        if connection.vendor != 'postgresql':
+            return ''
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0][0]['Plan']
+        scanned = {
+            name for name in scanned_relations(plan)
+            if name.startswith('posts_post_')
+        }
+        return f', прочитано секций: {len(scanned)}'
+
+    def seed(self, count):
+        """Посты с готовыми excerpt и text_html; живут до отката."""
+        user, _ = User.objects.get_or_create(username='bench_author')
+        group, _ = Group.objects.get_or_create(
+            slug='bench', defaults={'title': 'Бенчмарк', 'description': '-'}
+        )
+        now = timezone.now()
+        with explicit_pub_date():
+            for start in range(0, count, 1000):
+                posts = [
+                    Post(
+                        author=user,
+                        group=group,
+                        text=f'Пост {start + i}',
+                        pub_date=now - timedelta(
+                            seconds=random.randint(0, 3 * 365 * 24 * 3600)
+                        ),
+                    )
+                    for i in range(min(1000, count - start))
+                ]
+                for post in posts:
+                    rendering.fill(post)
+                partitions.ensure_for(
+                    connection, [post.pub_date for post in posts]
+                )
+                Post.objects.bulk_create(posts)
@@ -0,0 +1,131 @@
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from ...models import Comment, Group, Post, User
+
+PROFILES = {
+    'rollback journal': {},
+    'WAL + pragmas': settings.SQLITE_PRAGMAS,
+}
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает задержки смешанной нагрузки чтения и записи '
+            'на SQLite с журналом отката и с WAL')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--posts', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for number, (name, pragmas) in enumerate(PROFILES.items()):
+                alias = f'bench_{number}'
+                connections.databases[alias] = {
+                    **settings.DATABASES['default'],
+                    'NAME': os.path.join(directory, f'{alias}.sqlite3'),
+                    'OPTIONS': {'timeout': 5, 'pragmas': pragmas},
+                }
+                connections.ensure_defaults(alias)
+                call_command('migrate', database=alias, verbosity=0)
+                self.seed(alias, options['posts'])
+                results = self.run(alias, options)
+                connections[alias].close()
+                del connections.databases[alias]
+                self.report(name, results)
+
+    def seed(self, alias, count):
+        user = User.objects.db_manager(alias).create_user('bench')
+        Group.objects.using(alias).bulk_create([
+            Group(title='Бенчмарк', slug='bench', description='Бенчмарк')
+        ])
+        group = Group.objects.using(alias).get(slug='bench')
+        Post.objects.using(alias).bulk_create(
+            [
+                Post(author=user, group=group, text=f'Пост {i}')
+                for i in range(count)
+            ],
+            batch_size=500,
+        )
+
+    def run(self, alias, options):
+        deadline = time.monotonic() + options['seconds']
+        results = {'read': [], 'write': [], 'locked': []}
+        lock = threading.Lock()
+        user_id = User.objects.using(alias).get(username='bench').pk
+        post_ids = list(
+            Post.objects.using(alias).values_list('pk', flat=True)
+        )
+
+        def read():
+            posts = Post.objects.using(alias).select_related(
+                'author', 'group'
+            ).order_by('-pub_date')
+            list(posts[:10])
+            posts.count()
+
+        def write():
+            with transaction.atomic(using=alias):
+                if random.random() < 0.5:
+                    Post.objects.using(alias).bulk_create(
+                        [Post(author_id=user_id, text='Новый пост')]
+                    )
+                else:
+                    Comment.objects.using(alias).bulk_create([Comment(
+                        author_id=user_id,
+                        post_id=random.choice(post_ids),
+                        text='Комментарий',
+                    )])
+
+        def worker(kind, operation):
+            timings = []
+            locked = 0
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    operation()
+                except OperationalError:
+                    locked += 1
+                    continue
+                timings.append(time.perf_counter() - started)
+            connections[alias].close()
+            with lock:
+                results[kind].extend(timings)
+                results['locked'].append(locked)
+
+        threads = [
+            threading.Thread(target=worker, args=('read', read))
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(target=worker, args=('write', write))
+            for _ in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def report(self, name, results):
+        self.stdout.write(name)
+        for kind in ('read', 'write'):
+            timings = sorted(results[kind]) or [0]
+            p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+            self.stdout.write(
+                f'  {kind:<6} операций: {len(results[kind]):>6}  '
+                f'p50: {statistics.median(timings) * 1000:7.2f} мс  '
+                f'p95: {p95 * 1000:7.2f} мс  '
+                f'max: {timings[-1] * 1000:7.2f} мс'
+            )
+        self.stdout.write(f'  ошибок блокировки: {sum(results["locked"])}')
@@ -0,0 +1,146 @@
+import itertools
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+
+from ...cards import card_key
+from ...models import Post
+from ...views import POSTS_PER_PAGE
+
+try:
+    from django.template.backends.jinja2 import Jinja2
+except ImportError:
+    Jinja2 = None
+
+BASE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+CACHED_LOADERS = [('django.template.loaders.cached.Loader', BASE_LOADERS)]
+
+
+def django_backend(loaders):
+    return DjangoTemplates({
+        'NAME': 'django',
+        'DIRS': settings.TEMPLATES[0]['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'loaders': loaders,
+            'context_processors': (
+                settings.TEMPLATES[0]['OPTIONS']['context_processors']
+            ),
+        },
+    })
+
+
+def jinja2_backend():
+    return Jinja2({
+        'NAME': 'jinja2',
+        'DIRS': [os.path.join(settings.BASE_DIR, 'jinja2')],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+            'auto_reload': False,
+            'context_processors': (
+                settings.TEMPLATES[0]['OPTIONS']['context_processors']
+            ),
+        },
+    })
+
+
+def fragment_keys(context):
+    """Ключи кэша, которые заполняет рендеринг страницы: карточки во
+    всех вариантах и фрагмент ленты. Остальной кэш замер не трогает."""
+    page_obj = context['page_obj']
+    keys = [make_template_fragment_key(
+        'index_page', [page_obj.number, '']
+    )]
+    for post, backend, show_author, show_group in itertools.product(
+        page_obj, ('django', 'jinja2'), (False, True), (False, True)
+    ):
+        keys.append(card_key(post, show_author, show_group, backend))
+    return keys
+
+
+def modes():
+    yield 'django: без кэша шаблонов, холодные карточки', (
+        lambda: django_backend(BASE_LOADERS), False
+    )
+    yield 'django: с кэшем шаблонов, холодные карточки', (
+        lambda: django_backend(CACHED_LOADERS), False
+    )
+    yield 'django: с кэшем шаблонов, тёплые карточки', (
+        lambda: django_backend(CACHED_LOADERS), True
+    )
+    if Jinja2 is not None:
+        yield 'jinja2: холодные карточки', (jinja2_backend, False)
+        yield 'jinja2: тёплые карточки', (jinja2_backend, True)
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время рендеринга страниц лент разными шаблонизаторами'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Сколько раз рендерить каждую страницу',
+        )
+
+    def handle(self, *args, **options):
+        post = Post.objects.select_related('author', 'group').filter(
+            group__isnull=False
+        ).first()
+        if post is None:
+            raise CommandError('Нужен хотя бы один пост в группе')
+        pages = self.pages(post)
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        for mode, (make_backend, warm) in modes():
+            backend = make_backend()
+            self.stdout.write(mode)
+            for name, context in pages.items():
+                elapsed = self.measure(
+                    backend, name, context, request, warm, options['repeat']
+                )
+                self.stdout.write(f'  {name:<25} {elapsed * 1000:8.2f} мс')
+
+    def pages(self, post):
+        feeds = {
+            'posts/index.html': Post.objects.all(),
+            'posts/follow.html': Post.objects.all(),
+            'posts/group_list.html': post.group.posts.all(),
+            'posts/profile.html': post.author.posts.all(),
+        }
+        pages = {}
+        for name, posts in feeds.items():
+            posts = list(
+                posts.select_related('author', 'group')[:POSTS_PER_PAGE]
+            )
+            pages[name] = {
+                'page_obj': Paginator(posts, POSTS_PER_PAGE).get_page(1),
+                'group': post.group,
+                'author': post.author,
+                'count': lambda posts=posts: len(posts),
+                'post_ids': '-'.join(str(post.pk) for post in posts),
+            }
+        return pages
+
+    def measure(self, backend, name, context, request, warm, repeat):
+        backend.get_template(name).render(dict(context), request)
+        keys = fragment_keys(context)
+        total = 0.0
+        for _ in range(repeat):
+            if not warm:
+                cache.delete_many(keys)
+            started = time.perf_counter()
+            backend.get_template(name).render(dict(context), request)
+            total += time.perf_counter() - started
+        return total / repeat
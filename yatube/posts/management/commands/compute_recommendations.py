@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...recommendations import TOP_K, rebuild_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рекомендации "на кого подписаться"'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=TOP_K,
+            help='Сколько авторов хранить для каждого пользователя',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        created = rebuild_recommendations(options['top'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Сохранено рекомендаций: {created} '
+            f'за {time.monotonic() - started:.1f} с'
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ...partitions import YEARS_AHEAD, ensure_ahead
+
+
+class Command(BaseCommand):
+    help = 'Заранее создаёт годовые секции таблицы постов в PostgreSQL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--years-ahead', type=int, default=YEARS_AHEAD,
+            help='На сколько лет вперёд создать секции',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Секционирование доступно только в PostgreSQL')
+        created = ensure_ahead(connection, options['years_ahead'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Секции готовы: {", ".join(created)}'
+        ))
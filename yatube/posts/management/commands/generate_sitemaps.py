@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core import outbox
+
+from ... import sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Собирает карту сайта, пересобирая только изменившиеся разделы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Пересобрать все разделы',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Сколько событий outbox обрабатывать за раз',
+        )
+
+    def handle(self, *args, **options):
+        if options['full'] or not sitemaps.exists():
+            count = sitemaps.generate_all()
+            self.stdout.write(f'Карта сайта собрана заново: адресов {count}')
+            return
+        events = outbox.consume(sitemaps.CONSUMER, options['batch_size'])
+        self.stdout.write(f'Обработано событий: {events}')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ...trending import rebuild_scores
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг популярных постов с нуля'
+
+    def handle(self, *args, **options):
+        count = rebuild_scores()
+        self.stdout.write(self.style.SUCCESS(f'Пересчитано постов: {count}'))
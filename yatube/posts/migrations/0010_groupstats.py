@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_trendingscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(help_text='Группа, для которой собрана статистика', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group', verbose_name='Группа')),
+                ('post_count', models.PositiveIntegerField(default=0, help_text='Сколько постов опубликовано в группе', verbose_name='Количество постов')),
+                ('last_activity', models.DateTimeField(blank=True, db_index=True, help_text='Дата последнего поста группы', null=True, verbose_name='Последняя активность')),
+                ('top_authors', models.CharField(blank=True, help_text='Имена пользователей через запятую', max_length=500, verbose_name='Самые активные авторы')),
+            ],
+            options={
+                'verbose_name': 'Статистика группы',
+                'verbose_name_plural': 'Статистика групп',
+            },
+        ),
+    ]
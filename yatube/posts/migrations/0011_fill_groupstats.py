@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Count, Max
+
+TOP_AUTHORS_COUNT = 3
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    Post = apps.get_model('posts', 'Post')
+    db_alias = schema_editor.connection.alias
+    groups = Group.objects.using(db_alias).values_list('pk', flat=True)
+    for group_id in groups.iterator():
+        posts = Post.objects.using(db_alias).filter(
+            group_id=group_id
+        ).order_by()
+        totals = posts.aggregate(
+            post_count=Count('pk'), last_activity=Max('pub_date')
+        )
+        top_authors = (
+            posts.values('author__username')
+            .annotate(count=Count('pk'))
+            .order_by('-count', 'author__username')
+            .values_list('author__username', flat=True)[:TOP_AUTHORS_COUNT]
+        )
+        GroupStats.objects.using(db_alias).update_or_create(
+            group_id=group_id,
+            defaults={
+                'post_count': totals['post_count'],
+                'last_activity': totals['last_activity'],
+                'top_authors': ','.join(top_authors),
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_groupstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
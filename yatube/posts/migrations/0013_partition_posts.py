@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def partition_posts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from posts.partitions import partition_posts
+    partition_posts(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0013_partition_posts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.PositiveIntegerField(help_text='Номер, под которым пост был опубликован', primary_key=True, serialize=False, verbose_name='Номер поста')),
+                ('pub_date', models.DateTimeField(help_text='Дата публикации архивного поста', verbose_name='Дата публикации поста')),
+                ('data', models.BinaryField(help_text='Сжатые текст, картинка и комментарии поста', verbose_name='Содержимое')),
+                ('author', models.ForeignKey(help_text='Автор архивного поста', on_delete=django.db.models.deletion.CASCADE, related_name='archived_posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор поста')),
+                ('group', models.ForeignKey(blank=True, help_text='Группа архивного поста', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_posts', to='posts.Group', verbose_name='Группа')),
+            ],
+            options={
+                'verbose_name': 'Архивный пост',
+                'verbose_name_plural': 'Архивные посты',
+                'ordering': ('-pub_date',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedpost',
+            index=models.Index(fields=['author', '-pub_date'], name='archived_post_author_pub_date'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_rendered(apps, schema_editor):
+    from posts import rendering
+
+    Post = apps.get_model('posts', 'Post')
+    last_id = 0
+    while True:
+        batch = list(
+            Post.objects.filter(pk__gt=last_id).order_by('pk')
+            .only('pk', 'text')[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        for post in batch:
+            rendering.fill(post)
+        Post.objects.bulk_update(batch, ('excerpt', 'text_html'))
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_archivedpost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, help_text='Заполняется при сохранении, выводится в лентах', max_length=500, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, help_text='Заполняется при сохранении, выводится на странице поста', verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(fill_rendered, migrations.RunPython.noop),
+    ]
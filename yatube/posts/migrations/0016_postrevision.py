@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_post_excerpt_text_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostRevision',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='Номер правки')),
+                ('sequence', models.BigIntegerField(help_text='Номер события outbox; правка с меньшим номером, пришедшая позже, отбрасывается', verbose_name='Номер события')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата правки')),
+                ('is_snapshot', models.BooleanField(default=False, help_text='Иначе хранится разница с предыдущей правкой', verbose_name='Полный текст')),
+                ('data', models.BinaryField(help_text='Сжатый текст или сжатая разница', verbose_name='Данные')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='posts.Post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'Правка поста',
+                'verbose_name_plural': 'Правки постов',
+                'ordering': ('post', 'number'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postrevision',
+            constraint=models.UniqueConstraint(fields=('post', 'number'), name='unique_post_revision'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_postrevision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostStats',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Post', verbose_name='Пост')),
+                ('views', models.BigIntegerField(default=0, help_text='Сколько раз открывали страницу поста', verbose_name='Просмотры')),
+                ('impressions', models.BigIntegerField(default=0, help_text='Сколько раз пост показывали в лентах', verbose_name='Показы')),
+            ],
+            options={
+                'verbose_name': 'Просмотры поста',
+                'verbose_name_plural': 'Просмотры постов',
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def remove_default_partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from posts.partitions import remove_default_partition
+    remove_default_partition(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_likes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_default_partition, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0019_remove_default_partition'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='postrevision',
+            options={'ordering': ('post_id', 'number'), 'verbose_name': 'Правка поста', 'verbose_name_plural': 'Правки постов'},
+        ),
+        migrations.AlterField(
+            model_name='like',
+            name='post',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='likes', to='posts.Post', verbose_name='Пост'),
+        ),
+        migrations.AlterField(
+            model_name='likecounter',
+            name='post',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='like_counters', to='posts.Post', verbose_name='Пост'),
+        ),
+        migrations.AlterField(
+            model_name='postrevision',
+            name='post',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='revisions', to='posts.Post', verbose_name='Пост'),
+        ),
+        migrations.AlterField(
+            model_name='poststats',
+            name='post',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='stats', serialize=False, to='posts.Post', verbose_name='Пост'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def rerender(apps, schema_editor):
+    from posts import rendering
+
+    Post = apps.get_model('posts', 'Post')
+    last_id = 0
+    while True:
+        batch = list(
+            Post.objects.filter(pk__gt=last_id).order_by('pk')
+            .only('pk', 'text')[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        for post in batch:
+            post.text_html = rendering.render_html(post.text)
+        Post.objects.bulk_update(batch, ('text_html',))
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0020_keep_post_dependents_on_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(rerender, migrations.RunPython.noop),
+    ]
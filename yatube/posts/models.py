@@ -1,8 +1,16 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connections, models, router
+from django.utils import timezone
+
+from core.outbox import TransactionalSaveMixin
+
+from . import partitions, rendering
 
 User = get_user_model()
 
+# Кэш списка групп в админке; сбрасывается сигналами при изменении групп.
+GROUP_CHOICES_KEY = 'admin_group_choices'
+
 
 class Group(models.Model):
     title = models.CharField(
@@ -25,7 +33,7 @@ class Group(models.Model):
         return self.title
 
 
-class Post(models.Model):
+class Post(TransactionalSaveMixin, models.Model):
     text = models.TextField(
         verbose_name='Текст',
         help_text='О чем хотите написать пост'
@@ -58,17 +66,64 @@ class Post(models.Model):
         blank=True,
         help_text='Загрузите картинку',
     )
+    excerpt = models.CharField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста',
+        help_text='Заполняется при сохранении, выводится в лентах',
+    )
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст в HTML',
+        help_text='Заполняется при сохранении, выводится на странице поста',
+    )
 
     class Meta:
         ordering = ('-pub_date',)
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
+        indexes = (
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date',
+            ),
+            models.Index(
+                fields=('group', '-pub_date'),
+                name='post_group_pub_date',
+            ),
+        )
 
     def __str__(self):
         return self.text[:15]
 
+    def save(self, *args, **kwargs):
+        if 'text' not in self.get_deferred_fields():
+            rendering.fill(self)
+        if self._state.adding:
+            using = kwargs.get('using') or router.db_for_write(
+                type(self), instance=self
+            )
+            partitions.ensure_for(
+                connections[using], [self.pub_date or timezone.now()]
+            )
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_group_id = instance.__dict__.get('group_id')
+        instance._loaded_text = instance.__dict__.get('text')
+        return instance
+
+    def text_changed(self):
+        if 'text' in self.get_deferred_fields():
+            return False
+        return getattr(self, '_loaded_text', None) != self.text
 
-class Comment(models.Model):
+
+class Comment(TransactionalSaveMixin, models.Model):
     text = models.TextField(
         verbose_name='Текст комментария',
         help_text='О чем хотите написать комментарий'
@@ -97,7 +152,7 @@ class Comment(models.Model):
         return self.text[:15]
 
 
-class Follow(models.Model):
+class Follow(TransactionalSaveMixin, models.Model):
     user = models.ForeignKey(
         User,
         verbose_name='Пользователь',
@@ -112,3 +167,293 @@ class Follow(models.Model):
         on_delete=models.CASCADE,
         related_name='following',
     )
+
+
+class Recommendation(models.Model):
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        help_text='Кому рекомендуется автор',
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+    )
+    author = models.ForeignKey(
+        User,
+        verbose_name='Автор',
+        help_text='Рекомендуемый автор',
+        on_delete=models.CASCADE,
+        related_name='recommended_to',
+    )
+    score = models.FloatField(
+        verbose_name='Вес рекомендации',
+        help_text='Чем больше вес, тем выше автор в списке',
+    )
+
+    class Meta:
+        ordering = ('-score',)
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='unique_recommendation',
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-score'),
+                name='recommendation_user_score',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user} -> {self.author}'
+
+
+class TrendingScore(models.Model):
+    post = models.OneToOneField(
+        Post,
+        verbose_name='Пост',
+        help_text='Пост, для которого считается рейтинг',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+    )
+    score = models.FloatField(
+        verbose_name='Рейтинг',
+        help_text='Логарифм рейтинга с затуханием во времени',
+        db_index=True,
+    )
+
+    class Meta:
+        ordering = ('-score',)
+        verbose_name = 'Рейтинг поста'
+        verbose_name_plural = 'Рейтинги постов'
+
+    def __str__(self):
+        return f'{self.post}: {self.score:.2f}'
+
+
+class PostStats(models.Model):
+    post = models.OneToOneField(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name='stats',
+    )
+    views = models.BigIntegerField(
+        default=0,
+        verbose_name='Просмотры',
+        help_text='Сколько раз открывали страницу поста',
+    )
+    impressions = models.BigIntegerField(
+        default=0,
+        verbose_name='Показы',
+        help_text='Сколько раз пост показывали в лентах',
+    )
+
+    class Meta:
+        verbose_name = 'Просмотры поста'
+        verbose_name_plural = 'Просмотры постов'
+
+    def __str__(self):
+        return f'{self.post_id}: {self.views}'
+
+
+class GroupStats(models.Model):
+    group = models.OneToOneField(
+        Group,
+        verbose_name='Группа',
+        help_text='Группа, для которой собрана статистика',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество постов',
+        help_text='Сколько постов опубликовано в группе',
+    )
+    last_activity = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name='Последняя активность',
+        help_text='Дата последнего поста группы',
+    )
+    top_authors = models.CharField(
+        max_length=500,
+        blank=True,
+        verbose_name='Самые активные авторы',
+        help_text='Имена пользователей через запятую',
+    )
+
+    class Meta:
+        verbose_name = 'Статистика группы'
+        verbose_name_plural = 'Статистика групп'
+
+    def __str__(self):
+        return f'{self.group}: {self.post_count}'
+
+    @property
+    def top_authors_list(self):
+        return self.top_authors.split(',') if self.top_authors else []
+
+
+class ArchivedPost(models.Model):
+    id = models.PositiveIntegerField(
+        primary_key=True,
+        verbose_name='Номер поста',
+        help_text='Номер, под которым пост был опубликован',
+    )
+    author = models.ForeignKey(
+        User,
+        verbose_name='Автор поста',
+        help_text='Автор архивного поста',
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+    )
+    group = models.ForeignKey(
+        Group,
+        verbose_name='Группа',
+        help_text='Группа архивного поста',
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts',
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата публикации поста',
+        help_text='Дата публикации архивного поста',
+    )
+    data = models.BinaryField(
+        verbose_name='Содержимое',
+        help_text='Сжатые текст, картинка и комментарии поста',
+    )
+
+    class Meta:
+        ordering = ('-pub_date',)
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+        indexes = (
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='archived_post_author_pub_date',
+            ),
+        )
+
+    def __str__(self):
+        return f'Архив #{self.pk}'
+
+
+class PostRevision(models.Model):
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='revisions',
+    )
+    number = models.PositiveIntegerField(
+        verbose_name='Номер правки',
+    )
+    sequence = models.BigIntegerField(
+        verbose_name='Номер события',
+        help_text='Номер события outbox; правка с меньшим номером, '
+                  'пришедшая позже, отбрасывается',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата правки',
+    )
+    is_snapshot = models.BooleanField(
+        default=False,
+        verbose_name='Полный текст',
+        help_text='Иначе хранится разница с предыдущей правкой',
+    )
+    data = models.BinaryField(
+        verbose_name='Данные',
+        help_text='Сжатый текст или сжатая разница',
+    )
+
+    class Meta:
+        ordering = ('post_id', 'number')
+        verbose_name = 'Правка поста'
+        verbose_name_plural = 'Правки постов'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('post', 'number'),
+                name='unique_post_revision',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id} #{self.number}'
+
+
+class Like(models.Model):
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        related_name='likes',
+    )
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='likes',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата',
+    )
+
+    class Meta:
+        verbose_name = 'Лайк'
+        verbose_name_plural = 'Лайки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'),
+                name='unique_like',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user} -> {self.post_id}'
+
+
+class LikeCounter(models.Model):
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='like_counters',
+    )
+    shard = models.PositiveSmallIntegerField(
+        verbose_name='Часть счётчика',
+        help_text='Лайки поста раскладываются по нескольким строкам, '
+                  'чтобы одновременные лайки не ждали одну блокировку',
+    )
+    count = models.IntegerField(
+        default=0,
+        verbose_name='Количество',
+        help_text='Может быть отрицательным, важна только сумма частей',
+    )
+
+    class Meta:
+        verbose_name = 'Счётчик лайков'
+        verbose_name_plural = 'Счётчики лайков'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('post', 'shard'),
+                name='unique_like_counter_shard',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id}[{self.shard}]: {self.count}'
@@ -0,0 +1,151 @@
+"""Секционирование таблицы постов по годам в PostgreSQL.
+
+Секции по умолчанию нет: она попадала бы в любой запрос ленты без
+границ по дате и мешала упорядоченному обходу секций. Секцию года
+создаёт Post.save() перед вставкой, если её ещё нет, а задача
+posts.create_partitions заранее готовит секции на YEARS_AHEAD лет
+вперёд, чтобы на первой записи года не ждать DDL.
+"""
+from datetime import timezone as dt_timezone
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+TABLE = 'posts_post'
+YEARS_AHEAD = 1
+# Ключ pg_advisory_xact_lock: процессы создают одну секцию по очереди.
+LOCK_ID = 7301
+
+known_years = set()
+
+
+def partition_name(year):
+    return f'{TABLE}_{year}'
+
+
+def create_partition_sql(year):
+    return (
+        f'CREATE TABLE IF NOT EXISTS {partition_name(year)} '
+        f'PARTITION OF {TABLE} '
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+    )
+
+
+def ensure_partitions(connection, first_year, last_year):
+    """Создаёт недостающие годовые секции, возвращает их имена."""
+    created = []
+    with connection.cursor() as cursor:
+        for year in range(first_year, last_year + 1):
+            cursor.execute(create_partition_sql(year))
+            created.append(partition_name(year))
+    return created
+
+
+def ensure_for(connection, dates):
+    """Создаёт секции под годы дат, если их ещё нет. Проверенные годы
+    запоминаются в процессе, созданные — только после коммита."""
+    if connection.vendor != 'postgresql':
+        return []
+    years = {date.astimezone(dt_timezone.utc).year for date in dates}
+    created = []
+    for year in sorted(years - known_years):
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT to_regclass(%s)', [partition_name(year)]
+                )
+                if cursor.fetchone()[0] is not None:
+                    known_years.add(year)
+                    continue
+                cursor.execute(
+                    'SELECT pg_advisory_xact_lock(%s)', [LOCK_ID]
+                )
+                cursor.execute(create_partition_sql(year))
+            created.append(partition_name(year))
+            transaction.on_commit(
+                partial(known_years.add, year), using=connection.alias
+            )
+    return created
+
+
+def ensure_ahead(connection, years_ahead=YEARS_AHEAD):
+    this_year = timezone.now().year
+    return ensure_partitions(connection, this_year, this_year + years_ahead)
+
+
+def drop_foreign_keys_to(connection, table):
+    """Удаляет внешние ключи других таблиц, ссылающиеся на table,
+    и возвращает их как пары (таблица, ограничение)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT conrelid::regclass::text, conname FROM pg_constraint '
+            "WHERE contype = 'f' AND confrelid = %s::regclass "
+            'AND conrelid <> confrelid',
+            [table],
+        )
+        constraints = cursor.fetchall()
+        for source, name in constraints:
+            cursor.execute(
+                f'ALTER TABLE {source} '
+                f'DROP CONSTRAINT {connection.ops.quote_name(name)}'
+            )
+    return constraints
+
+
+def partition_posts(connection):
+    """Превращает posts_post в таблицу, секционированную по pub_date."""
+    this_year = timezone.now().year
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN(pub_date) FROM {TABLE}')
+        oldest = cursor.fetchone()[0]
+        cursor.execute(f'ALTER SEQUENCE {TABLE}_id_seq OWNED BY NONE')
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {TABLE}_plain')
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {TABLE}_plain INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS) PARTITION BY RANGE (pub_date)'
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (id, pub_date)')
+    ensure_partitions(
+        connection, oldest.year if oldest else this_year,
+        this_year + YEARS_AHEAD,
+    )
+    drop_foreign_keys_to(connection, f'{TABLE}_plain')
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {TABLE}_plain')
+        cursor.execute(f'DROP TABLE {TABLE}_plain')
+        cursor.execute(f'ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id')
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_author_id_fk '
+            f'FOREIGN KEY (author_id) REFERENCES auth_user (id) '
+            f'DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_group_id_fk '
+            f'FOREIGN KEY (group_id) REFERENCES posts_group (id) '
+            f'DEFERRABLE INITIALLY DEFERRED'
+        )
+        for name, columns in (
+            (f'{TABLE}_pub_date_part', 'pub_date DESC'),
+            ('post_author_pub_date', 'author_id, pub_date DESC'),
+            ('post_group_pub_date', 'group_id, pub_date DESC'),
+        ):
+            cursor.execute(f'CREATE INDEX {name} ON {TABLE} ({columns})')
+
+
+def remove_default_partition(connection):
+    """Переносит строки из секции по умолчанию в годовые и удаляет её."""
+    default = f'{TABLE}_default'
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [default])
+        if cursor.fetchone()[0] is None:
+            return
+        cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {default}')
+        cursor.execute(f'SELECT MIN(pub_date), MAX(pub_date) FROM {default}')
+        oldest, newest = cursor.fetchone()
+    if oldest is not None:
+        ensure_partitions(connection, oldest.year, newest.year)
+    ensure_ahead(connection)
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {default}')
+        cursor.execute(f'DROP TABLE {default}')
@@ -0,0 +1,99 @@
+import heapq
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from .models import Follow, Recommendation
+
+TOP_K = 5
+FRIENDS_OF_FRIENDS_WEIGHT = 1.0
+CO_FOLLOW_WEIGHT = 0.5
+MAX_FOLLOWING = 500
+MAX_FOLLOWERS_SAMPLE = 200
+CO_FOLLOW_TOP = 20
+BATCH_SIZE = 1000
+
+
+def load_graph():
+    """Загружает таблицу подписок в списки смежности за один проход."""
+    following = defaultdict(list)
+    followers = defaultdict(list)
+    edges = Follow.objects.filter(
+        user__is_active=True, author__is_active=True
+    ).values_list('user_id', 'author_id').order_by()
+    for user_id, author_id in edges.iterator(chunk_size=BATCH_SIZE * 10):
+        following[user_id].append(author_id)
+        followers[author_id].append(user_id)
+    return following, followers
+
+
+class CoFollowIndex:
+    """Для автора — авторы, на которых чаще всего подписаны его читатели.
+
+    Считается лениво и один раз на автора, выборка читателей ограничена,
+    поэтому стоимость не зависит от популярности автора.
+    """
+
+    def __init__(self, following, followers):
+        self.following = following
+        self.followers = followers
+        self._cache = {}
+
+    def __getitem__(self, author_id):
+        if author_id not in self._cache:
+            sample = self.followers.get(author_id, ())[:MAX_FOLLOWERS_SAMPLE]
+            counter = Counter()
+            for follower_id in sample:
+                counter.update(self.following[follower_id][:MAX_FOLLOWING])
+            counter.pop(author_id, None)
+            size = len(sample) or 1
+            self._cache[author_id] = [
+                (other_id, count / size)
+                for other_id, count in counter.most_common(CO_FOLLOW_TOP)
+            ]
+        return self._cache[author_id]
+
+
+def recommend_for(user_id, following, co_follow, top_k=TOP_K):
+    followed = following.get(user_id, ())
+    scores = Counter()
+    for author_id in followed[:MAX_FOLLOWING]:
+        for candidate_id in following.get(author_id, ()):
+            scores[candidate_id] += FRIENDS_OF_FRIENDS_WEIGHT
+        for candidate_id, weight in co_follow[author_id]:
+            scores[candidate_id] += CO_FOLLOW_WEIGHT * weight
+    excluded = set(followed)
+    excluded.add(user_id)
+    candidates = (
+        item for item in scores.items() if item[0] not in excluded
+    )
+    return heapq.nlargest(top_k, candidates, key=lambda item: item[1])
+
+
+def iter_recommendations(top_k=TOP_K):
+    following, followers = load_graph()
+    co_follow = CoFollowIndex(following, followers)
+    for user_id in list(following):
+        for author_id, score in recommend_for(
+            user_id, following, co_follow, top_k
+        ):
+            yield Recommendation(
+                user_id=user_id, author_id=author_id, score=score
+            )
+
+
+def rebuild_recommendations(top_k=TOP_K):
+    """Пересчитывает рекомендации всех пользователей, возвращает их число."""
+    created = 0
+    batch = []
+    with transaction.atomic():
+        Recommendation.objects.all().delete()
+        for recommendation in iter_recommendations(top_k):
+            batch.append(recommendation)
+            if len(batch) >= BATCH_SIZE:
+                Recommendation.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        Recommendation.objects.bulk_create(batch)
+        created += len(batch)
+    return created
@@ -0,0 +1,107 @@
+import re
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.utils.html import escape, linebreaks, urlize
+from django.utils.text import Truncator
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+EXCERPT_LENGTH = 300
+TAG_RE = re.compile(r'(<[^>]*>)')
+ALLOWED_TAGS = {
+    'a', 'blockquote', 'br', 'code', 'em', 'h1', 'h2', 'h3', 'h4', 'h5',
+    'h6', 'hr', 'img', 'li', 'ol', 'p', 'pre', 'strong', 'ul',
+}
+ALLOWED_ATTRS = {'a': ('href', 'title', 'rel'), 'img': ('src', 'alt', 'title')}
+DROPPED_TAGS = {'script', 'style'}
+SAFE_HREF_RE = re.compile(r'^(https?://|mailto:|#|/(?!/))', re.IGNORECASE)
+# Картинки только со своего сайта: внешние адреса служат для слежки.
+SAFE_SRC_RE = re.compile(r'^/(?!/)')
+
+
+def make_excerpt(text):
+    return Truncator(' '.join(text.split())).chars(EXCERPT_LENGTH)
+
+
+def autolink(html):
+    """Превращает адреса в ссылки только в тексте вне тегов и вне <a>."""
+    parts = []
+    inside_link = 0
+    for part in TAG_RE.split(html):
+        if part.startswith('<'):
+            if re.match(r'<a[\s>]', part):
+                inside_link += 1
+            elif part.startswith('</a'):
+                inside_link -= 1
+        elif part and not inside_link:
+            part = urlize(part, nofollow=True, autoescape=False)
+        parts.append(part)
+    return ''.join(parts)
+
+
+class Sanitizer(HTMLParser):
+    """Пересобирает HTML, оставляя только разрешённые теги и атрибуты."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.dropped = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            self.dropped += 1
+        if tag not in ALLOWED_TAGS or self.dropped:
+            return
+        allowed = ALLOWED_ATTRS.get(tag, ())
+        kept = []
+        for name, value in attrs:
+            value = value or ''
+            if name not in allowed:
+                continue
+            if name == 'href' and not SAFE_HREF_RE.match(value):
+                value = '#'
+            if name == 'src' and not SAFE_SRC_RE.match(value):
+                return
+            kept.append(' %s="%s"' % (name, escape(value)))
+        self.parts.append('<%s%s>' % (tag, ''.join(kept)))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self.dropped = max(self.dropped - 1, 0)
+        elif tag in ALLOWED_TAGS and not self.dropped and tag not in (
+            'br', 'hr', 'img'
+        ):
+            self.parts.append('</%s>' % tag)
+
+    def handle_data(self, data):
+        if not self.dropped:
+            self.parts.append(escape(data))
+
+
+def sanitize(html):
+    parser = Sanitizer()
+    parser.feed(html)
+    parser.close()
+    return ''.join(parser.parts)
+
+
+def render_html(text):
+    """HTML поста. Без Markdown текст экранируется целиком; вывод
+    Markdown проходит через список разрешённых тегов и атрибутов."""
+    if markdown is not None and getattr(settings, 'POSTS_MARKDOWN', False):
+        html = markdown.markdown(text)
+    else:
+        html = linebreaks(escape(text))
+    return sanitize(autolink(html))
+
+
+def fill(post):
+    post.excerpt = make_excerpt(post.text)
+    post.text_html = render_html(post.text)
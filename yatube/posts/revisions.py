@@ -0,0 +1,100 @@
+import json
+import zlib
+from difflib import SequenceMatcher
+
+from django.db import transaction
+
+from .models import Post, PostRevision
+
+SNAPSHOT_EVERY = 10
+
+
+def make_delta(old, new):
+    """Разница в виде списка: пара чисел копирует отрезок старого
+    текста, строка вставляется как есть."""
+    ops = []
+    matcher = SequenceMatcher(None, old, new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif tag in ('insert', 'replace'):
+            ops.append(new[j1:j2])
+    return ops
+
+
+def apply_delta(old, ops):
+    return ''.join(
+        old[op[0]:op[1]] if isinstance(op, list) else op for op in ops
+    )
+
+
+def pack(value):
+    return zlib.compress(json.dumps(value, ensure_ascii=False).encode())
+
+
+def unpack(data):
+    return json.loads(zlib.decompress(bytes(data)).decode())
+
+
+def is_snapshot_number(number):
+    return (number - 1) % SNAPSHOT_EVERY == 0
+
+
+def text_at(post_id, number):
+    """Текст правки: ближайший полный текст не раньше чем за
+    SNAPSHOT_EVERY правок плюс разницы после него."""
+    first = number - (number - 1) % SNAPSHOT_EVERY
+    revisions = PostRevision.objects.filter(
+        post_id=post_id, number__range=(first, number)
+    ).order_by('number').values_list('data', flat=True)
+    text = None
+    for data in revisions:
+        value = unpack(data)
+        text = value if text is None else apply_delta(text, value)
+    return text
+
+
+def history(post_id):
+    """Все правки поста с восстановленным текстом, от первой."""
+    text = None
+    result = []
+    for revision in PostRevision.objects.filter(post_id=post_id).order_by(
+        'number'
+    ):
+        value = unpack(revision.data)
+        text = value if revision.is_snapshot else apply_delta(text, value)
+        revision.text = text
+        result.append(revision)
+    return result
+
+
+def record(post_id, text, sequence):
+    """Сохраняет новую правку. Строка поста блокируется, чтобы правки
+    одного поста записывались по очереди.
+
+    Возвращает правку или None, если текст не изменился, пост удалён
+    или уже записана более поздняя правка.
+    """
+    with transaction.atomic():
+        if not Post.objects.select_for_update().filter(pk=post_id).exists():
+            return None
+        last = PostRevision.objects.filter(post_id=post_id).order_by(
+            '-number'
+        ).only('number', 'sequence').first()
+        if last is not None and last.sequence >= sequence:
+            return None
+        previous = last and text_at(post_id, last.number)
+        if previous == text:
+            return None
+        number = last.number + 1 if last else 1
+        if is_snapshot_number(number):
+            data = pack(text)
+        else:
+            data = pack(make_delta(previous, text))
+        return PostRevision.objects.create(
+            post_id=post_id,
+            number=number,
+            sequence=sequence,
+            is_snapshot=is_snapshot_number(number),
+            data=data,
+        )
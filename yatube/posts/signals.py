@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import holes, jobs, outbox
+
+from . import bulk, feeds, group_stats
+from .models import GROUP_CHOICES_KEY, Comment, Follow, Group, GroupStats, Post
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    event = outbox.record(
+        'post.created' if created else 'post.updated', instance.pk,
+        author_id=instance.author_id,
+        groups=sorted(group_stats.post_changed_groups(instance) - {None}),
+    )
+    if created:
+        jobs.enqueue('posts.post_published', post_id=instance.pk)
+    if instance.text_changed():
+        jobs.enqueue(
+            'posts.record_revision',
+            post_id=instance.pk, sequence=event.pk,
+        )
+        instance._loaded_text = instance.text
+    if instance.image:
+        jobs.enqueue('posts.make_thumbnail', post_id=instance.pk)
+    group_stats.post_saved(instance, created)
+    feeds.invalidate(
+        group_stats.post_changed_groups(instance), [instance.author_id]
+    )
+    holes.invalidate(f'author:{instance.author_id}', f'post:{instance.pk}')
+    instance._loaded_group_id = instance.group_id
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    if bulk.active():
+        return
+    bulk.delete_dependents([instance.pk])
+    outbox.record(
+        'post.deleted', instance.pk,
+        author_id=instance.author_id,
+        groups=sorted(group_stats.post_changed_groups(instance) - {None}),
+    )
+    group_stats.apply(removed=[(instance.group_id, instance.pub_date)])
+    feeds.invalidate(
+        group_stats.post_changed_groups(instance), [instance.author_id]
+    )
+    holes.invalidate(f'author:{instance.author_id}', f'post:{instance.pk}')
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, created, **kwargs):
+    if created:
+        GroupStats.objects.get_or_create(group=instance)
+    cache.delete_many(
+        [GROUP_CHOICES_KEY, feeds.feed_key('group', instance.slug)]
+    )
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    cache.delete(GROUP_CHOICES_KEY)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    outbox.record(
+        'comment.created' if created else 'comment.updated', instance.pk,
+        post_id=instance.post_id, author_id=instance.author_id,
+    )
+    if created:
+        jobs.enqueue('posts.comment_added', comment_id=instance.pk)
+    holes.invalidate(f'post:{instance.post_id}')
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, **kwargs):
+    if created:
+        outbox.record(
+            'follow.created', instance.pk,
+            user_id=instance.user_id, author_id=instance.author_id,
+        )
+        jobs.enqueue('posts.author_followed', author_id=instance.author_id)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if bulk.active():
+        return
+    outbox.record(
+        'comment.deleted', instance.pk,
+        post_id=instance.post_id, author_id=instance.author_id,
+    )
+    holes.invalidate(f'post:{instance.post_id}')
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    outbox.record(
+        'follow.deleted', instance.pk,
+        user_id=instance.user_id, author_id=instance.author_id,
+    )
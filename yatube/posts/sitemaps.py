@@ -0,0 +1,165 @@
+import os
+import re
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Max
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils import timezone
+
+from core import outbox
+
+from .models import ArchivedPost, Group, Post, User
+
+CHUNK_SIZE = 50000
+ITERATOR_CHUNK = 2000
+CONSUMER = 'sitemaps'
+INDEX_NAME = 'sitemap.xml'
+SECTION_RE = re.compile(r'^(posts|profiles)-\d+\.xml$|^groups\.xml$')
+
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def root():
+    return settings.SITEMAP_ROOT
+
+
+def chunk_of(pk):
+    return (pk - 1) // CHUNK_SIZE
+
+
+def chunk_range(chunk):
+    return chunk * CHUNK_SIZE + 1, (chunk + 1) * CHUNK_SIZE
+
+
+def post_urls(chunk):
+    """Свежие и архивные посты с ключами из диапазона пачки: номера у них
+    общие, а страница поста открывает и те и другие."""
+    for model in (Post, ArchivedPost):
+        rows = model.objects.filter(
+            pk__range=chunk_range(chunk), author__is_active=True
+        ).order_by('pk').values_list('pk', 'pub_date')
+        for pk, pub_date in rows.iterator(chunk_size=ITERATOR_CHUNK):
+            yield reverse('posts:post_detail', args=(pk,)), pub_date
+
+
+def profile_urls(chunk):
+    rows = (
+        User.objects.filter(pk__range=chunk_range(chunk), is_active=True)
+        .annotate(last_post=Max('posts__pub_date'))
+        .filter(last_post__isnull=False)
+        .order_by('pk')
+        .values_list('username', 'last_post')
+    )
+    for username, last_post in rows.iterator(chunk_size=ITERATOR_CHUNK):
+        yield reverse('posts:profile', args=(username,)), last_post
+
+
+def group_urls():
+    rows = Group.objects.order_by('pk').values_list(
+        'slug', 'stats__last_activity'
+    )
+    for slug, last_activity in rows.iterator(chunk_size=ITERATOR_CHUNK):
+        yield reverse('posts:group_list', args=(slug,)), last_activity
+
+
+def url_entry(location, lastmod=None):
+    entry = f'<loc>{escape(settings.SITE_URL + location)}</loc>'
+    if lastmod is not None:
+        entry += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+    return entry
+
+
+def write(name, urls, wrapper='urlset', tag='url'):
+    """Пишет файл построчно из итератора и подменяет старый целиком.
+
+    Пустой раздел удаляется, чтобы индекс на него не ссылался.
+    """
+    os.makedirs(root(), exist_ok=True)
+    path = os.path.join(root(), name)
+    count = 0
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as target:
+        target.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        target.write(f'<{wrapper} xmlns="{XMLNS}">\n')
+        for location, lastmod in urls:
+            target.write(f'<{tag}>{url_entry(location, lastmod)}</{tag}>\n')
+            count += 1
+        target.write(f'</{wrapper}>\n')
+    if count or tag == 'sitemap':
+        os.replace(f'{path}.tmp', path)
+    else:
+        os.remove(f'{path}.tmp')
+        if os.path.exists(path):
+            os.remove(path)
+    return count
+
+
+def write_index():
+    sections = sorted(name for name in os.listdir(root())
+                      if SECTION_RE.match(name))
+    return write(INDEX_NAME, (
+        (
+            reverse('posts:sitemap_section', args=(name[:-len('.xml')],)),
+            datetime.fromtimestamp(
+                os.path.getmtime(os.path.join(root(), name)), timezone.utc
+            ),
+        )
+        for name in sections
+    ), 'sitemapindex', 'sitemap')
+
+
+def exists(name=INDEX_NAME):
+    return os.path.isfile(os.path.join(root(), name))
+
+
+def serve(name):
+    path = os.path.join(root(), name)
+    if not os.path.isfile(path):
+        raise Http404('Карта сайта ещё не собрана')
+    return FileResponse(open(path, 'rb'), content_type='application/xml')
+
+
+def last_chunk(*models):
+    last = max(
+        model.objects.aggregate(last=Max('pk'))['last'] or 0
+        for model in models
+    )
+    return chunk_of(last) if last else -1
+
+
+def regenerate(post_chunks=(), profile_chunks=(), groups=True):
+    written = 0
+    for chunk in sorted(post_chunks):
+        written += write(f'posts-{chunk}.xml', post_urls(chunk))
+    for chunk in sorted(profile_chunks):
+        written += write(f'profiles-{chunk}.xml', profile_urls(chunk))
+    if groups:
+        written += write('groups.xml', group_urls())
+    write_index()
+    return written
+
+
+def generate_all():
+    """Полная сборка. Позиция в outbox запоминается до чтения таблиц,
+    чтобы изменения, случившиеся во время сборки, попали в следующую."""
+    position = outbox.last_id()
+    written = regenerate(
+        range(last_chunk(Post, ArchivedPost) + 1),
+        range(last_chunk(User) + 1),
+    )
+    outbox.seek(CONSUMER, position)
+    return written
+
+
+def changed(events):
+    """Пересобирает только пачки, в которых менялись посты."""
+    post_chunks = set()
+    profile_chunks = set()
+    for event in events:
+        if event.topic.startswith('post.'):
+            post_chunks.add(chunk_of(event.object_id))
+            profile_chunks.add(chunk_of(outbox.payload(event)['author_id']))
+    if post_chunks:
+        regenerate(post_chunks, profile_chunks)
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.db import connection
+from sorl.thumbnail import get_thumbnail
+
+from core.jobs import register
+
+from . import group_stats, partitions, revisions, trending
+from .models import Comment, Post
+
+THUMBNAIL_GEOMETRY = '960x339'
+THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+
+
+@register('posts.post_published')
+def post_published(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        trending.post_published(post)
+
+
+@register('posts.comment_added')
+def comment_added(comment_id):
+    comment = Comment.objects.filter(pk=comment_id).first()
+    if comment is not None:
+        trending.comment_added(comment)
+
+
+@register('posts.author_followed')
+def author_followed(author_id):
+    trending.author_followed(author_id)
+
+
+@register('posts.refresh_group_stats', every=timedelta(hours=1))
+def refresh_group_stats(group_ids=None):
+    """Полный пересчёт статистики групп: чинит счётчики, разошедшиеся
+    с таблицей постов."""
+    if group_ids is None:
+        group_stats.refresh_all()
+    else:
+        group_stats.refresh(group_ids)
+
+
+@register('posts.refresh_top_authors')
+def refresh_top_authors(group_ids):
+    """Самые активные авторы групп, в которых появились или пропали
+    посты."""
+    group_stats.refresh_top_authors(group_ids)
+
+
+@register('posts.make_thumbnail', max_attempts=3)
+def make_thumbnail(post_id):
+    """Заранее готовит миниатюру, которую выводят ленты и страница
+    поста."""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None and post.image:
+        get_thumbnail(post.image, THUMBNAIL_GEOMETRY, **THUMBNAIL_OPTIONS)
+
+
+@register('posts.record_revision')
+def record_revision(post_id, sequence):
+    """Записывает текст поста на момент выполнения: если пост успели
+    снова изменить, промежуточный текст пропускается, а следующая задача
+    увидит, что текст уже записан."""
+    text = Post.objects.filter(pk=post_id).values_list(
+        'text', flat=True
+    ).first()
+    if text is not None:
+        revisions.record(post_id, text, sequence)
+
+
+@register('posts.create_partitions', every=timedelta(days=1))
+def create_partitions():
+    """Заранее создаёт годовые секции таблицы постов в PostgreSQL."""
+    if connection.vendor == 'postgresql':
+        partitions.ensure_ahead(connection)
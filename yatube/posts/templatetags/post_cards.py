@@ -0,0 +1,18 @@
+from django import template
+
+from .. import cards
+from ..cards import render_cards
+
+register = template.Library()
+
+
+@register.filter
+def post_ids(posts):
+    return cards.post_ids(posts)
+
+
+@register.simple_tag(takes_context=True)
+def post_cards(context, posts, show_author=True, show_group=True):
+    return render_cards(
+        list(posts), show_author, show_group, context.template.engine
+    )
@@ -0,0 +1,151 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection
+from django.db.models import Max
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import OutboxEvent
+
+from .. import bulk, partitions
+from ..models import Group, GroupStats, Post, User
+
+
+class PostAdminTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin_user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.author = User.objects.create_user(username='test_author')
+        cls.groups = [
+            Group.objects.create(
+                title=f'Группа {number}', slug=f'group-{number}'
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.admin_user)
+
+    def create_posts(self, count, group):
+        Post.objects.bulk_create(
+            Post(author=self.author, text='Пост', group=group)
+            for _ in range(count)
+        )
+
+    def changelist_queries(self, params=None):
+        url = reverse('admin:posts_post_changelist')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка постов не зависит от числа строк."""
+        self.create_posts(2, self.groups[0])
+        self.changelist_queries()
+        few, _ = self.changelist_queries()
+        self.create_posts(20, self.groups[1])
+        many, response = self.changelist_queries()
+        self.assertEqual(few, many)
+        self.assertContains(response, 'Группа 2')
+
+    def test_date_hierarchy_lists_years(self):
+        """Навигация по датам строится по границам pub_date."""
+        self.create_posts(1, None)
+        old = datetime(2020, 6, 1, tzinfo=dt_timezone.utc)
+        partitions.ensure_for(connection, [old])
+        Post.objects.update(pub_date=old)
+        self.create_posts(1, None)
+        _, response = self.changelist_queries()
+        self.assertContains(response, '?pub_date__year=2020')
+        self.assertContains(
+            response, f'?pub_date__year={timezone.now().year}'
+        )
+        _, response = self.changelist_queries({'pub_date__year': 2020})
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_group_choices_follow_group_changes(self):
+        """Новая группа сразу появляется в выпадающем списке."""
+        self.create_posts(1, self.groups[0])
+        self.changelist_queries()
+        Group.objects.create(title='Новая группа', slug='new-group')
+        _, response = self.changelist_queries()
+        self.assertContains(response, 'Новая группа')
+
+    def run_action(self, model, action, query='', **data):
+        url = reverse(f'admin:posts_{model}_changelist') + query
+        return self.client.post(url, {
+            'action': action,
+            'select_across': 1,
+            'index': 0,
+            **data,
+        }, follow=True)
+
+    def test_move_filtered_posts(self):
+        """Перенос всей отфильтрованной выборки обновляет статистику
+        обеих групп."""
+        source, target = self.groups[0], self.groups[1]
+        self.create_posts(5, source)
+        self.create_posts(2, None)
+        response = self.run_action(
+            'post', 'move_to_group', f'?group__id__exact={source.pk}',
+            _selected_action=[source.posts.first().pk], group=target.pk,
+        )
+        self.assertContains(response, 'Перенесено постов: 5')
+        self.assertEqual(target.posts.count(), 5)
+        self.assertEqual(GroupStats.objects.get(group=source).post_count, 0)
+        self.assertEqual(GroupStats.objects.get(group=target).post_count, 5)
+
+    def test_delete_posts_of_groups(self):
+        """Удаление постов выбранных групп не трогает остальные."""
+        self.create_posts(3, self.groups[0])
+        self.create_posts(2, self.groups[2])
+        response = self.run_action(
+            'group', 'delete_posts',
+            _selected_action=[self.groups[0].pk], select_across=0,
+        )
+        self.assertContains(response, 'Удалено постов: 3')
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertTrue(Group.objects.filter(pk=self.groups[0].pk).exists())
+
+    def test_bulk_queries_per_chunk(self):
+        """Число запросов растёт с числом пачек, а не строк."""
+        self.create_posts(6, self.groups[0])
+        posts = Post.objects.filter(group=self.groups[0])
+        with CaptureQueriesContext(connection) as small:
+            bulk.move_posts(posts, self.groups[1], chunk_size=3)
+        self.create_posts(12, self.groups[0])
+        with CaptureQueriesContext(connection) as large:
+            result = bulk.move_posts(posts, self.groups[1], chunk_size=6)
+        self.assertEqual(result.rows, 12)
+        self.assertEqual(
+            len(small.captured_queries), len(large.captured_queries)
+        )
+
+    def test_bulk_delete_queries_per_chunk(self):
+        """Удаление пишет события и сбрасывает кэши один раз на пачку."""
+        self.create_posts(3, self.groups[0])
+        with CaptureQueriesContext(connection) as small:
+            bulk.delete_posts(Post.objects.all(), chunk_size=3)
+        self.create_posts(12, self.groups[0])
+        events = OutboxEvent.objects.aggregate(last=Max('pk'))['last']
+        with CaptureQueriesContext(connection) as large:
+            result = bulk.delete_posts(Post.objects.all(), chunk_size=12)
+        self.assertEqual(result.rows, 12)
+        self.assertEqual(
+            len(small.captured_queries), len(large.captured_queries)
+        )
+        self.assertEqual(
+            OutboxEvent.objects.filter(
+                pk__gt=events, topic='post.deleted'
+            ).count(),
+            12,
+        )
+        stats = GroupStats.objects.get(group=self.groups[0])
+        self.assertEqual(stats.post_count, 0)
@@ -0,0 +1,132 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import outbox
+from core.paginator import make_cursor
+
+from .. import archive, counters, likes, partitions, revisions
+from ..models import (
+    ArchivedPost, Comment, Group, GroupStats, Post, PostStats, User,
+)
+from ..views import POSTS_PER_PAGE
+
+
+class ArchiveTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='test_author')
+        cls.reader = User.objects.create_user(username='test_reader')
+        cls.group = Group.objects.create(
+            title='Погода',
+            slug='weather',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.old_post = self.create_post('Старый пост', days=400)
+        Comment.objects.create(
+            post=self.old_post, author=self.reader, text='Старый комментарий'
+        )
+        self.new_post = self.create_post('Новый пост', days=1)
+
+    def create_post(self, text, days):
+        post = Post.objects.create(
+            author=self.author, text=text, group=self.group
+        )
+        pub_date = timezone.now() - timedelta(days=days)
+        partitions.ensure_for(connection, [pub_date])
+        Post.objects.filter(pk=post.pk).update(pub_date=pub_date)
+        return post
+
+    def test_old_posts_move_to_archive(self):
+        """В архив уходят только старые посты вместе с комментариями."""
+        call_command('archive_posts', '--days', '365', stdout=StringIO())
+        self.assertFalse(Post.objects.filter(pk=self.old_post.pk).exists())
+        self.assertTrue(Post.objects.filter(pk=self.new_post.pk).exists())
+        self.assertFalse(Comment.objects.exists())
+        archived = ArchivedPost.objects.get(pk=self.old_post.pk)
+        self.assertEqual(archive.unpack(archived)['text'], 'Старый пост')
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 2)
+
+    def test_post_detail_falls_back_to_archive(self):
+        """Страница поста показывает пост и комментарии из архива."""
+        archive.archive_posts()
+        response = self.guest_client.get(
+            reverse('posts:post_detail', args=(self.old_post.pk,))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['archived'])
+        self.assertEqual(response.context['posts'].text, 'Старый пост')
+        self.assertEqual(response.context['count'], 2)
+        comments = response.context['comments']
+        self.assertEqual(
+            [(c.author, c.text) for c in comments],
+            [(self.reader, 'Старый комментарий')],
+        )
+        response = self.guest_client.get(
+            reverse('posts:post_detail', args=(self.old_post.pk + 100,))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_profile_continues_with_archive(self):
+        """Лента профиля после свежих постов продолжается архивными."""
+        for number in range(POSTS_PER_PAGE - 1):
+            self.create_post(f'Пост {number}', days=number + 2)
+        archive.archive_posts()
+        url = reverse('posts:profile', args=(self.author.username,))
+        response = self.guest_client.get(url)
+        self.assertEqual(response.context['count'](), POSTS_PER_PAGE + 1)
+        response = self.guest_client.get(url, {'page': 2})
+        posts = list(response.context['page_obj'])
+        self.assertEqual([post.pk for post in posts], [self.old_post.pk])
+        self.assertContains(response, 'Старый пост')
+
+    def test_profile_cursor_continues_with_archive(self):
+        """Курсор следующей страницы профиля ведёт и в архив."""
+        for number in range(POSTS_PER_PAGE - 1):
+            self.create_post(f'Пост {number}', days=number + 2)
+        archive.archive_posts()
+        url = reverse('posts:profile', args=(self.author.username,))
+        response = self.guest_client.get(url)
+        cursor = make_cursor(list(response.context['page_obj'])[-1])
+        self.assertContains(response, f'?before={cursor}')
+        response = self.guest_client.get(url, {'before': cursor})
+        posts = list(response.context['page_obj'])
+        self.assertEqual([post.pk for post in posts], [self.old_post.pk])
+        self.assertContains(response, 'Старый пост')
+
+    def test_archiving_is_not_deletion(self):
+        """Архивирование не выглядит удалением: просмотры, правки и лайки
+        остаются, а в outbox пишется post.archived."""
+        PostStats.objects.create(post=self.old_post, views=5)
+        likes.like(self.reader, self.old_post.pk)
+        revisions.record(self.old_post.pk, 'Старый пост', 1)
+        position = outbox.last_id()
+        archive.archive_posts()
+        self.assertEqual(
+            [event.topic for event in outbox.read(position)],
+            ['post.archived'],
+        )
+        self.assertEqual(counters.views(self.old_post.pk), 5)
+        self.assertEqual(likes.counts([self.old_post.pk]), {
+            self.old_post.pk: 1
+        })
+        self.assertEqual(
+            revisions.text_at(self.old_post.pk, 1), 'Старый пост'
+        )
+        PostStats.objects.create(post=self.new_post, views=1)
+        self.new_post.delete()
+        self.assertFalse(
+            PostStats.objects.filter(post_id=self.new_post.pk).exists()
+        )
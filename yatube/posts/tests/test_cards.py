@@ -0,0 +1,87 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..cards import card_key, render_cards
+from ..models import Group, Post, User
+
+
+class PostCardCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Погода',
+            slug='weather',
+            description='Тестовое описание',
+        )
+        for i in range(3):
+            Post.objects.create(
+                author=cls.user, text=f'Пост {i}', group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def feed(self):
+        return list(Post.objects.select_related('author', 'group'))
+
+    def test_cards_are_rendered_and_cached(self):
+        """Карточки рендерятся и сохраняются в кэш по версии поста."""
+        posts = self.feed()
+        cards = render_cards(posts)
+        self.assertIn('Пост 0', cards[-1])
+        self.assertIn('все записи группы Погода', cards[0])
+        self.assertEqual(cache.get(card_key(posts[0], True, True)), cards[0])
+
+    def test_only_new_post_is_rendered(self):
+        """После добавления поста рендерится только его карточка."""
+        render_cards(self.feed())
+        Post.objects.create(author=self.user, text='Новый пост')
+        cached = cache.get_many(
+            [card_key(post, True, True) for post in self.feed()]
+        )
+        self.assertEqual(len(cached), 3)
+
+    def test_feed_uses_one_cache_lookup(self):
+        """Кэшированная лента не обращается к базе за данными карточек."""
+        render_cards(self.feed())
+        posts = self.feed()
+        with self.assertNumQueries(0):
+            cards = render_cards(posts)
+        self.assertEqual(len(cards), 3)
+
+    def test_edit_changes_version(self):
+        """Редактирование поста меняет ключ его карточки."""
+        post = self.feed()[0]
+        old_key = card_key(post, True, True)
+        post.text = 'Отредактированный пост'
+        post.save()
+        self.assertNotEqual(card_key(post, True, True), old_key)
+        self.assertIn('Отредактированный пост', render_cards([post])[0])
+
+    def test_variants_are_cached_separately(self):
+        """Лента группы и общая лента не делят карточки."""
+        post = self.feed()[0]
+        card = render_cards([post], show_group=False)[0]
+        self.assertNotIn('все записи группы', card)
+        self.assertNotEqual(
+            card_key(post, True, False), card_key(post, True, True)
+        )
+
+    def test_render_benchmark(self):
+        """Замер рендеринга выводит время для каждой ленты."""
+        out = StringIO()
+        call_command('bench_templates', repeat=1, stdout=out)
+        for template in ('index', 'follow', 'group_list', 'profile'):
+            with self.subTest(template=template):
+                self.assertIn(f'posts/{template}.html', out.getvalue())
+
+    def test_benchmark_keeps_other_cache(self):
+        """Замер сбрасывает только свои фрагменты, а не весь кэш."""
+        cache.set('unrelated', 'value')
+        call_command('bench_templates', repeat=1, stdout=StringIO())
+        self.assertEqual(cache.get('unrelated'), 'value')
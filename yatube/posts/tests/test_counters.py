@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import counters
+from ..models import Post, PostStats, User
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='writer')
+        cls.post = Post.objects.create(author=cls.author, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        counters.buffer.take()
+        self.post_url = reverse('posts:post_detail', args=(self.post.pk,))
+
+    def stats(self):
+        return PostStats.objects.get(post=self.post)
+
+    def test_views_are_buffered_then_flushed(self):
+        """Просмотры копятся в памяти и записываются одним запросом."""
+        self.client.get(self.post_url)
+        response = self.client.get(self.post_url)
+        self.assertContains(response, 'Просмотров: 2')
+        self.assertFalse(PostStats.objects.exists())
+        self.assertEqual(counters.flush(), 1)
+        self.client.get(self.post_url)
+        counters.flush()
+        self.assertEqual(self.stats().views, 3)
+        self.assertContains(self.client.get(self.post_url), 'Просмотров: 4')
+
+    def test_impressions_in_feeds(self):
+        """Показы считаются и в ленте, и на закэшированном профиле."""
+        self.client.get(reverse('posts:index'))
+        profile_url = reverse('posts:profile', args=('writer',))
+        self.client.get(profile_url)
+        self.client.get(profile_url)
+        counters.flush()
+        self.assertEqual(self.stats().impressions, 3)
+        self.assertEqual(self.stats().views, 0)
+
+    def test_cached_index_counts_impressions(self):
+        """Закэшированная главная засчитывает показы, не читая посты."""
+        index_url = reverse('posts:index')
+        self.client.get(index_url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(index_url)
+        self.assertContains(response, 'Тестовый пост')
+        self.assertFalse(any(
+            query['sql'].startswith('SELECT "posts_post"')
+            for query in queries.captured_queries
+        ))
+        counters.flush()
+        self.assertEqual(self.stats().impressions, 2)
+
+    def test_deleted_posts_are_skipped(self):
+        post = Post.objects.create(author=self.author, text='Удалённый пост')
+        counters.count_views(post.pk)
+        counters.count_views(self.post.pk)
+        post.delete()
+        self.assertEqual(counters.flush(), 1)
+        self.assertEqual(self.stats().views, 1)
+        self.assertEqual(PostStats.objects.count(), 1)
+
+    def test_request_does_not_flush(self):
+        """Ответ не пишет счётчики: это дело фонового потока."""
+        self.client.get(self.post_url)
+        self.assertFalse(PostStats.objects.exists())
+        self.assertEqual(counters.flush(), 1)
+        self.assertEqual(self.stats().views, 1)
+
+    @override_settings(COUNTERS_FLUSH_INTERVAL=60)
+    def test_full_buffer_wakes_flusher(self):
+        """Переполненный буфер будит поток, не дожидаясь интервала."""
+        flusher = counters.Flusher()
+        with mock.patch.object(counters, 'flusher', flusher):
+            with mock.patch.object(counters, 'MAX_PENDING', 2):
+                counters.count_views(self.post.pk)
+                self.assertFalse(flusher.wake.is_set())
+                counters.count_views(self.post.pk + 1)
+        self.assertTrue(flusher.wake.is_set())
+
+    def test_admin_shows_counts(self):
+        counters.count_views(self.post.pk)
+        counters.flush()
+        admin_user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'admin-password'
+        )
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:posts_post_changelist'))
+        self.assertContains(response, 'column-views')
+        self.assertContains(response, '<td class="field-views">1</td>')
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.paginator import KeysetPage, make_cursor, parse_cursor
+
+from ..models import Group, Post, User
+from ..views import POSTS_PER_PAGE
+
+
+class CursorPagesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Природа', slug='test_slug', description='Описание'
+        )
+        for number in range(POSTS_PER_PAGE + 3):
+            Post.objects.create(
+                author=cls.user, text=f'Пост {number}', group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def walk(self, url):
+        """Все посты ленты, по ссылкам «Следующая» с курсором."""
+        seen = []
+        response = self.client.get(url)
+        while True:
+            page_obj = response.context['page_obj']
+            seen += [post.pk for post in page_obj]
+            if not page_obj.has_next():
+                return seen
+            cursor = make_cursor(list(page_obj)[-1])
+            self.assertContains(response, f'?before={cursor}')
+            response = self.client.get(url, {'before': cursor})
+            self.assertIsNone(response.context['page_obj'].number)
+
+    def test_cursor_walks_every_feed(self):
+        """По курсорам лента проходится целиком и без повторов."""
+        expected = list(
+            Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True
+            )
+        )
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.walk(url), expected)
+
+    def test_equal_dates_are_ordered_by_pk(self):
+        """Посты с одной датой не теряются на границе страниц."""
+        Post.objects.update(pub_date=timezone.now() - timedelta(days=1))
+        expected = list(
+            Post.objects.order_by('-pk').values_list('pk', flat=True)
+        )
+        self.assertEqual(self.walk(reverse('posts:index')), expected)
+
+    def test_cursor_page_does_not_count(self):
+        """Страница после курсора — один запрос без OFFSET и COUNT."""
+        last = Post.objects.order_by('-pub_date', '-pk')[POSTS_PER_PAGE]
+        page = KeysetPage(
+            Post.objects.all(), make_cursor(last), POSTS_PER_PAGE
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(len(page), 2)
+            self.assertFalse(page.has_next())
+
+    def test_broken_cursor_falls_back_to_first_page(self):
+        self.assertIsNone(parse_cursor('abc'))
+        response = self.client.get(reverse('posts:index'), {'before': 'x'})
+        self.assertEqual(response.context['page_obj'].number, 1)
+
+    def test_feed_benchmark_rolls_back_seed(self):
+        """Замер лент сравнивает номер и курсор и не оставляет постов."""
+        count = Post.objects.count()
+        out = StringIO()
+        call_command('bench_feeds', seed=100, repeat=1, stdout=out)
+        self.assertIn('(курсор)', out.getvalue())
+        self.assertEqual(Post.objects.count(), count)
+        self.assertFalse(User.objects.filter(username='bench_author').exists())
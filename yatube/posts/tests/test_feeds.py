@@ -0,0 +1,77 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from .. import feeds
+from ..models import Group, Post, User
+
+
+class FeedsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='test_author')
+        cls.group = Group.objects.create(
+            title='Погода',
+            slug='weather',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, text='Пост в группе', group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_feeds_formats(self):
+        """Ленты главной, группы и автора отдаются в RSS и Atom."""
+        urls = (
+            reverse('posts:index_feed', args=('rss',)),
+            reverse('posts:group_feed', args=('weather', 'atom')),
+            reverse('posts:profile_feed', args=('test_author', 'rss')),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('xml', response['Content-Type'])
+                self.assertContains(response, 'Пост в группе')
+        response = self.guest_client.get(
+            reverse('posts:group_feed', args=('missing', 'rss'))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_repeated_poll_is_not_modified_without_queries(self):
+        """Повторный запрос с ETag получает 304 без запросов к базе."""
+        url = reverse('posts:group_feed', args=('weather', 'rss'))
+        etag = self.guest_client.get(url)['ETag']
+        self.assertTrue(etag.startswith('"'))
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_post_updates_feed(self):
+        """Новый пост меняет ленты группы и автора."""
+        url = reverse('posts:profile_feed', args=('test_author', 'atom'))
+        etag = self.guest_client.get(url)['ETag']
+        Post.objects.create(author=self.author, text='Свежий пост')
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Свежий пост')
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class FeedsCommitTest(TransactionTestCase):
+    def test_feed_cached_before_commit_is_reset(self):
+        """Лента, собранная внутри транзакции сохранения, сбрасывается
+        после коммита."""
+        cache.clear()
+        author = User.objects.create_user(username='test_author')
+        key = feeds.feed_key('author', author.username)
+        with transaction.atomic():
+            Post.objects.create(author=author, text='Новый пост')
+            cache.set(key, {'rss': 'старая лента'})
+            self.assertIsNotNone(cache.get(key))
+        self.assertIsNone(cache.get(key))
@@ -0,0 +1,130 @@
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core import jobs
+from core.models import Job
+
+from ..models import Group, GroupStats, Post, User
+
+
+@override_settings(JOBS_EAGER=True)
+class GroupStatsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.author = User.objects.create_user(username='test_author')
+        cls.group = Group.objects.create(
+            title='Погода',
+            slug='weather',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Ветра',
+            slug='winds',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def stats(self, group):
+        return GroupStats.objects.get(group=group)
+
+    def test_new_group_has_empty_stats(self):
+        """У новой группы есть пустая статистика."""
+        stats = self.stats(self.group)
+        self.assertEqual(stats.post_count, 0)
+        self.assertIsNone(stats.last_activity)
+
+    def test_stats_follow_post_create_move_and_delete(self):
+        """Статистика обновляется при создании, переносе и удалении поста."""
+        post = Post.objects.create(
+            author=self.author, text='Пост', group=self.group
+        )
+        Post.objects.create(author=self.author, text='Пост', group=self.group)
+        Post.objects.create(author=self.user, text='Пост', group=self.group)
+        stats = self.stats(self.group)
+        self.assertEqual(stats.post_count, 3)
+        self.assertEqual(
+            stats.last_activity, Post.objects.latest('pub_date').pub_date
+        )
+        self.assertEqual(
+            self.stats(self.group).top_authors_list,
+            ['test_author', 'test_user'],
+        )
+
+        post = Post.objects.get(pk=post.pk)
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(self.stats(self.group).post_count, 2)
+        self.assertEqual(self.stats(self.other_group).post_count, 1)
+        self.assertEqual(
+            self.stats(self.other_group).top_authors_list, ['test_author']
+        )
+
+        post.delete()
+        stats = self.stats(self.other_group)
+        self.assertEqual(stats.post_count, 0)
+        self.assertIsNone(stats.last_activity)
+        self.assertEqual(stats.top_authors_list, [])
+
+    @override_settings(JOBS_EAGER=False)
+    def test_post_save_does_not_recount_group(self):
+        """Сохранение поста меняет статистику одним UPDATE, без
+        подсчёта постов группы; авторов пересчитывает задача."""
+        with CaptureQueriesContext(connection) as context:
+            Post.objects.create(
+                author=self.author, text='Пост', group=self.group
+            )
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('COUNT(', sql)
+        self.assertEqual(self.stats(self.group).post_count, 1)
+        job = Job.objects.get(name='posts.refresh_top_authors')
+        self.assertEqual(job.payload, f'{{"group_ids": [{self.group.pk}]}}')
+        jobs.run(job)
+        self.assertEqual(
+            self.stats(self.group).top_authors_list, ['test_author']
+        )
+
+    def test_repair_fixes_drifted_counters(self):
+        """Периодический пересчёт чинит разошедшиеся счётчики."""
+        Post.objects.create(author=self.author, text='Пост', group=self.group)
+        GroupStats.objects.update(post_count=7)
+        jobs.registry['posts.refresh_group_stats']()
+        self.assertEqual(self.stats(self.group).post_count, 1)
+        self.assertEqual(self.stats(self.other_group).post_count, 0)
+
+    def test_admin_list_editable_moves_post(self):
+        """Перенос поста через список постов в админке обновляет
+        статистику."""
+        post = Post.objects.create(
+            author=self.author, text='Пост', group=self.group
+        )
+        admin_user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        client = Client()
+        client.force_login(admin_user)
+        self.assertIn(Post, site._registry)
+        client.post(reverse('admin:posts_post_changelist'), {
+            'form-TOTAL_FORMS': '1',
+            'form-INITIAL_FORMS': '1',
+            'form-0-id': post.pk,
+            'form-0-group': self.other_group.pk,
+            '_save': 'Сохранить',
+        })
+        self.assertEqual(self.stats(self.group).post_count, 0)
+        self.assertEqual(self.stats(self.other_group).post_count, 1)
+
+    def test_group_index_page(self):
+        """Каталог групп показывает все группы одним запросом."""
+        Post.objects.create(author=self.author, text='Пост', group=self.group)
+        with self.assertNumQueries(2):
+            response = self.guest_client.get(reverse('posts:group_index'))
+        groups = [stats.group for stats in response.context['page_obj']]
+        self.assertEqual(groups, [self.group, self.other_group])
+        self.assertContains(response, 'test_author')
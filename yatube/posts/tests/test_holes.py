@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core import holes
+
+from ..models import Comment, Follow, Post, User
+
+
+class HolePunchedPagesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='writer')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.stranger = User.objects.create_user(username='stranger')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        cls.post = Post.objects.create(author=cls.author, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+        self.stranger_client = Client()
+        self.stranger_client.force_login(self.stranger)
+        self.profile_url = reverse('posts:profile', args=('writer',))
+        self.post_url = reverse('posts:post_detail', args=(self.post.pk,))
+
+    def test_profile_body_is_shared(self):
+        """Тело профиля рендерится один раз, кнопка подписки — для каждого."""
+        response = self.reader_client.get(self.profile_url)
+        self.assertContains(response, 'Отписаться')
+        self.assertContains(response, 'Пользователь: reader')
+        response = self.stranger_client.get(self.profile_url)
+        self.assertTemplateNotUsed(response, 'posts/profile.html')
+        self.assertContains(response, 'Подписаться')
+        self.assertContains(response, 'Пользователь: stranger')
+        self.assertNotContains(response, 'reader')
+
+    def test_comment_form_is_per_user(self):
+        """Форма комментария с CSRF есть только у вошедших."""
+        response = self.client.get(self.post_url)
+        self.assertNotContains(response, 'csrfmiddlewaretoken')
+        self.assertContains(response, 'Войти')
+        response = self.reader_client.get(self.post_url)
+        self.assertTemplateNotUsed(response, 'posts/post_detail.html')
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertNotContains(response, '<!--hole:')
+
+    def test_changes_invalidate_pages(self):
+        """Новый комментарий и новый пост сбрасывают страницы в кэше."""
+        self.client.get(self.post_url)
+        self.client.get(self.profile_url)
+        Comment.objects.create(
+            post=self.post, author=self.reader, text='Новый комментарий'
+        )
+        response = self.client.get(self.post_url)
+        self.assertContains(response, 'Новый комментарий')
+        Post.objects.create(author=self.author, text='Второй пост')
+        self.assertContains(self.client.get(self.profile_url), 'Второй пост')
+
+    def test_out_of_range_pages_share_cache_entry(self):
+        """Номера за последней страницей не создают новых записей
+        в кэше и показывают последнюю страницу."""
+        self.client.get(self.profile_url)
+        for page in ('1', '99', '100000', 'x', '-1'):
+            with self.subTest(page=page):
+                response = self.client.get(self.profile_url, {'page': page})
+                self.assertTemplateNotUsed(response, 'posts/profile.html')
+                self.assertContains(response, 'Тестовый пост')
+
+    def test_markers_from_text_are_not_filled(self):
+        """Метки в тексте поста экранируются и не подставляются."""
+        post = Post.objects.create(author=self.author, text='<!--hole:nav-->')
+        response = self.reader_client.get(
+            reverse('posts:post_detail', args=(post.pk,))
+        )
+        self.assertContains(response, '&lt;!--hole:nav--&gt;')
+        escaped = '&lt;!--hole:nav--&gt;'
+        self.assertEqual(holes.fill(None, escaped), escaped)
@@ -0,0 +1,97 @@
+import os
+import re
+from unittest import skipIf
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Follow, Group, Post, User
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+JINJA2_TEMPLATES = settings.TEMPLATES[:1] + [{
+    'BACKEND': 'django.template.backends.jinja2.Jinja2',
+    'DIRS': [os.path.join(settings.BASE_DIR, 'jinja2')],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        'environment': 'core.jinja2.environment',
+        'context_processors': (
+            settings.TEMPLATES[0]['OPTIONS']['context_processors']
+        ),
+    },
+}]
+
+
+def normalize(html):
+    html = re.sub(r'name="csrfmiddlewaretoken" value="[^"]*"', '', html)
+    html = re.sub(r'\s+', ' ', html)
+    return re.sub(r'>\s+<', '><', html).strip()
+
+
+@skipIf(jinja2 is None, 'jinja2 не установлен')
+@override_settings(TEMPLATES=JINJA2_TEMPLATES)
+class Jinja2ParityTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='reader', first_name='Иван', last_name='Петров'
+        )
+        cls.author = User.objects.create_user(username='writer')
+        cls.group = Group.objects.create(
+            title='Погода',
+            slug='weather',
+            description='Тестовое описание',
+        )
+        Follow.objects.create(user=cls.user, author=cls.author)
+        for i in range(12):
+            Post.objects.create(
+                author=cls.author if i % 2 else cls.user,
+                text=f'Пост <b>{i}</b>',
+                group=cls.group if i % 3 else None,
+            )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def render(self, url, engine):
+        cache.clear()
+        with self.settings(POSTS_TEMPLATE_ENGINE=engine):
+            response = self.authorized_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return normalize(response.content.decode())
+
+    def test_feeds_render_identically(self):
+        """Ленты в Jinja2 совпадают с шаблонами Django."""
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=2',
+            reverse('posts:trending'),
+            reverse('posts:follow_index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'writer'}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.render(url, 'jinja2'), self.render(url, 'django')
+                )
+
+    def test_text_is_escaped(self):
+        """Jinja2 экранирует текст постов."""
+        html = self.render(reverse('posts:index'), 'jinja2')
+        self.assertIn('Пост &lt;b&gt;11&lt;/b&gt;', html)
+
+    def test_index_fragment_cache_is_shared(self):
+        """Фрагментный кэш главной использует те же ключи, что и Django."""
+        self.render(reverse('posts:index'), 'django')
+        Post.objects.create(author=self.user, text='Новый пост')
+        with self.settings(POSTS_TEMPLATE_ENGINE='jinja2'):
+            response = self.authorized_client.get(reverse('posts:index'))
+        self.assertNotContains(response, 'Новый пост')
@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from core import holes
+
+from .. import likes
+from ..models import Like, LikeCounter, Post, User
+
+
+class LikesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='writer')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.posts = [
+            Post.objects.create(author=cls.author, text=f'Пост {i}')
+            for i in range(10)
+        ]
+        cls.post = cls.posts[0]
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_like_is_idempotent(self):
+        """Повторный лайк и повторная отмена не меняют счётчик."""
+        self.assertTrue(likes.like(self.reader, self.post.pk))
+        self.assertFalse(likes.like(self.reader, self.post.pk))
+        self.assertEqual(likes.counts([self.post.pk]), {self.post.pk: 1})
+        self.assertTrue(likes.unlike(self.reader, self.post.pk))
+        self.assertFalse(likes.unlike(self.reader, self.post.pk))
+        self.assertEqual(likes.counts([self.post.pk]), {self.post.pk: 0})
+
+    def test_counter_is_sharded(self):
+        """Лайки раскладываются по частям счётчика, сумма сходится."""
+        users = [
+            User.objects.create_user(username=f'fan{i}') for i in range(40)
+        ]
+        for user in users:
+            likes.like(user, self.post.pk)
+        shards = LikeCounter.objects.filter(post=self.post)
+        self.assertGreater(shards.count(), 1)
+        self.assertLessEqual(shards.count(), likes.SHARDS)
+        self.assertEqual(likes.counts([self.post.pk])[self.post.pk], 40)
+        likes.remove(Like.objects.filter(user__in=users[:15]))
+        self.assertEqual(likes.counts([self.post.pk])[self.post.pk], 25)
+
+    def test_feed_lookup_is_batched(self):
+        """Лайки всех карточек страницы заполняются двумя запросами."""
+        likes.like(self.reader, self.posts[3].pk)
+        likes.like(self.author, self.posts[3].pk)
+        body = ''.join(
+            str(holes.marker('likes', post.pk)) for post in self.posts
+        )
+        request = RequestFactory().get('/')
+        request.user = self.reader
+        with self.assertNumQueries(2):
+            html = holes.fill(request, body)
+        self.assertEqual(html.count('btn-outline-danger'), 9)
+        self.assertEqual(html.count('btn-danger'), 1)
+        self.assertIn('♥ 2', html)
+        self.assertEqual(html.count('csrfmiddlewaretoken'), 10)
+
+    def test_like_from_feed(self):
+        """Лайк из ленты возвращает на ту же страницу и виден в карточке."""
+        index = reverse('posts:index')
+        response = self.reader_client.post(
+            reverse('posts:post_like', args=(self.post.pk,)),
+            HTTP_REFERER='http://testserver' + index,
+        )
+        self.assertRedirects(response, 'http://testserver' + index)
+        response = self.reader_client.get(index)
+        self.assertContains(
+            response, reverse('posts:post_unlike', args=(self.post.pk,))
+        )
+        self.assertContains(self.client.get(index), '♥ 1')
+
+    def test_like_requires_post(self):
+        """GET-запрос не меняет лайки."""
+        for name in ('posts:post_like', 'posts:post_unlike'):
+            response = self.reader_client.get(
+                reverse(name, args=(self.post.pk,))
+            )
+            self.assertEqual(response.status_code, 405)
+        self.assertFalse(Like.objects.exists())
+
+    def test_guest_cannot_like(self):
+        url = reverse('posts:post_like', args=(self.post.pk,))
+        response = self.client.post(url)
+        self.assertRedirects(response, f'{reverse("users:login")}?next={url}')
+        self.assertFalse(Like.objects.exists())
@@ -0,0 +1,112 @@
+import json
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import outbox, sse
+
+from ..models import Comment, Follow, Post, User
+
+
+@override_settings(SSE_STREAM_DURATION=0)
+class LiveUpdatesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.author = User.objects.create_user(username='test_author')
+        cls.stranger = User.objects.create_user(username='test_stranger')
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def messages(self, response):
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join(response.streaming_content).decode()
+        messages = []
+        for block in body.split('\n\n'):
+            fields = dict(
+                line.split(': ', 1) for line in block.splitlines()
+                if not line.startswith(':')
+            )
+            if 'event' in fields:
+                messages.append((fields['event'], json.loads(fields['data'])))
+        return messages
+
+    def test_index_stream_resumes_from_last_event_id(self):
+        """Поток ленты присылает посты после Last-Event-ID."""
+        position = outbox.last_id()
+        new_post = Post.objects.create(author=self.author, text='Новый')
+        response = self.guest_client.get(
+            reverse('posts:live_index'),
+            HTTP_LAST_EVENT_ID=str(position),
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(self.messages(response), [('post', {
+            'id': new_post.pk,
+            'card': reverse('posts:post_card', args=(new_post.pk,)),
+        })])
+
+    def test_new_connection_starts_from_now(self):
+        """Новое подключение не получает старые события."""
+        response = self.guest_client.get(reverse('posts:live_index'))
+        self.assertEqual(self.messages(response), [])
+
+    def test_follow_stream_filters_authors(self):
+        """Поток подписок присылает только посты избранных авторов."""
+        Follow.objects.create(user=self.user, author=self.author)
+        position = outbox.last_id()
+        followed = Post.objects.create(author=self.author, text='Пост')
+        Post.objects.create(author=self.stranger, text='Пост')
+        response = self.authorized_client.get(
+            reverse('posts:live_follow'), HTTP_LAST_EVENT_ID=str(position)
+        )
+        posts = [data['id'] for _, data in self.messages(response)]
+        self.assertEqual(posts, [followed.pk])
+
+    def test_post_stream_sends_comments(self):
+        """Поток поста присылает новые комментарии к нему."""
+        other = Post.objects.create(author=self.author, text='Другой')
+        position = outbox.last_id()
+        Comment.objects.create(post=other, author=self.user, text='Мимо')
+        comment = Comment.objects.create(
+            post=self.post, author=self.user, text='Комментарий'
+        )
+        response = self.guest_client.get(
+            reverse('posts:live_post', args=(self.post.pk,)),
+            HTTP_LAST_EVENT_ID=str(position),
+        )
+        self.assertEqual(self.messages(response), [('comment', {
+            'id': comment.pk,
+            'author': 'test_user',
+            'profile': reverse('posts:profile', args=('test_user',)),
+            'text': 'Комментарий',
+        })])
+
+    def test_streams_over_limit_fall_back_to_polling(self):
+        """Сверх лимита потоков подключение отдаёт накопившееся, сразу
+        закрывается и просит переподключиться позже."""
+        position = outbox.last_id()
+        new_post = Post.objects.create(author=self.author, text='Новый')
+        url = reverse('posts:live_index')
+        with self.settings(SSE_MAX_STREAMS=0):
+            response = self.guest_client.get(
+                url, HTTP_LAST_EVENT_ID=str(position)
+            )
+            messages = self.messages(response)
+        self.assertEqual([data['id'] for _, data in messages], [new_post.pk])
+        body = b''.join(self.guest_client.get(url).streaming_content)
+        self.assertTrue(body.startswith(f'retry: {sse.RETRY}'.encode()))
+        self.assertEqual(sse.slots.open, 0)
+
+    def test_post_card_fragment(self):
+        """Карточка поста отдаётся отдельным фрагментом."""
+        response = self.guest_client.get(
+            reverse('posts:post_card', args=(self.post.pk,))
+        )
+        self.assertContains(response, '<article>')
+        self.assertNotContains(response, '<html')
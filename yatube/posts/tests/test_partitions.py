@@ -0,0 +1,133 @@
+from datetime import datetime, timezone as dt_timezone
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from core import paginator
+
+from .. import partitions
+from ..models import Comment, Post, User
+
+
+class PartitionSqlTest(SimpleTestCase):
+    def test_other_vendors_are_skipped(self):
+        """Вне PostgreSQL секции не создаются и запросов нет."""
+        if connection.vendor == 'postgresql':
+            self.skipTest('проверяется на других базах')
+        self.assertEqual(
+            partitions.ensure_for(connection, [timezone.now()]), []
+        )
+
+    def test_yearly_range(self):
+        """Секция года покрывает его от 1 января до 1 января следующего."""
+        self.assertEqual(
+            partitions.create_partition_sql(2024),
+            'CREATE TABLE IF NOT EXISTS posts_post_2024 '
+            'PARTITION OF posts_post '
+            "FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')",
+        )
+
+
+@skipUnless(connection.vendor == 'postgresql', 'нужен PostgreSQL')
+class PartitionedPostsTest(TestCase):
+    def fetch(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def partition_names(self):
+        return {
+            name for name, in self.fetch(
+                'SELECT c.relname FROM pg_inherits i '
+                'JOIN pg_class c ON c.oid = i.inhrelid '
+                "WHERE i.inhparent = 'posts_post'::regclass"
+            )
+        }
+
+    def plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return '\n'.join(
+            row for row, in self.fetch(f'EXPLAIN {sql}', params)
+        )
+
+    def test_no_default_partition(self):
+        """Секции по умолчанию нет, годовые созданы заранее."""
+        default = self.fetch(
+            'SELECT partdefid FROM pg_partitioned_table '
+            "WHERE partrelid = 'posts_post'::regclass"
+        )
+        self.assertEqual(default, [(0,)])
+        this_year = timezone.now().year
+        self.assertLessEqual(
+            {
+                partitions.partition_name(year) for year in range(
+                    this_year, this_year + partitions.YEARS_AHEAD + 1
+                )
+            },
+            self.partition_names(),
+        )
+
+    def test_save_creates_missing_partition(self):
+        """Пост сохраняется, даже если секцию года не создали заранее."""
+        name = partitions.partition_name(timezone.now().year)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE {name}')
+        partitions.known_years.clear()
+        author = User.objects.create_user(username='test_author')
+        Post.objects.create(author=author, text='Первый пост года')
+        self.assertIn(name, self.partition_names())
+
+    def test_no_foreign_keys_to_old_table(self):
+        """Ссылки на старую таблицу удалены, каскад выполняет Django."""
+        self.assertEqual(
+            self.fetch("SELECT to_regclass('posts_post_plain')"), [(None,)]
+        )
+        author = User.objects.create_user(username='test_author')
+        post = Post.objects.create(author=author, text='Пост')
+        Comment.objects.create(post=post, author=author, text='Комментарий')
+        post.delete()
+        self.assertFalse(Comment.objects.exists())
+
+    def test_date_filter_prunes_partitions(self):
+        """Запрос за текущий год читает только его секцию."""
+        this_year = timezone.now().year
+        start = datetime(this_year, 1, 1, tzinfo=dt_timezone.utc)
+        plan = self.plan(
+            Post.objects.filter(pub_date__gte=start).order_by('-pub_date')
+        )
+        self.assertIn(partitions.partition_name(this_year), plan)
+        self.assertNotIn(partitions.partition_name(this_year - 1), plan)
+
+    def test_cursor_page_prunes_newer_partitions(self):
+        """Страница после курсора прошлого года не читает секции новее."""
+        last_year = timezone.now().year - 1
+        value = datetime(last_year, 12, 1, tzinfo=dt_timezone.utc)
+        partitions.ensure_for(connection, [value])
+        plan = self.plan(
+            paginator.before(Post.objects.all(), value, 1)[:11]
+        )
+        self.assertIn(partitions.partition_name(last_year), plan)
+        self.assertNotIn(partitions.partition_name(last_year + 1), plan)
+
+    def test_remove_default_partition(self):
+        """Строки из секции по умолчанию переезжают в годовые."""
+        year = timezone.now().year + 5
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE posts_post_default '
+                'PARTITION OF posts_post DEFAULT'
+            )
+        author = User.objects.create_user(username='test_author')
+        post = Post.objects.create(author=author, text='Пост из будущего')
+        Post.objects.filter(pk=post.pk).update(
+            pub_date=datetime(year, 6, 1, tzinfo=dt_timezone.utc)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        partitions.remove_default_partition(connection)
+        names = self.partition_names()
+        self.assertNotIn('posts_post_default', names)
+        self.assertIn(partitions.partition_name(year), names)
+        self.assertTrue(Post.objects.filter(text='Пост из будущего').exists())
@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Recommendation, User
+from ..recommendations import rebuild_recommendations
+
+
+class RecommendationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.neighbour = User.objects.create_user(username='neighbour')
+        cls.author = User.objects.create_user(username='author')
+        cls.friend_of_author = User.objects.create_user(username='fof')
+        cls.co_followed = User.objects.create_user(username='co_followed')
+        Follow.objects.bulk_create([
+            Follow(user=cls.reader, author=cls.author),
+            Follow(user=cls.author, author=cls.friend_of_author),
+            Follow(user=cls.neighbour, author=cls.author),
+            Follow(user=cls.neighbour, author=cls.co_followed),
+        ])
+
+    def setUp(self):
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_friends_of_friends_and_co_follow(self):
+        """Рекомендуются авторы подписок и авторы соседей по подпискам."""
+        rebuild_recommendations()
+        recommended = list(
+            self.reader.recommendations.values_list(
+                'author__username', flat=True
+            )
+        )
+        self.assertEqual(recommended, ['fof', 'co_followed'])
+
+    def test_followed_authors_are_not_recommended(self):
+        """Уже подписанные авторы и сам пользователь не рекомендуются."""
+        rebuild_recommendations()
+        self.assertFalse(
+            Recommendation.objects.filter(
+                user=self.reader, author__in=[self.reader, self.author]
+            ).exists()
+        )
+
+    def test_rebuild_replaces_previous_results(self):
+        """Повторный пересчёт не дублирует рекомендации."""
+        call_command('compute_recommendations', stdout=StringIO())
+        count = Recommendation.objects.count()
+        call_command('compute_recommendations', stdout=StringIO())
+        self.assertEqual(Recommendation.objects.count(), count)
+
+    def test_profile_shows_recommendations(self):
+        """Виджет рекомендаций выводится на странице профиля."""
+        rebuild_recommendations()
+        response = self.reader_client.get(
+            reverse('posts:profile', kwargs={'username': 'author'})
+        )
+        recommendations = response.context['recommendations']
+        self.assertEqual(recommendations[0].author, self.friend_of_author)
+        self.assertContains(response, 'Кого почитать')
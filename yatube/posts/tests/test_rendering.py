@@ -0,0 +1,99 @@
+from unittest import skipIf
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import rendering
+from ..models import Post, User
+
+
+class RenderingTest(TestCase):
+    def test_html_is_escaped(self):
+        """Разметка из текста поста выводится как текст."""
+        html = rendering.render_html('<script>alert(1)</script>')
+        self.assertNotIn('<script>', html)
+        self.assertIn('&lt;script&gt;', html)
+
+    def test_links_and_paragraphs(self):
+        """Адреса становятся ссылками, пустые строки делят абзацы."""
+        html = rendering.render_html('Первый\n\nсм. https://example.com')
+        self.assertEqual(html.count('<p>'), 2)
+        self.assertIn(
+            '<a href="https://example.com" rel="nofollow">', html
+        )
+
+    def test_unsafe_href_is_dropped(self):
+        """Ссылки на javascript: не попадают в HTML."""
+        html = rendering.sanitize(
+            '<a href="javascript:alert(1)" onclick="x()">x</a>'
+        )
+        self.assertEqual(html, '<a href="#">x</a>')
+
+    def test_sanitize_allow_list(self):
+        """Чужие теги, скрипты и внешние картинки вырезаются."""
+        html = rendering.sanitize(
+            '<p style="x">a<script>alert(1)</script>'
+            '<img src="javascript:x"><img src="https://t.example/p.gif">'
+            '<img src="/media/a.png" alt="b" onerror="x()">'
+            '<iframe>c</iframe> &lt;d&gt;</p>'
+        )
+        self.assertEqual(
+            html, '<p>a<img src="/media/a.png" alt="b">c &lt;d&gt;</p>'
+        )
+
+    @skipIf(rendering.markdown is None, 'markdown не установлен')
+    @override_settings(POSTS_MARKDOWN=True)
+    def test_markdown(self):
+        html = rendering.render_html(
+            '**жирный** [ссылка](javascript:x) ![x](javascript:y) `a < b`'
+        )
+        self.assertIn('<strong>жирный</strong>', html)
+        self.assertIn('<code>a &lt; b</code>', html)
+        self.assertNotIn('javascript', html)
+
+    def test_excerpt_is_truncated(self):
+        excerpt = rendering.make_excerpt('слово  \n' * 200)
+        self.assertLessEqual(len(excerpt), rendering.EXCERPT_LENGTH)
+        self.assertTrue(excerpt.endswith('…'))
+
+
+class PostRenderedFieldsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.post = Post.objects.create(
+            author=cls.user, text='Текст поста https://example.com'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fields_are_filled_on_save(self):
+        """Начало текста и HTML заполняются при сохранении поста."""
+        self.assertEqual(self.post.excerpt, self.post.text)
+        self.assertIn('<a href="https://example.com"', self.post.text_html)
+        self.post.text = 'Новый текст'
+        self.post.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text_html, '<p>Новый текст</p>')
+
+    def test_deferred_save_keeps_fields(self):
+        """Сохранение без загруженного текста не стирает HTML."""
+        post = Post.objects.defer('text', 'text_html').get(pk=self.post.pk)
+        post.save(update_fields=('group',))
+        self.post.refresh_from_db()
+        self.assertIn('example.com', self.post.text_html)
+
+    def test_pages_use_rendered_fields(self):
+        """Лента выводит начало текста, страница поста — готовый HTML."""
+        Post.objects.filter(pk=self.post.pk).update(
+            excerpt='Начало из базы', text_html='<p>HTML из базы</p>'
+        )
+        index = self.client.get(reverse('posts:index'))
+        self.assertContains(index, 'Начало из базы')
+        detail = self.client.get(
+            reverse('posts:post_detail', args=(self.post.pk,))
+        )
+        self.assertContains(detail, '<p>HTML из базы</p>', html=True)
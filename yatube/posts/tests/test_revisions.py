@@ -0,0 +1,97 @@
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import jobs
+from core.models import Job
+
+from .. import revisions
+from ..models import Post, PostRevision, User
+
+
+@override_settings(JOBS_EAGER=True)
+class PostRevisionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='writer')
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.post = Post.objects.create(
+            author=self.author, text='Первая версия поста'
+        )
+
+    def edit(self, text):
+        self.author_client.post(
+            reverse('posts:post_edit', args=(self.post.pk,)), {'text': text}
+        )
+
+    def test_delta_roundtrip(self):
+        old = 'Мама мыла раму, а папа читал газету.'
+        new = 'Мама мыла окно, а папа читал газету вслух.'
+        delta = revisions.make_delta(old, new)
+        self.assertEqual(revisions.apply_delta(old, delta), new)
+
+    def test_every_revision_is_restored(self):
+        """Каждая правка восстанавливается, полный текст хранится
+        раз в SNAPSHOT_EVERY правок."""
+        texts = ['Первая версия поста']
+        for i in range(2, 24):
+            texts.append(f'{texts[-1]} правка {i}')
+            self.edit(texts[-1])
+        stored = PostRevision.objects.filter(post=self.post)
+        self.assertEqual(stored.count(), len(texts))
+        self.assertEqual(
+            list(stored.filter(is_snapshot=True).values_list(
+                'number', flat=True
+            )),
+            [1, 11, 21],
+        )
+        for number, text in enumerate(texts, start=1):
+            with self.subTest(number=number):
+                with self.assertNumQueries(1):
+                    restored = revisions.text_at(self.post.pk, number)
+                self.assertEqual(restored, text)
+        self.assertEqual(
+            [revision.text for revision in revisions.history(self.post.pk)],
+            texts,
+        )
+
+    def test_unchanged_and_stale_edits_are_skipped(self):
+        """Сохранение без изменения текста и опоздавшая правка
+        не создают новых записей."""
+        self.post.save()
+        self.assertEqual(self.post.revisions.count(), 1)
+        last = self.post.revisions.get()
+        self.assertIsNone(
+            revisions.record(self.post.pk, 'Старый текст', last.sequence)
+        )
+        self.assertEqual(self.post.revisions.count(), 1)
+
+    @override_settings(JOBS_EAGER=False)
+    def test_revision_is_written_by_job(self):
+        """Правка записывается фоновой задачей, а не в запросе."""
+        self.edit('Новый текст')
+        self.assertEqual(self.post.revisions.count(), 1)
+        job = Job.objects.get(name='posts.record_revision')
+        self.assertNotIn('Новый текст', job.payload)
+        jobs.run(job)
+        self.assertEqual(self.post.revisions.count(), 2)
+        self.assertEqual(
+            revisions.text_at(self.post.pk, 2), 'Новый текст'
+        )
+
+    def test_history_page(self):
+        """История правок открывается только автору."""
+        self.edit('Вторая версия поста')
+        url = reverse('posts:post_history', args=(self.post.pk,))
+        response = self.author_client.get(url)
+        self.assertContains(response, 'Первая версия поста')
+        self.assertContains(response, 'Вторая версия поста')
+        reader = Client()
+        reader.force_login(User.objects.create_user(username='reader'))
+        self.assertRedirects(
+            reader.get(url),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.models import OutboxEvent
+
+from .. import sitemaps
+from ..models import Group, Post, User
+
+TEMP_SITEMAP_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(
+    SITEMAP_ROOT=TEMP_SITEMAP_ROOT, SITE_URL='http://testserver'
+)
+class SitemapsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='test_author')
+        cls.group = Group.objects.create(
+            title='Погода',
+            slug='weather',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, text='Пост', group=cls.group
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_SITEMAP_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.guest_client = Client()
+        call_command('generate_sitemaps', '--full', stdout=StringIO())
+
+    def get(self, url):
+        response = self.guest_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_index_lists_sections(self):
+        """Индекс ссылается на разделы постов, профилей и групп."""
+        index = self.get(reverse('posts:sitemap_index'))
+        for section in ('posts-0', 'profiles-0', 'groups'):
+            with self.subTest(section=section):
+                self.assertIn(
+                    reverse('posts:sitemap_section', args=(section,)), index
+                )
+        posts = self.get(reverse('posts:sitemap_section', args=('posts-0',)))
+        self.assertIn(
+            reverse('posts:post_detail', args=(self.post.pk,)), posts
+        )
+        groups = self.get(reverse('posts:sitemap_section', args=('groups',)))
+        self.assertIn(reverse('posts:group_list', args=('weather',)), groups)
+
+    def test_only_changed_chunks_are_rebuilt(self):
+        """Пересобираются только пачки, в которых менялись посты."""
+        far_post = Post.objects.create(
+            id=sitemaps.CHUNK_SIZE + 1, author=self.author, text='Пост'
+        )
+        OutboxEvent.objects.update(created='2000-01-01T00:00:00Z')
+        os.remove(os.path.join(TEMP_SITEMAP_ROOT, 'posts-0.xml'))
+        call_command('generate_sitemaps', stdout=StringIO())
+        self.assertFalse(sitemaps.exists('posts-0.xml'))
+        self.assertTrue(sitemaps.exists('posts-1.xml'))
+        posts = self.get(reverse('posts:sitemap_section', args=('posts-1',)))
+        self.assertIn(reverse('posts:post_detail', args=(far_post.pk,)), posts)
+
+    def test_unknown_section(self):
+        """Неизвестный раздел карты сайта отдаёт 404."""
+        response = self.guest_client.get(
+            reverse('posts:sitemap_section', args=('secret',))
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import trending
+from ..models import Comment, Follow, Post, TrendingScore, User
+
+
+class TrendingScoreTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.author = User.objects.create_user(username='test_author')
+        cls.quiet_post = Post.objects.create(
+            author=cls.author,
+            text='Пост без комментариев',
+        )
+        cls.discussed_post = Post.objects.create(
+            author=cls.user,
+            text='Обсуждаемый пост',
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_new_post_gets_score(self):
+        """Новый пост сразу попадает в рейтинг."""
+        self.assertTrue(
+            TrendingScore.objects.filter(post=self.quiet_post).exists()
+        )
+
+    def test_comment_raises_score(self):
+        """Комментарий увеличивает рейтинг поста."""
+        before = TrendingScore.objects.get(post=self.discussed_post).score
+        Comment.objects.create(
+            post=self.discussed_post, author=self.user, text='Комментарий'
+        )
+        after = TrendingScore.objects.get(post=self.discussed_post).score
+        self.assertGreater(after, before)
+
+    def test_follow_raises_author_posts_score(self):
+        """Подписка на автора поднимает рейтинг его свежих постов."""
+        before = TrendingScore.objects.get(post=self.quiet_post).score
+        Follow.objects.create(user=self.user, author=self.author)
+        after = TrendingScore.objects.get(post=self.quiet_post).score
+        self.assertGreater(after, before)
+
+    def test_old_events_decay(self):
+        """Событие, случившееся на период полураспада раньше,
+        весит вдвое меньше."""
+        now = trending.EPOCH + timedelta(days=30)
+        fresh = trending.event_score(1, now)
+        old = trending.event_score(1, now - trending.HALF_LIFE)
+        self.assertAlmostEqual(fresh - old, 1)
+        self.assertAlmostEqual(trending.log_add(old, old), fresh)
+
+    def test_trending_page_orders_by_score(self):
+        """Страница популярного сортирует посты по рейтингу."""
+        for _ in range(3):
+            Comment.objects.create(
+                post=self.quiet_post, author=self.user, text='Комментарий'
+            )
+        response = self.guest_client.get(reverse('posts:trending'))
+        posts = [score.post for score in response.context['page_obj']]
+        self.assertEqual(posts, [self.quiet_post, self.discussed_post])
+
+    def test_rebuild_keeps_order(self):
+        """Полный пересчёт учитывает комментарии."""
+        Comment.objects.create(
+            post=self.quiet_post, author=self.user, text='Комментарий'
+        )
+        self.assertEqual(trending.rebuild_scores(), Post.objects.count())
+        top = TrendingScore.objects.first()
+        self.assertEqual(top.post, self.quiet_post)
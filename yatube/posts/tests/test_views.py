@@ -1,3 +1,4 @@
+import re
 import shutil
 import tempfile
 
@@ -11,6 +12,7 @@ from django.urls import reverse
 from ..models import Follow, Group, Post, User
 
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CSRF_TOKEN_RE = re.compile(rb'name="csrfmiddlewaretoken" value="[^"]*"')
 
 
 @override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
@@ -73,6 +75,7 @@ class PostPagesTests(TestCase):
         shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
 
     def setUp(self):
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
@@ -256,7 +259,7 @@ class PostСacheTest(TestCase):
         """После удаления записи в БД, данные доступны на странице
         до очистки кеша."""
         response = self.authorized_client.get(reverse('posts:index'))
-        post = response.content
+        post = CSRF_TOKEN_RE.sub(b'', response.content)
         self.assertTrue(
             Post.objects.filter(
                 text='Тестовый пост для проверки кеша'
@@ -264,11 +267,11 @@ class PostСacheTest(TestCase):
         )
         self.post.delete()
         response = self.authorized_client.get(reverse('posts:index'))
-        caсhed_post = response.content
+        caсhed_post = CSRF_TOKEN_RE.sub(b'', response.content)
         self.assertEqual(post, caсhed_post)
         cache.clear()
         response = self.authorized_client.get(reverse('posts:index'))
-        claeaned_caсhed_post = response.content
+        claeaned_caсhed_post = CSRF_TOKEN_RE.sub(b'', response.content)
         self.assertNotEqual(post, claeaned_caсhed_post)
 
 
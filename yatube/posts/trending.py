@@ -0,0 +1,86 @@
+"""Рейтинг популярных постов с прямым затуханием (forward decay).
+
+Каждое событие весом ``w`` в момент ``t`` добавляет к рейтингу
+``w * 2 ** ((t - EPOCH) / HALF_LIFE)``: вклад старых событий относительно
+новых уменьшается вдвое за каждый ``HALF_LIFE``, но уже сохранённые
+рейтинги пересчитывать не нужно. Чтобы не переполнить float, хранится
+двоичный логарифм суммы.
+"""
+import math
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Post, TrendingScore
+
+EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+HALF_LIFE = timedelta(hours=12)
+POST_WEIGHT = 1.0
+COMMENT_WEIGHT = 1.0
+FOLLOW_WEIGHT = 0.5
+FOLLOW_RECENT_POSTS = 10
+
+
+def event_score(weight, moment=None):
+    moment = moment or timezone.now()
+    return math.log2(weight) + (moment - EPOCH) / HALF_LIFE
+
+
+def log_add(first, second):
+    high, low = max(first, second), min(first, second)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def bump(post_ids, weight, moment=None):
+    """Добавляет событие к рейтингу постов."""
+    increment = event_score(weight, moment)
+    with transaction.atomic():
+        scores = TrendingScore.objects.select_for_update().in_bulk(post_ids)
+        for post_id in post_ids:
+            if post_id in scores:
+                scores[post_id].score = log_add(
+                    scores[post_id].score, increment
+                )
+                scores[post_id].save(update_fields=('score',))
+            else:
+                TrendingScore.objects.create(post_id=post_id, score=increment)
+
+
+def post_published(post):
+    bump([post.pk], POST_WEIGHT, post.pub_date)
+
+
+def comment_added(comment):
+    bump([comment.post_id], COMMENT_WEIGHT, comment.created)
+
+
+def author_followed(author_id):
+    recent = list(
+        Post.objects.filter(author_id=author_id)
+        .order_by('-pub_date')
+        .values_list('pk', flat=True)[:FOLLOW_RECENT_POSTS]
+    )
+    if recent:
+        bump(recent, FOLLOW_WEIGHT)
+
+
+def rebuild_scores():
+    """Пересчитывает рейтинги по публикациям и комментариям."""
+    posts = Post.objects.annotate(
+        comments_count=Count('comments')
+    ).values_list('pk', 'pub_date', 'comments_count').order_by()
+    scores = [
+        TrendingScore(
+            post_id=pk,
+            score=event_score(
+                POST_WEIGHT + COMMENT_WEIGHT * comments_count, pub_date
+            ),
+        )
+        for pk, pub_date, comments_count in posts.iterator()
+    ]
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create(scores, batch_size=1000)
+    return len(scores)
@@ -6,11 +6,33 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('trending/', views.trending, name='trending'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('feed/<str:feed_format>/', views.index_feed, name='index_feed'),
+    path(
+        'group/<slug:slug>/feed/<str:feed_format>/',
+        views.group_feed,
+        name='group_feed'
+    ),
+    path(
+        'profile/<str:username>/feed/<str:feed_format>/',
+        views.profile_feed,
+        name='profile_feed'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path(
+        'posts/<int:post_id>/history/', views.post_history,
+        name='post_history'
+    ),
+    path('posts/<int:post_id>/like/', views.post_like, name='post_like'),
+    path(
+        'posts/<int:post_id>/unlike/', views.post_unlike, name='post_unlike'
+    ),
+    path('posts/<int:post_id>/card/', views.post_card, name='post_card'),
     path(
         'posts/<int:post_id>/comment/', views.add_comment, name='add_comment'
     ),
@@ -25,4 +47,15 @@ urlpatterns = [
         views.profile_unfollow,
         name='profile_unfollow'
     ),
+    path('sitemap.xml', views.sitemap_index, name='sitemap_index'),
+    path(
+        'sitemaps/<str:section>.xml',
+        views.sitemap_section,
+        name='sitemap_section'
+    ),
+    path('live/', views.live_index, name='live_index'),
+    path('live/follow/', views.live_follow, name='live_follow'),
+    path(
+        'live/posts/<int:post_id>/', views.live_post, name='live_post'
+    ),
 ]
@@ -1,17 +1,72 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.db.models import F
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.http import is_safe_url
+from django.views.decorators.http import require_POST
 
+from core import holes, outbox, sse
+from core.paginator import KeysetPage, get_page, parse_cursor
+
+from . import archive, counters, feeds, likes, revisions, sitemaps
+from .cards import render_cards
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
+from .models import (
+    Comment, Follow, Group, GroupStats, Post, TrendingScore, User,
+)
 
 POSTS_PER_PAGE = 10
+GROUPS_PER_PAGE = 20
+FEED_DEFERRED = ('text', 'text_html')
 
 
 def index(request):
     template = 'posts/index.html'
-    posts = Post.objects.order_by('-pub_date')
-    paginator = Paginator(posts, POSTS_PER_PAGE)
+    posts = Post.objects.filter(author__is_active=True).select_related(
+        'author', 'group'
+    ).defer(*FEED_DEFERRED).order_by('-pub_date', '-pk')
+    page_obj = get_page(request, posts, POSTS_PER_PAGE)
+    context = {
+        'page_obj': page_obj,
+    }
+    return holes.render_page(
+        request, template, context, using=settings.POSTS_TEMPLATE_ENGINE
+    )
+
+
+def trending(request):
+    template = 'posts/trending.html'
+    scores = TrendingScore.objects.filter(
+        post__author__is_active=True
+    ).select_related(
+        'post__author', 'post__group'
+    ).defer(
+        *(f'post__{field}' for field in FEED_DEFERRED)
+    ).order_by('-score')
+    paginator = Paginator(scores, POSTS_PER_PAGE)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    context = {
+        'page_obj': page_obj,
+        'posts': [score.post for score in page_obj],
+        'trending': True,
+    }
+    counters.count_impressions(context['posts'])
+    return holes.render_page(
+        request, template, context, using=settings.POSTS_TEMPLATE_ENGINE
+    )
+
+
+def group_index(request):
+    template = 'posts/group_index.html'
+    stats = GroupStats.objects.select_related('group').order_by(
+        F('last_activity').desc(nulls_last=True), 'group__title'
+    )
+    paginator = Paginator(stats, GROUPS_PER_PAGE)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     context = {
@@ -23,51 +78,136 @@ def index(request):
 def group_posts(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.order_by('-pub_date')
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    posts = group.posts.filter(author__is_active=True).select_related(
+        'author'
+    ).defer(
+        *FEED_DEFERRED
+    ).order_by('-pub_date', '-pk')
+    page_obj = get_page(request, posts, POSTS_PER_PAGE)
+    counters.count_impressions(page_obj)
     context = {
         'group': group,
         'page_obj': page_obj,
     }
-    return render(request, template, context)
+    return holes.render_page(
+        request, template, context, using=settings.POSTS_TEMPLATE_ENGINE
+    )
+
+
+def page_part(request, num_pages):
+    """Номер страницы так же, как его понимает Paginator.get_page:
+    нечисловой — первая, вне диапазона — последняя. Разные номера одной
+    страницы дают один ключ кэша."""
+    try:
+        number = int(request.GET.get('page') or 1)
+    except ValueError:
+        return 1
+    return number if 1 <= number <= num_pages else num_pages
 
 
 def profile(request, username):
     template = 'posts/profile.html'
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.order_by('-pub_date')
+    author = get_object_or_404(User, username=username, is_active=True)
+    scopes = [f'author:{author.pk}']
+    posts = archive.FeedWithArchive(
+        author.posts.select_related('group').defer(
+            *FEED_DEFERRED
+        ).order_by('-pub_date', '-pk'),
+        author.archived_posts.select_related('group').order_by(
+            '-pub_date', '-pk'
+        ),
+    )
     paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    count = author.posts.count
-    context = {
-        'page_obj': page_obj,
-        'author': author,
-        'count': count,
-    }
-    context['following'] = (request.user.is_authenticated
-                            and Follow.objects.filter(
-                                author=author,
-                                user=request.user
-                            ).exists())
-    return render(request, template, context)
+    cursor = request.GET.get('before')
+    if parse_cursor(cursor) is not None:
+        page_key = f'before:{cursor}'
+
+        def make_page():
+            return KeysetPage(posts, cursor, POSTS_PER_PAGE)
+    else:
+        page_key = page_part(request, holes.cached_value(
+            f'profile_pages:{author.pk}', scopes, lambda: paginator.num_pages
+        ))
+
+        def make_page():
+            return paginator.get_page(page_key)
+
+    def render_body():
+        page_obj = make_page()
+        context = {
+            'page_obj': page_obj,
+            'author': author,
+            'count': posts.count,
+            'post_ids': '-'.join(str(post.pk) for post in page_obj),
+            'holes_deferred': True,
+        }
+        return render_to_string(
+            template, context, request, using=settings.POSTS_TEMPLATE_ENGINE
+        )
+
+    return holes.cached_page(
+        request,
+        f'profile:{settings.POSTS_TEMPLATE_ENGINE}:{author.pk}:{page_key}',
+        scopes,
+        render_body,
+    )
+
+
+def index_feed(request, feed_format):
+    return feeds.serve(request, 'index', feed_format)
+
+
+def group_feed(request, slug, feed_format):
+    return feeds.serve(request, 'group', feed_format, slug)
+
+
+def profile_feed(request, username, feed_format):
+    return feeds.serve(request, 'author', feed_format, username)
+
+
+def sitemap_index(request):
+    return sitemaps.serve(sitemaps.INDEX_NAME)
+
+
+def sitemap_section(request, section):
+    name = f'{section}.xml'
+    if not sitemaps.SECTION_RE.match(name):
+        raise Http404('Раздел карты сайта не найден')
+    return sitemaps.serve(name)
 
 
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = get_object_or_404(Post, id=post_id)
-    comments = post.comments.all()
-    count = post.author.posts.count
-    form = CommentForm()
-    context = {
-        'posts': post,
-        'count': count,
-        'comments': comments,
-        'form': form,
-    }
-    return render(request, template, context)
+    author_id = archive.get_author_id(post_id)
+    if author_id is None:
+        raise Http404('Пост не найден')
+
+    def render_body():
+        post = archive.get_post(post_id)
+        if post is None:
+            raise Http404('Пост не найден')
+        if getattr(post, 'archived', False):
+            comments = archive.restore_comments(post)
+        else:
+            comments = post.comments.filter(
+                author__is_active=True
+            ).select_related('author')
+        context = {
+            'posts': post,
+            'count': archive.author_post_count(post.author),
+            'comments': comments,
+            'form': CommentForm(),
+            'archived': getattr(post, 'archived', False),
+            'holes_deferred': True,
+        }
+        return render_to_string(template, context, request)
+
+    return holes.cached_page(
+        request,
+        f'post:{post_id}',
+        [f'author:{author_id}', f'post:{post_id}'],
+        render_body,
+    )
 
 
 @login_required()
@@ -99,6 +239,19 @@ def post_edit(request, post_id):
     return render(request, template, {'form': form, 'is_edit': True})
 
 
+@login_required()
+def post_history(request, post_id):
+    template = 'posts/post_history.html'
+    post = get_object_or_404(Post.objects.only('author'), id=post_id)
+    if post.author_id != request.user.pk:
+        return redirect('posts:post_detail', post_id)
+    context = {
+        'post_id': post_id,
+        'revisions': reversed(revisions.history(post_id)),
+    }
+    return render(request, template, context)
+
+
 @login_required
 def add_comment(request, post_id):
     form = CommentForm(request.POST or None)
@@ -114,14 +267,19 @@ def add_comment(request, post_id):
 @login_required
 def follow_index(request):
     template = 'posts/follow.html'
-    posts = Post.objects.filter(author__following__user=request.user)
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    posts = Post.objects.filter(
+        author__following__user=request.user, author__is_active=True
+    ).select_related('author', 'group').defer(
+        *FEED_DEFERRED
+    ).order_by('-pub_date', '-pk')
+    page_obj = get_page(request, posts, POSTS_PER_PAGE)
+    counters.count_impressions(page_obj)
     context = {
         'page_obj': page_obj,
     }
-    return render(request, template, context)
+    return holes.render_page(
+        request, template, context, using=settings.POSTS_TEMPLATE_ENGINE
+    )
 
 
 @login_required
@@ -139,3 +297,85 @@ def profile_unfollow(request, username):
     if follow.exists():
         follow.delete()
     return redirect('posts:profile', username=username)
+
+
+def back_to_page(request, post_id):
+    referer = request.META.get('HTTP_REFERER')
+    if referer and is_safe_url(
+        referer, {request.get_host()}, request.is_secure()
+    ):
+        return redirect(referer)
+    return redirect('posts:post_detail', post_id=post_id)
+
+
+@login_required
+@require_POST
+def post_like(request, post_id):
+    post = get_object_or_404(Post.objects.only('pk'), id=post_id)
+    likes.like(request.user, post.pk)
+    return back_to_page(request, post_id)
+
+
+@login_required
+@require_POST
+def post_unlike(request, post_id):
+    likes.unlike(request.user, post_id)
+    return back_to_page(request, post_id)
+
+
+def post_card(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group').defer(
+            *FEED_DEFERRED
+        ),
+        id=post_id,
+        author__is_active=True,
+    )
+    return HttpResponse(holes.fill(request, render_cards([post])[0]))
+
+
+def new_post_message(event):
+    return 'post', {
+        'id': event.object_id,
+        'card': reverse('posts:post_card', args=(event.object_id,)),
+    }
+
+
+def live_index(request):
+    return sse.stream_response(request, ['post.created'], new_post_message)
+
+
+@login_required
+def live_follow(request):
+    authors = set(
+        Follow.objects.filter(user=request.user)
+        .values_list('author_id', flat=True)
+    )
+
+    def select(event):
+        if outbox.payload(event)['author_id'] in authors:
+            return new_post_message(event)
+        return None
+
+    return sse.stream_response(request, ['post.created'], select)
+
+
+def live_post(request, post_id):
+    def select(event):
+        if outbox.payload(event)['post_id'] != post_id:
+            return None
+        comment = Comment.objects.select_related('author').filter(
+            pk=event.object_id, author__is_active=True
+        ).first()
+        if comment is None:
+            return None
+        return 'comment', {
+            'id': comment.pk,
+            'author': comment.author.username,
+            'profile': reverse(
+                'posts:profile', args=(comment.author.username,)
+            ),
+            'text': comment.text,
+        }
+
+    return sse.stream_response(request, ['comment.created'], select)
@@ -0,0 +1,53 @@
+(function () {
+  'use strict';
+
+  var root = document.querySelector('[data-live-url]');
+  if (!root || !window.EventSource || !window.fetch) {
+    return;
+  }
+  var source = new EventSource(root.getAttribute('data-live-url'));
+  var seen = {};
+
+  source.addEventListener('post', function (event) {
+    var data = JSON.parse(event.data);
+    if (seen[data.id]) {
+      return;
+    }
+    seen[data.id] = true;
+    fetch(data.card, {credentials: 'same-origin'})
+      .then(function (response) {
+        return response.ok ? response.text() : null;
+      })
+      .then(function (html) {
+        if (html === null) {
+          return;
+        }
+        var separator = root.children.length ? '<hr>' : '';
+        root.insertAdjacentHTML('afterbegin', html + separator);
+      });
+  });
+
+  source.addEventListener('comment', function (event) {
+    var data = JSON.parse(event.data);
+    if (seen[data.id]) {
+      return;
+    }
+    seen[data.id] = true;
+    var media = document.createElement('div');
+    media.className = 'media mb-4';
+    var body = document.createElement('div');
+    body.className = 'media-body';
+    var title = document.createElement('h5');
+    title.className = 'mt-0';
+    var link = document.createElement('a');
+    link.href = data.profile;
+    link.textContent = data.author;
+    var text = document.createElement('p');
+    text.textContent = data.text;
+    title.appendChild(link);
+    body.appendChild(title);
+    body.appendChild(text);
+    media.appendChild(body);
+    root.appendChild(media);
+  });
+})();
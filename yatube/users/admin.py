@@ -0,0 +1,45 @@
+from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+
+from .deletion import request_deletion
+from .models import AccountDeletion, User
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = (
+        'username', 'requested', 'finished',
+        'posts', 'comments', 'follows', 'files',
+    )
+    readonly_fields = list_display
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class AccountAdmin(UserAdmin):
+    """Удаление из админки только скрывает аккаунт: каскад по постам,
+    комментариям и подпискам выполняет фоновая задача."""
+
+    actions = ('delete_accounts',)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def delete_accounts(self, request, queryset):
+        users = list(queryset.filter(deletion__isnull=True))
+        for user in users:
+            request_deletion(user)
+        self.message_user(
+            request, f'Поставлено в очередь на удаление: {len(users)}'
+        )
+    delete_accounts.short_description = 'Удалить аккаунты'
@@ -0,0 +1,140 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from sorl import thumbnail
+
+from core import holes, jobs
+from core.auth import user_cache
+from posts import archive, bulk, feeds, group_stats, likes
+from posts.models import (
+    ArchivedPost, Comment, Follow, Like, Post, Recommendation,
+)
+
+from .models import AccountDeletion, User
+
+BATCH_SIZE = 500
+BATCHES_PER_JOB = 20
+
+
+def request_deletion(user):
+    """Сразу скрывает аккаунт, а его содержимое удаляет фоновая задача.
+
+    Выключенный пользователь не может войти, а его профиль, посты,
+    комментарии и рекомендации пропадают со страниц, хотя строки ещё
+    не удалены.
+    """
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        deletion, created = AccountDeletion.objects.get_or_create(
+            user=user, defaults={'username': user.username}
+        )
+        Recommendation.objects.filter(
+            Q(user_id=user.pk) | Q(author_id=user.pk)
+        ).delete()
+        holes.invalidate(f'author:{user.pk}', *(
+            f'post:{post_id}' for post_id in Comment.objects.filter(
+                author_id=user.pk
+            ).order_by().values_list('post_id', flat=True).distinct()
+        ))
+        feeds.invalidate(
+            Post.objects.filter(author_id=user.pk).order_by().values_list(
+                'group_id', flat=True
+            ).distinct(),
+            [user.pk],
+        )
+        if created:
+            jobs.enqueue('users.delete_account', deletion_id=deletion.pk)
+    user_cache.clear()
+    return deletion
+
+
+def first_ids(queryset, batch_size):
+    return list(
+        queryset.order_by('pk').values_list('pk', flat=True)[:batch_size]
+    )
+
+
+def delete_batch(deletion, batch_size=BATCH_SIZE):
+    """Удаляет одну пачку и возвращает имена файлов, которые нужно
+    стереть после коммита, или None, если удалять больше нечего.
+
+    Сначала уходят комментарии автора и комментарии к его постам,
+    поэтому удаление поста уже ничего не каскадирует. Лайки удаляются
+    с вычитанием из счётчиков чужих постов.
+    """
+    user_id = deletion.user_id
+    ids = first_ids(
+        Comment.objects.filter(
+            Q(author_id=user_id) | Q(post__author_id=user_id)
+        ),
+        batch_size,
+    )
+    if ids:
+        Comment.objects.filter(pk__in=ids).delete()
+        deletion.comments += len(ids)
+        return []
+    ids = first_ids(
+        Follow.objects.filter(Q(user_id=user_id) | Q(author_id=user_id)),
+        batch_size,
+    )
+    if ids:
+        Follow.objects.filter(pk__in=ids).delete()
+        deletion.follows += len(ids)
+        return []
+    ids = first_ids(Like.objects.filter(user_id=user_id), batch_size)
+    if ids:
+        likes.remove(Like.objects.filter(pk__in=ids))
+        return []
+    ids = first_ids(Post.objects.filter(author_id=user_id), batch_size)
+    if ids:
+        rows = bulk.delete_chunk(ids)
+        deletion.posts += len(rows)
+        return [image for _, _, _, image, _ in rows if image]
+    archived = list(
+        ArchivedPost.objects.filter(author_id=user_id).order_by('pk')
+        [:batch_size]
+    )
+    if archived:
+        ids = [post.pk for post in archived]
+        ArchivedPost.objects.filter(pk__in=ids).delete()
+        bulk.delete_dependents(ids)
+        group_stats.apply(removed=[
+            (post.group_id, post.pub_date) for post in archived
+        ])
+        deletion.posts += len(archived)
+        return [
+            image for image in (
+                archive.unpack(post)['image'] for post in archived
+            ) if image
+        ]
+    return None
+
+
+def delete_files(names):
+    """Удаляет картинки вместе с миниатюрами sorl-thumbnail."""
+    for name in names:
+        thumbnail.delete(name)
+
+
+def process(deletion_id, batches=BATCHES_PER_JOB, batch_size=BATCH_SIZE):
+    """Выполняет несколько пачек, каждую в своей транзакции.
+
+    Возвращает True, когда аккаунт удалён полностью.
+    """
+    deletion = AccountDeletion.objects.get(pk=deletion_id)
+    if deletion.finished:
+        return True
+    for _ in range(batches):
+        with transaction.atomic():
+            files = delete_batch(deletion, batch_size)
+            if files is None:
+                User.objects.filter(pk=deletion.user_id).delete()
+                deletion.user = None
+                deletion.finished = timezone.now()
+            else:
+                deletion.files += len(files)
+            deletion.save()
+        if files is None:
+            return True
+        delete_files(files)
+    return False
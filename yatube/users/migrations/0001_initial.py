@@ -0,0 +1,36 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountDeletion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=150, verbose_name='Имя пользователя')),
+                ('requested', models.DateTimeField(auto_now_add=True, verbose_name='Дата запроса')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Дата окончания')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Удалено постов')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Удалено комментариев')),
+                ('follows', models.PositiveIntegerField(default=0, verbose_name='Удалено подписок')),
+                ('files', models.PositiveIntegerField(default=0, verbose_name='Удалено файлов')),
+                ('user', models.OneToOneField(help_text='Пусто, когда аккаунт удалён полностью', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Удаление аккаунта',
+                'verbose_name_plural': 'Удаления аккаунтов',
+                'ordering': ('-requested',),
+            },
+        ),
+    ]
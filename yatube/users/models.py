@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class AccountDeletion(models.Model):
+    user = models.OneToOneField(
+        User,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='deletion',
+        verbose_name='Пользователь',
+        help_text='Пусто, когда аккаунт удалён полностью',
+    )
+    username = models.CharField(
+        max_length=150,
+        verbose_name='Имя пользователя',
+    )
+    requested = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата запроса',
+    )
+    finished = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата окончания',
+    )
+    posts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Удалено постов',
+    )
+    comments = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Удалено комментариев',
+    )
+    follows = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Удалено подписок',
+    )
+    files = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Удалено файлов',
+    )
+
+    class Meta:
+        ordering = ('-requested',)
+        verbose_name = 'Удаление аккаунта'
+        verbose_name_plural = 'Удаления аккаунтов'
+
+    def __str__(self):
+        return self.username
@@ -0,0 +1,39 @@
+from django.contrib.auth.forms import PasswordResetForm
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from core import jobs
+
+from . import deletion
+from .models import User
+
+
+@jobs.register('users.delete_account')
+def delete_account(deletion_id):
+    """Удаляет содержимое аккаунта пачками. Задача ставит себя в очередь
+    снова, чтобы между пачками успевали выполняться другие задачи."""
+    if not deletion.process(deletion_id):
+        jobs.enqueue('users.delete_account', deletion_id=deletion_id)
+
+
+@jobs.register('users.send_password_reset')
+def send_password_reset(user_id, subject_template_name, email_template_name,
+                        from_email, domain, site_name, protocol,
+                        html_email_template_name=None):
+    user = User.objects.filter(pk=user_id, is_active=True).first()
+    if user is None or not user.has_usable_password():
+        return
+    context = {
+        'email': user.email,
+        'domain': domain,
+        'site_name': site_name,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'user': user,
+        'token': default_token_generator.make_token(user),
+        'protocol': protocol,
+    }
+    PasswordResetForm().send_mail(
+        subject_template_name, email_template_name, context, from_email,
+        user.email, html_email_template_name=html_email_template_name,
+    )
@@ -0,0 +1,199 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Job
+from posts import archive, feeds, partitions
+from posts.models import (
+    ArchivedPost, Comment, Follow, Group, Post, Recommendation,
+)
+
+from .. import deletion
+from ..models import AccountDeletion, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, JOBS_EAGER=False)
+class AccountDeletionTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='writer', password='secret-password'
+        )
+        self.reader = User.objects.create_user(username='reader')
+        self.post = Post.objects.create(
+            author=self.author,
+            text='Пост автора',
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'),
+        )
+        for i in range(4):
+            Post.objects.create(author=self.author, text=f'Пост {i}')
+        self.other_post = Post.objects.create(
+            author=self.reader, text='Пост читателя'
+        )
+        Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий к посту'
+        )
+        Comment.objects.create(
+            post=self.other_post, author=self.author, text='Ответ автора'
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+        Follow.objects.create(user=self.author, author=self.reader)
+        old_post = Post.objects.create(author=self.author, text='Старый пост')
+        long_ago = timezone.now() - timedelta(days=1000)
+        partitions.ensure_for(connection, [long_ago])
+        Post.objects.filter(pk=old_post.pk).update(pub_date=long_ago)
+        archive.archive_batch(long_ago + timedelta(days=1))
+        self.assertTrue(ArchivedPost.objects.filter(pk=old_post.pk).exists())
+
+    def test_account_is_hidden_immediately(self):
+        """Аккаунт сразу скрыт, а удаление ставится в очередь."""
+        deletion.request_deletion(self.author)
+        self.assertTrue(Job.objects.filter(
+            name='users.delete_account'
+        ).exists())
+        self.assertTrue(Post.objects.filter(author=self.author).exists())
+        self.assertEqual(self.client.get(
+            reverse('posts:profile', args=('writer',))
+        ).status_code, 404)
+        self.assertEqual(self.client.get(
+            reverse('posts:post_detail', args=(self.post.pk,))
+        ).status_code, 404)
+        self.assertNotContains(
+            self.client.get(reverse('posts:index')), 'Пост автора'
+        )
+        self.assertContains(
+            self.client.get(reverse('posts:index')), 'Пост читателя'
+        )
+        self.assertFalse(Client().login(
+            username='writer', password='secret-password'
+        ))
+
+    def test_comments_and_recommendations_are_hidden(self):
+        """Комментарии автора к чужим постам и рекомендации автора
+        пропадают сразу, не дожидаясь задачи удаления."""
+        Recommendation.objects.create(
+            user=self.reader, author=self.author, score=1
+        )
+        url = reverse('posts:post_detail', args=(self.other_post.pk,))
+        self.assertContains(self.client.get(url), 'Ответ автора')
+        deletion.request_deletion(self.author)
+        self.assertTrue(Comment.objects.filter(text='Ответ автора').exists())
+        self.assertNotContains(self.client.get(url), 'Ответ автора')
+        self.assertFalse(Recommendation.objects.exists())
+
+    def test_group_feeds_are_reset(self):
+        """Ленты групп автора сбрасываются вместе с его лентой."""
+        group = Group.objects.create(title='Погода', slug='weather')
+        Post.objects.create(author=self.author, text='В группе', group=group)
+        key = feeds.feed_key('group', 'weather')
+        cache.set(key, {'rss': 'лента'})
+        deletion.request_deletion(self.author)
+        self.assertIsNone(cache.get(key))
+
+    def test_content_is_deleted_in_batches(self):
+        """Задача удаляет содержимое пачками и записывает прогресс."""
+        image = self.post.image.name
+        request = deletion.request_deletion(self.author)
+        self.assertFalse(deletion.process(
+            request.pk, batches=2, batch_size=2
+        ))
+        request.refresh_from_db()
+        self.assertEqual(request.comments, 2)
+        self.assertEqual(request.follows, 2)
+        self.assertIsNone(request.finished)
+        with mock.patch.object(
+            deletion.thumbnail, 'delete', wraps=deletion.thumbnail.delete
+        ) as delete_with_thumbnails:
+            self.assertTrue(deletion.process(request.pk, batch_size=2))
+        delete_with_thumbnails.assert_called_once_with(image)
+        request.refresh_from_db()
+        self.assertEqual(request.posts, 6)
+        self.assertEqual(request.files, 1)
+        self.assertIsNotNone(request.finished)
+        self.assertIsNone(request.user)
+        self.assertFalse(User.objects.filter(username='writer').exists())
+        self.assertFalse(os.path.exists(os.path.join(TEMP_MEDIA_ROOT, image)))
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)),
+            ['Пост читателя'],
+        )
+        self.assertFalse(Comment.objects.exists())
+
+    def test_job_requeues_itself(self):
+        """Задача, не успевшая всё удалить, снова ставит себя в очередь."""
+        request = AccountDeletion.objects.create(
+            user=self.author, username='writer'
+        )
+        with mock.patch.object(
+            deletion, 'process', side_effect=[False, True]
+        ) as process, self.settings(JOBS_EAGER=True):
+            deletion.jobs.enqueue(
+                'users.delete_account', deletion_id=request.pk
+            )
+        self.assertEqual(process.call_count, 2)
+
+    def test_admin_action_soft_deletes(self):
+        """Действие админки ставит аккаунты в очередь вместо каскада."""
+        admin_user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'admin-password'
+        )
+        self.client.force_login(admin_user)
+        changelist = reverse('admin:auth_user_changelist')
+        response = self.client.get(changelist)
+        self.assertNotContains(response, 'delete_selected')
+        self.client.post(changelist, {
+            'action': 'delete_accounts',
+            '_selected_action': [self.author.pk],
+        })
+        self.author.refresh_from_db()
+        self.assertFalse(self.author.is_active)
+        self.assertTrue(Post.objects.filter(author=self.author).exists())
+        self.assertTrue(
+            AccountDeletion.objects.filter(user=self.author).exists()
+        )
+
+    def test_admin_action_deletes_inactive_accounts(self):
+        """Уже выключенный аккаунт тоже можно удалить, но только один
+        раз."""
+        admin_user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'admin-password'
+        )
+        self.client.force_login(admin_user)
+        User.objects.filter(pk=self.author.pk).update(is_active=False)
+        for _ in range(2):
+            self.client.post(reverse('admin:auth_user_changelist'), {
+                'action': 'delete_accounts',
+                '_selected_action': [self.author.pk],
+            })
+        self.assertEqual(
+            AccountDeletion.objects.filter(user=self.author).count(), 1
+        )
+        self.assertEqual(
+            Job.objects.filter(name='users.delete_account').count(), 1
+        )
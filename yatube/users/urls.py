@@ -2,6 +2,7 @@ from django.contrib.auth.views import LoginView, LogoutView, PasswordResetView
 from django.urls import path
 
 from . import views
+from .forms import QueuedPasswordResetForm
 
 app_name = 'users'
 
@@ -13,6 +14,7 @@ urlpatterns = [
     path('logout/',
          LogoutView.as_view(template_name='users/logged_out.html'),
          name='logout'),
-    path('password_reset_form/', PasswordResetView.as_view(),
+    path('password_reset_form/',
+         PasswordResetView.as_view(form_class=QueuedPasswordResetForm),
          name='password_reset_form'),
 ]
@@ -6,7 +6,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SECRET_KEY = '(o@2ja9ex6l(yuhvfls5a_&rb-xr_8&cona$*+jj&b5=l1m6^^'
 
 
-DEBUG = True
+DEBUG = os.getenv('DEBUG', 'True').lower() in ('1', 'true', 'yes')
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -31,12 +31,40 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+SITE_URL = os.getenv('SITE_URL', 'https://freemirror.pythonanywhere.com')
+
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+
+COMPRESSION_LEVELS = {'br': 5, 'gzip': 6}
+
+COMPRESSION_MIN_SIZE = 512
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+SESSION_MODE = os.getenv('SESSION_MODE', 'cached_db')
+
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'core.sessions',
+}[SESSION_MODE]
+
+USER_CACHE_TTL = 30
+
+# Каждый открытый поток SSE занимает поток обработчика WSGI почти на
+# минуту. С синхронными обработчиками держите значение меньше их числа,
+# а для многих живых вкладок запускайте gunicorn с gevent и увеличьте
+# его. Подключения сверх лимита переходят на опрос.
+SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', '2'))
+
+JOBS_EAGER = os.getenv('JOBS_EAGER', str(DEBUG)).lower() in (
+    '1', 'true', 'yes'
+)
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -53,10 +81,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
@@ -83,16 +113,72 @@ TEMPLATES = [
     },
 ]
 
+POSTS_TEMPLATE_ENGINE = os.getenv('POSTS_TEMPLATE_ENGINE', 'django')
+
+# Markdown в постах, если установлен пакет markdown. Выключен по умолчанию.
+POSTS_MARKDOWN = os.getenv('POSTS_MARKDOWN', 'False').lower() in (
+    '1', 'true', 'yes'
+)
+
+if POSTS_TEMPLATE_ENGINE == 'jinja2':
+    TEMPLATES.append({
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [os.path.join(BASE_DIR, 'jinja2')],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+            'context_processors': TEMPLATES[0]['OPTIONS']['context_processors'],
+        },
+    })
+
+if not DEBUG:
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
 }
 
+DB_PROFILE = os.getenv('DB_PROFILE', 'sqlite')
+
+if DB_PROFILE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'yatube'),
+            'USER': os.getenv('POSTGRES_USER', 'yatube'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
+            'PORT': os.getenv('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': 0 if DEBUG else 600,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.backends.sqlite3',
+            'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+            'CONN_MAX_AGE': 0 if DEBUG else 600,
+            'OPTIONS': {
+                'timeout': 5,
+                'pragmas': SQLITE_PRAGMAS,
+            },
+        }
+    }
+
 
 INTERNAL_IPS = [
     '127.0.0.1',
@@ -133,3 +219,10 @@ USE_TZ = True
 STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        'core.staticfiles.CompressedManifestStaticFilesStorage'
+    )